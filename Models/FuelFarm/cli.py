@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC cli.py
+
+Purpose: Run a FuelFarm scenario file headless and stream the farm state to CSV or binary output.
+
+A scenario is a text file with one command per line, in time order; blank lines and # comments are ignored:
+
+    # seconds  command        arguments
+    0          gate1_open
+    0          pump1_on
+    30         level          tank1 24.5
+    120        pump1_off
+
+A command is any gate/pump action in functionality (gate3_open, pump2_off, ...), or "level <tank> <feet>" to change a
+tank level. Commands run on the discrete-event scheduler at their times, and every step seconds of simulated time a
+row is written with the time and each tank, valve, and pump field. Between commands the running pumps draw the tanks
+down (see TankDraw), so the rows follow the farm through simulated time. Commands refused by an interlock are
+reported on standard error with their line number. With --metrics, the scheduler events, command handling times, and
+interlock scans are served in Prometheus format while the scenario runs (see Simulation.metrics).
+
+The whole scenario and the step and duration are checked before the run starts, so errors are reported before any
+output is written. A scenario file is then read again one line at a time; standard input that isn't a file is copied
+to a temporary file during the check and replayed from there. During the run at most one command is queued ahead and
+rows are written as soon as they are produced, so memory stays constant however long the scenario is.
+
+Binary output is a header (magic b"VPLB", u32 version, u32 column count, u32 name bytes, newline-separated column
+names in UTF-8) followed by one row of native float64 values per sample; see read_binary().
+
+Usage:
+    python -m Models.FuelFarm.cli scenario.txt --output run.csv --step 1
+    python -m Models.FuelFarm.cli scenario.txt --format binary --output run.bin --duration 3600 --interlocks
+    python -m Models.FuelFarm.cli scenario.txt --output run.csv --metrics 9108  # Scrape http://127.0.0.1:9108/metrics
+
+Classes:
+    Command: One parsed scenario line
+    TankDraw: Tank levels following the pumps' draw
+    CSVWriter: Streaming CSV rows
+    BinaryWriter: Streaming packed float64 rows
+
+Functions:
+    parse(): Scenario lines to commands
+    validate(): Check a whole scenario before running it
+    apply_command(): Carry out one command
+    columns(): Output columns for the farm
+    farm_layout(): Frame layout of the fields shown by the HMI, for Simulation.streaming
+    run(): Execute a scenario
+    read_binary(): Read back binary output
+    main(): Command-line entry point
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import argparse
+import collections
+import csv
+import re
+import struct
+import sys
+import tempfile
+import time
+
+MAGIC = b"VPLB"
+VERSION = 1
+HEADER = struct.Struct("=4sIII")
+ACTION = re.compile(r"(gate\d+_(open|close)|pump\d+_(on|off))$")
+TANK_LINEUPS = {"tank1": ("gate1", "gate3"), "tank2": ("gate2", "gate4")}  # Outlet gates from each tank to the header
+SUCTION = {"pump1": "gate5", "pump2": "gate6", "pump3": "gate7"}  # Header gate feeding each pump
+
+Command = collections.namedtuple("Command", "time action args line")
+
+
+def parse(lines, actions=None):
+    """Parse scenario lines lazily.
+
+    :param lines: Iterable of lines, e.g. an open file
+    :param actions: Module holding the actions; Models.FuelFarm.functionality by default
+
+    :except ValueError: Malformed line, unknown command, or time going backwards; the message gives the line number
+
+    :return: Commands, in file order
+    :rtype: generator
+    """
+    if actions is None:
+        import Models.FuelFarm.functionality as actions
+    last = 0.0
+    for number, line in enumerate(lines, 1):
+        fields = line.split("#", 1)[0].split()
+        if not fields:
+            continue
+        try:
+            when = float(fields[0])
+        except ValueError:
+            raise ValueError("Line {}: time must be a number.".format(number)) from None
+        if len(fields) < 2:
+            raise ValueError("Line {}: missing command.".format(number))
+        action, args = fields[1], fields[2:]
+        if when < last:
+            raise ValueError("Line {}: time goes backwards.".format(number))
+        if action == "level":
+            if len(args) != 2 or args[0] not in ("tank1", "tank2"):
+                raise ValueError("Line {}: use level <tank1|tank2> <feet>.".format(number))
+            try:
+                args = [args[0], float(args[1])]
+            except ValueError:
+                raise ValueError("Line {}: level must be a number.".format(number)) from None
+        elif not ACTION.match(action) or not hasattr(actions, action) or args:
+            raise ValueError("Line {}: unknown command {!r}.".format(number, " ".join(fields[1:])))
+        last = when
+        yield Command(when, action, args, number)
+
+
+def validate(scenario):
+    """Parse a whole scenario before it runs, so errors are found before any output is written.
+
+    :param scenario: Open scenario file; rewound after the check if it's seekable, otherwise copied to a temporary file
+
+    :except ValueError: As parse()
+
+    :return: File to run the scenario from, rewound; the temporary copy if one was made, which the caller closes
+    :rtype: file
+    """
+    if scenario.seekable():
+        lines = scenario
+        checked = scenario
+    else:
+        lines = tempfile.TemporaryFile("w+")
+        checked = _copied(scenario, lines)
+    try:
+        for _ in parse(checked):
+            pass
+    except ValueError:
+        if lines is not scenario:
+            lines.close()
+        raise
+    lines.seek(0)
+    return lines
+
+
+def _copied(source, spool):
+    """Lines of a stream, written to a spool file as they're read."""
+    for line in source:
+        spool.write(line)
+        yield line
+
+
+def _positive(text):
+    """argparse type for --step."""
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("must be a number") from None
+    if value <= 0:
+        raise argparse.ArgumentTypeError("must be positive")
+    return value
+
+
+def _non_negative(text):
+    """argparse type for --duration."""
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("must be a number") from None
+    if value < 0:
+        raise argparse.ArgumentTypeError("must not be negative")
+    return value
+
+
+def apply_command(command):
+    """Carry out one scenario command on the installed FuelFarm model.
+
+    :return: Message if an interlock refused the command, otherwise None
+    """
+    import Models.FuelFarm.components as components
+    import Models.FuelFarm.functionality as functionality
+    if command.action == "level":
+        return functionality.change_tank_level(getattr(components, command.args[0]), command.args[1])
+    return getattr(functionality, command.action)()
+
+
+class TankDraw:
+    """Tank levels on the scenario's scheduler, falling while the running pumps draw from them.
+
+    A running pump draws its flow while its suction gate is open. The draw is split evenly between the tanks lined up
+    to the header (both outlet gates open) that still hold fuel; a tank that empties drops out and the others take
+    its share. Levels are written to the model, with the pressures that follow from them, by sync().
+
+    Methods: sync(), rebase(), update()
+    """
+    def __init__(self, scheduler):
+        """:param scheduler: Simulation.scheduler.EventScheduler running the scenario"""
+        import Models.FuelFarm.components as components
+        from Simulation.scheduler import TankLevelProcess
+        self.scheduler = scheduler
+        self.processes = {name: TankLevelProcess(scheduler, getattr(components, name), components.GALLONS_PER_FOOT,
+                                                 components.TANK_HEIGHT, on_empty=self.update)
+                          for name in TANK_LINEUPS}
+        self.update()
+
+    def sync(self):
+        """Write the current tank levels and pressures to the model."""
+        import Models.FuelFarm.functionality as functionality
+        for process in self.processes.values():
+            process.sync()
+            functionality.change_tank_level(process.tank, process.tank.level)
+
+    def rebase(self):
+        """Carry on from the model after a command: levels it set since the last sync() and its new lineup."""
+        now = self.scheduler.now
+        for process in self.processes.values():
+            if process.tank.level != process.level_at(now):
+                process.set_level(process.tank.level)
+        self.update()
+
+    def update(self, emptied=None):
+        """Set each tank's outflow from the running pumps and the lineup.
+
+        :param emptied: Tank process that emptied, when called as its on_empty callback
+        """
+        import Models.FuelFarm.components as components
+        now = self.scheduler.now
+        draw = sum(getattr(components, pump).flow for pump, gate in SUCTION.items()
+                   if getattr(components, gate).position > 0)
+        supplying = [process for name, process in self.processes.items()
+                     if process.level_at(now) > 0.0 and
+                     all(getattr(components, gate).position > 0 for gate in TANK_LINEUPS[name])]
+        for process in self.processes.values():
+            process.set_flow(-draw / len(supplying) if process in supplying else 0.0)
+
+
+def columns(model=None):
+    """Output columns: time, then each tank, valve, and pump field in component order.
+
+    :return: (column name, component, attribute) for every column after time
+    :rtype: list
+    """
+    import Models.FuelFarm.components as components
+    from PipingSystems.tags import POINTS
+    registry = components.registry(model)
+    result = []
+    for name in registry.names():
+        component = registry[name]
+        for kind, points in POINTS:
+            if isinstance(component, kind):
+                result.extend(("{}.{}".format(name, field), component, field) for field in points.values())
+    return result
+
+
+def farm_layout(model=None):
+    """Layout of the tank, gate valve, and pump fields shown by HMILayout.populate(), named like "gate3.position".
+
+    :param model: Module or object holding the components; Models.FuelFarm.components by default
+
+    :rtype: Simulation.streaming.Layout
+    """
+    import Models.FuelFarm.components as components
+    from PipingSystems.tags import PUMP_POINTS, TANK_POINTS, VALVE_POINTS
+    from Simulation.streaming import Layout
+    registry = components.registry(model)
+    points = []
+    for name in registry.names():
+        tags = registry.tags(name)
+        for tag, fields in (("tank", TANK_POINTS), ("gate", VALVE_POINTS), ("pump", PUMP_POINTS)):
+            if tag in tags:
+                points.extend(("{}.{}".format(name, field), registry[name], field) for field in fields.values())
+    return Layout(points)
+
+
+class CSVWriter:
+    """Rows as CSV text, header first."""
+    def __init__(self, stream, names):
+        self.stream = stream
+        self._writer = csv.writer(stream)
+        self._writer.writerow(names)
+
+    def write(self, values):
+        self._writer.writerow(values)
+
+    def close(self):
+        self.stream.flush()
+
+
+class BinaryWriter:
+    """Rows as packed native float64 values after a self-describing header."""
+    def __init__(self, stream, names):
+        self.stream = stream
+        encoded = "\n".join(names).encode("utf-8")
+        stream.write(HEADER.pack(MAGIC, VERSION, len(names), len(encoded)))
+        stream.write(encoded)
+        self._row = struct.Struct("={}d".format(len(names)))
+
+    def write(self, values):
+        self.stream.write(self._row.pack(*values))
+
+    def close(self):
+        self.stream.flush()
+
+
+def read_binary(stream):
+    """Read binary output written by BinaryWriter.
+
+    :except ValueError: Not a scenario output stream
+
+    :return: Column names and a generator of rows
+    :rtype: tuple
+    """
+    magic, version, count, size = HEADER.unpack(stream.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a version {} scenario output stream.".format(VERSION))
+    names = stream.read(size).decode("utf-8").split("\n")
+    row = struct.Struct("={}d".format(count))
+
+    def rows():
+        while True:
+            data = stream.read(row.size)
+            if len(data) < row.size:
+                return
+            yield list(row.unpack(data))
+    return names, rows()
+
+
+def run(commands, writer, step=1.0, duration=None, interlocks=None, messages=None, metrics=None):
+    """Execute a scenario against the installed FuelFarm model and write a row every step seconds.
+
+    The tank levels follow the pumps' draw between commands; see TankDraw.
+
+    :param commands: Commands from parse()
+    :param writer: CSVWriter or BinaryWriter created with ["time"] + the columns() names
+    :param step: Seconds of simulated time between rows
+    :param duration: Simulated seconds to run; by default, until the first row after the last command
+    :param interlocks: Interlock engine to scan after each command, as the HMI does
+    :param messages: Stream for commands refused by an interlock, as "Line <n>: <message>"; standard error by default
+    :param metrics: Simulation.metrics.SimulationMetrics fed with every scheduler event, command, and interlock scan
+
+    :except ValueError: Step not positive, or duration negative
+
+    :return: Rows written
+    :rtype: int
+    """
+    from Simulation.scheduler import EventScheduler
+    if step <= 0:
+        raise ValueError("Step must be positive.")
+    if duration is not None and duration < 0:
+        raise ValueError("Duration must not be negative.")
+    if messages is None:
+        messages = sys.stderr
+    scheduler = EventScheduler(metrics=metrics)
+    tanks = TankDraw(scheduler)
+    points = [(component, field) for _, component, field in columns()]
+    commands = iter(commands)
+    pending = []  # The one queued command, if any
+    rows = [0]
+
+    def queue_next():
+        command = next(commands, None)
+        pending[:] = [] if command is None else [command]
+        if command is not None and (duration is None or command.time <= duration):
+            scheduler.schedule(command.time, execute, command)
+
+    def execute(command):
+        start = time.perf_counter()
+        tanks.sync()
+        blocked = apply_command(command)
+        if blocked:
+            print("Line {}: {}".format(command.line, blocked), file=messages)
+        if interlocks is not None:
+            if metrics is None:
+                interlocks.scan()
+            else:
+                with metrics.timed_scan():
+                    interlocks.scan()
+        tanks.rebase()
+        if metrics is not None:
+            metrics.command(time.perf_counter() - start)
+        queue_next()
+
+    def sample(index):
+        tanks.sync()
+        writer.write([scheduler.now] + [getattr(component, field) for component, field in points])
+        rows[0] += 1
+        following = (index + 1) * step
+        if (duration is not None and following <= duration) or (duration is None and pending):
+            scheduler.schedule(following, sample, index + 1, priority=1)  # After commands at the same time
+        else:
+            finished[0] = True
+
+    finished = [False]
+    queue_next()
+    scheduler.schedule(0.0, sample, 0, priority=1)
+    if duration is None:
+        while not finished[0] and scheduler.step():  # Tank events may still be pending after the last row
+            pass
+    else:
+        scheduler.run(until=duration)
+    writer.close()
+    return rows[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a FuelFarm scenario file and stream the results.")
+    parser.add_argument("scenario", help="Scenario file, or - for standard input")
+    parser.add_argument("--output", default="-", help="Output file, or - for standard output (default)")
+    parser.add_argument("--format", choices=("csv", "binary"), default="csv")
+    parser.add_argument("--step", type=_positive, default=1.0, help="Seconds of simulated time between rows")
+    parser.add_argument("--duration", type=_non_negative,
+                        help="Simulated seconds to run (default: past the last command)")
+    parser.add_argument("--interlocks", action="store_true", help="Enforce the FuelFarm interlocks, as the HMI does")
+    parser.add_argument("--metrics", type=int, metavar="PORT", help="Serve run metrics on this localhost port")
+    args = parser.parse_args(argv)
+
+    try:
+        scenario = sys.stdin if args.scenario == "-" else open(args.scenario)
+    except OSError as error:
+        print("error: {}".format(error), file=sys.stderr)
+        return 1
+    binary = args.format == "binary"
+    lines = output = engine = server = recorder = None
+    try:
+        lines = validate(scenario)
+        if args.metrics is not None:
+            from Simulation import metrics
+            server = metrics.MetricsServer(port=args.metrics)
+            server.start()
+            recorder = metrics.DEFAULT
+        if args.output == "-":
+            output = sys.stdout.buffer if binary else sys.stdout
+        else:
+            output = open(args.output, "wb" if binary else "w", newline=None if binary else "")
+
+        from Models.FuelFarm.factory import FuelFarm
+        FuelFarm.new().install()
+        if args.interlocks:
+            import Models.FuelFarm.interlocks as interlocks
+            engine = interlocks.build_engine()
+            engine.install()
+        names = ["time"] + [name for name, _, _ in columns()]
+        writer = BinaryWriter(output, names) if binary else CSVWriter(output, names)
+        run(parse(lines), writer, args.step, args.duration, engine, metrics=recorder)
+    except (OSError, ValueError) as error:
+        print("error: {}".format(error), file=sys.stderr)
+        return 1
+    finally:
+        if engine is not None:
+            engine.uninstall()
+        if server is not None:
+            server.stop()
+        for stream in (scenario, lines, output):
+            if stream not in (None, sys.stdin, sys.stdout, sys.stdout.buffer):
+                stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
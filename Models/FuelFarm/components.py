@@ -21,80 +21,139 @@ from PipingSystems.storage_tank import tank
 # Constants
 DENSITY = 1.629869
 SPEC_GRAVITY = 0.840
+TANK_HEIGHT = 36.0  # ft
+GALLONS_PER_FOOT = 27778  # 1 million gallons over the tank height
+
+# Module attributes created by build()
+COMPONENTS = ("tank1", "tank2",
+              "gate1", "gate2", "gate3", "gate4", "gate5", "gate6", "gate7", "gate8", "gate9", "gate10",
+              "pump1", "pump2", "pump3",
+              "relief1", "relief2", "relief3",
+              "throttle1", "throttle2", "throttle3")
+
+
+def construct():
+    """Construct every component in its initial state.
+
+    :return: Component name -> component, for each name in COMPONENTS
+    :rtype: dict
+    """
+    # Storage tanks
+    # Assumes 36 ft tall tank w/ 1 million gallon capacity = 27778 gallons per foot
+    # Assumes 16 inch diam transfer piping
+    tank1 = tank.Tank("Tank 1", level=36.0, fluid_density=DENSITY, spec_gravity=SPEC_GRAVITY, outlet_diam=16,
+                      outlet_slope=0.25)
+    tank1.static_tank_press = tank1.level
+    tank1.gravity_flow(tank1.pipe_diam, tank1.pipe_slope, tank1.pipe_coeff)
+
+    tank2 = tank.Tank("Tank 2", level=36.0, fluid_density=DENSITY, spec_gravity=SPEC_GRAVITY, outlet_diam=16,
+                      outlet_slope=0.25)
+    tank2.static_tank_press = tank2.level
+    tank2.gravity_flow(tank2.pipe_diam, tank2.pipe_slope, tank2.pipe_coeff)
+
+    # Pump inlet manifold
+    # 16 inch to 4 inch connections
+    gate1 = valve.Gate("Gate valve 1", sys_flow_in=tank1.flow_out, press_in=tank1.static_tank_press)
+    gate1.calc_coeff(16)
+
+    gate2 = valve.Gate("Gate valve 2", sys_flow_in=tank2.flow_out, press_in=tank2.static_tank_press)
+    gate2.calc_coeff(16)
+
+    gate3 = valve.Gate("Gate valve 3")
+    gate3.calc_coeff(16)
+
+    gate4 = valve.Gate("Gate valve 4")
+    gate4.calc_coeff(16)
+
+    gate5 = valve.Gate("Gate valve 5")
+    gate5.calc_coeff(4)
+
+    gate6 = valve.Gate("Gate valve 6", sys_flow_in=gate3.flow_out + gate4.flow_out,
+                       press_in=gate3.press_out + gate4.press_out)
+    gate6.calc_coeff(4)
+
+    gate7 = valve.Gate("Gate valve 7")
+    gate7.calc_coeff(4)
+
+    # Fuel pumps
+    # 1480 rpm
+    pump1 = pump.PositiveDisplacement("Pump 1",
+                                      flow_rate_out=0.0,
+                                      pump_head_in=utility_formulas.press_to_head(gate5.press_out),
+                                      displacement=0.24)
+
+    pump2 = pump.PositiveDisplacement("Pump 2",
+                                      flow_rate_out=0.0,
+                                      pump_head_in=utility_formulas.press_to_head(gate6.press_out),
+                                      displacement=0.24)
+
+    pump3 = pump.PositiveDisplacement("Pump 3",
+                                      flow_rate_out=0.0,
+                                      pump_head_in=utility_formulas.press_to_head(gate7.press_out),
+                                      displacement=0.24)
+
+    # Pump outlet manifold
+    relief1 = valve.Relief("Relief 1", sys_flow_in=pump1.flow, flow_coeff=0.81)
+    relief2 = valve.Relief("Relief 2", sys_flow_in=pump2.flow, flow_coeff=0.81)
+    relief3 = valve.Relief("Relief 3", sys_flow_in=pump3.flow, flow_coeff=0.81)
+
+    throttle1 = valve.Globe("Flow Control 1", sys_flow_in=pump1.flow, press_in=pump1.outlet_pressure, flow_coeff=165)
+    throttle2 = valve.Globe("Flow Control 2", sys_flow_in=pump1.flow, press_in=pump1.outlet_pressure, flow_coeff=165)
+    throttle3 = valve.Globe("Flow Control 3", sys_flow_in=pump1.flow, press_in=pump1.outlet_pressure, flow_coeff=165)
+
+    gate8 = valve.Gate("Gate valve 8", sys_flow_in=pump2.flow + pump3.flow,
+                       press_in=pump2.outlet_pressure or pump3.outlet_pressure)
+    gate8.calc_coeff(4)
+
+    gate9 = valve.Gate("Gate valve 9", sys_flow_in=pump1.flow, press_in=pump1.outlet_pressure)
+    gate9.calc_coeff(4)
+
+    gate10 = valve.Gate("Gate valve 10", sys_flow_in=pump2.flow + pump3.flow,
+                        press_in=pump2.outlet_pressure or pump3.outlet_pressure)
+    gate10.calc_coeff(4)
+
+    built = locals()
+    return {name: built[name] for name in COMPONENTS}
+
+
+def build():
+    """Construct the components and publish them as module attributes.
+
+    Runs automatically the first time a component is accessed, so importing this module stays cheap. Calling it again
+    replaces the components with new ones, resetting the model.
+    """
+    globals().update(construct())
+
+
+def registry(model=None):
+    """Index a FuelFarm's components, named as in COMPONENTS and tagged with their kind ("gate", "pump", ...).
+
+    :param model: Module or object holding the components; this module by default
+
+    :return: Registry of the components
+    :rtype: ComponentRegistry
+    """
+    from PipingSystems.registry import ComponentRegistry
+    if model is None:
+        import sys
+        model = sys.modules[__name__]
+    index = ComponentRegistry()
+    for name in COMPONENTS:
+        index.register(getattr(model, name), name=name, tags=(name.rstrip("0123456789"),))
+    return index
+
+
+def __getattr__(name):
+    """Build the components on first access."""
+    if name in COMPONENTS:
+        build()
+        return globals()[name]
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(COMPONENTS))
 
-# Storage tanks
-# Assumes 36 ft tall tank w/ 1 million gallon capacity = 27778 gallons per foot
-# Assumes 16 inch diam transfer piping
-tank1 = tank.Tank("Tank 1", level=36.0, fluid_density=DENSITY, spec_gravity=SPEC_GRAVITY, outlet_diam=16,
-                  outlet_slope=0.25)
-tank1.static_tank_press = tank1.level
-tank1.gravity_flow(tank1.pipe_diam, tank1.pipe_slope, tank1.pipe_coeff)
-
-tank2 = tank.Tank("Tank 2", level=36.0, fluid_density=DENSITY, spec_gravity=SPEC_GRAVITY, outlet_diam=16,
-                  outlet_slope=0.25)
-tank2.static_tank_press = tank2.level
-tank2.gravity_flow(tank2.pipe_diam, tank2.pipe_slope, tank2.pipe_coeff)
-
-# Pump inlet manifold
-# 16 inch to 4 inch connections
-gate1 = valve.Gate("Gate valve 1", sys_flow_in=tank1.flow_out, press_in=tank1.static_tank_press)
-gate1.calc_coeff(16)
-
-gate2 = valve.Gate("Gate valve 2", sys_flow_in=tank2.flow_out, press_in=tank2.static_tank_press)
-gate2.calc_coeff(16)
-
-gate3 = valve.Gate("Gate valve 3")
-gate3.calc_coeff(16)
-
-gate4 = valve.Gate("Gate valve 4")
-gate4.calc_coeff(16)
-
-gate5 = valve.Gate("Gate valve 5")
-gate5.calc_coeff(4)
-
-gate6 = valve.Gate("Gate valve 6", sys_flow_in=gate3.flow_out + gate4.flow_out,
-                   press_in=gate3.press_out + gate4.press_out)
-gate6.calc_coeff(4)
-
-gate7 = valve.Gate("Gate valve 7")
-gate7.calc_coeff(4)
-
-# Fuel pumps
-# 1480 rpm
-pump1 = pump.PositiveDisplacement("Pump 1",
-                                  flow_rate_out=0.0,
-                                  pump_head_in=utility_formulas.press_to_head(gate5.press_out),
-                                  displacement=0.24)
-
-pump2 = pump.PositiveDisplacement("Pump 2",
-                                  flow_rate_out=0.0,
-                                  pump_head_in=utility_formulas.press_to_head(gate6.press_out),
-                                  displacement=0.24)
-
-pump3 = pump.PositiveDisplacement("Pump 3",
-                                  flow_rate_out=0.0,
-                                  pump_head_in=utility_formulas.press_to_head(gate7.press_out),
-                                  displacement=0.24)
-
-# Pump outlet manifold
-relief1 = valve.Relief("Relief 1", sys_flow_in=pump1.flow, flow_coeff=0.81)
-relief2 = valve.Relief("Relief 2", sys_flow_in=pump2.flow, flow_coeff=0.81)
-relief3 = valve.Relief("Relief 3", sys_flow_in=pump3.flow, flow_coeff=0.81)
-
-throttle1 = valve.Globe("Flow Control 1", sys_flow_in=pump1.flow, press_in=pump1.outlet_pressure, flow_coeff=165)
-throttle2 = valve.Globe("Flow Control 2", sys_flow_in=pump1.flow, press_in=pump1.outlet_pressure, flow_coeff=165)
-throttle3 = valve.Globe("Flow Control 3", sys_flow_in=pump1.flow, press_in=pump1.outlet_pressure, flow_coeff=165)
-
-gate8 = valve.Gate("Gate valve 8", sys_flow_in=pump2.flow + pump3.flow,
-                   press_in=pump2.outlet_pressure or pump3.outlet_pressure)
-gate8.calc_coeff(4)
-
-gate9 = valve.Gate("Gate valve 9", sys_flow_in=pump1.flow, press_in=pump1.outlet_pressure)
-gate9.calc_coeff(4)
-
-gate10 = valve.Gate("Gate valve 10", sys_flow_in=pump2.flow + pump3.flow,
-                    press_in=pump2.outlet_pressure or pump3.outlet_pressure)
-gate10.calc_coeff(4)
 
 if __name__ == "__main__":
     pass
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC config_table.py
+
+Purpose: Every FuelFarm gate/pump lineup solved in advance over a grid of tank levels, stored in a memory-mapped file.
+
+There are 2^13 lineups (10 gates and 3 pumps, open/closed or on/off). functionality.py updates only the components
+downstream of the valve or pump that moved, so the flows and pressures of a lineup depend on the order its gates were
+opened and its pumps started. For each point of the tank level grid, the builder therefore walks the lineups by the
+number of actions taken, from a reset farm: a lineup's states are those of every lineup one action short of it with
+that action applied, which covers every order exactly without enumerating orders. Each record holds the state reached
+in the fixed order (gates 1 - 10, then pumps 1 - 3) and, per field, the lowest and highest value over all orders. The
+grid points are spread over worker processes.
+
+At runtime the file is memory-mapped read-only, so opening it is instant and the OS shares its pages between processes;
+a lookup reads the four surrounding grid records and interpolates bilinearly in the tank levels. The table is reference
+data for validating functionality.py: check() reports live values outside the range any opening order could produce.
+
+Installed on the functionality module, the table also serves opening commands (gateN_open, pumpN_on) by lookup where
+that gives exactly what the action would. The model must hold its lineup's fixed-order state, and either the command
+comes later in the fixed order than every open gate and running pump, or every order of reaching the commanded lineup
+ends in the same state (bounds() lowest == highest). Anything else, including every closing command and tank levels
+between grid points, runs the original action. Install it before the interlocks, so that permissives are still checked
+first. Confirming that the model holds the fixed-order state reads every gate and pump field, which costs more than the
+action it replaces, so the HMI runs the actions directly; installing the table is for testing it against the model.
+
+A builder mask limits the table to lineups made of some of the actions, e.g. for tests; other lineups hold NaN.
+
+File layout (native byte order):
+    Header, 64 bytes
+        0   4s   magic b"VPCT"
+        4   u32  format version (3)
+        8   u32  number of tank 1 grid levels, N1
+        12  u32  number of tank 2 grid levels, N2
+        16  u32  values per record, R
+    f64 * N1   tank 1 grid levels, ascending
+    f64 * N2   tank 2 grid levels, ascending
+    f64 * R    records, indexed (i1 * N2 + i2) * 8192 + lineup, where lineup = gate mask | pump mask << 10
+        fixed order, then lowest, then highest over all orders, each of:
+            per gate 1 - 10:  position, pressure in, flow in, pressure out, flow out
+            per pump 1 - 3:   speed, power, outlet pressure, flow, inlet head
+
+Classes:
+    ConfigTable: Read-only view of a table file
+    TableInfo: Served/fallback statistics
+
+Functions:
+    lineup(): Current gate and pump bit masks
+    solve_lineup(): Solve one lineup in the fixed order on a scratch farm
+    build(): Solve every lineup and write a table file
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import array
+import bisect
+import collections
+import functools
+import mmap
+import os
+import struct
+
+import Models.FuelFarm.components as components
+from Models.FuelFarm.factory import FuelFarm
+
+GATES = ["gate{}".format(number) for number in range(1, 11)]
+PUMPS = ["pump1", "pump2", "pump3"]
+TANKS = ["tank1", "tank2"]
+SOLVED = [name for name in components.COMPONENTS if name not in TANKS]
+
+MAGIC = b"VPCT"
+VERSION = 3
+HEADER = struct.Struct("=4sIIII")
+HEADER_SIZE = 64
+
+GATE_FIELDS = ("position", "press_in", "flow_in", "press_out", "flow_out")
+PUMP_FIELDS = ("speed", "power", "outlet_pressure", "flow", "head_in")
+FIELDS = [(gate, field) for gate in GATES for field in GATE_FIELDS] + \
+         [(pump, field) for pump in PUMPS for field in PUMP_FIELDS]
+RECORD_VALUES = 3 * len(FIELDS)  # Fixed order, lowest, highest
+LINEUPS = 1 << (len(GATES) + len(PUMPS))
+ACTIONS = ["{}_open".format(gate) for gate in GATES] + ["{}_on".format(pump) for pump in PUMPS]  # By lineup bit
+DEFAULT_LEVELS = (0.0, 12.0, 24.0, 36.0)
+COMMANDS = {name: bit for bit, name in enumerate(ACTIONS)}  # Opening command -> lineup bit
+
+TableInfo = collections.namedtuple("TableInfo", "served fallbacks")
+
+# Instance attributes behind the property fields, as found in a component's attribute dict
+STATE_KEYS = {"position": "_Valve__position", "speed": "_Pump__speed", "power": "_Pump__wattage",
+              "outlet_pressure": "_Pump__outlet_pressure", "flow": "_Pump__flow_rate_out"}
+
+
+def lineup(model=components):
+    """Open gates and running pumps as bit masks (bit 0 is gate 1 or pump 1).
+
+    :return: (gate mask, pump mask)
+    :rtype: tuple
+    """
+    gates = sum(1 << bit for bit, name in enumerate(GATES) if getattr(model, name).position > 0)
+    pumps = sum(1 << bit for bit, name in enumerate(PUMPS) if getattr(model, name).speed > 0)
+    return gates, pumps
+
+
+def solve_lineup(gates, pumps, levels):
+    """Solve a lineup on a fresh scratch farm in the fixed order, leaving the live model untouched.
+
+    :param gates: Open gate bit mask
+    :param pumps: Running pump bit mask
+    :param levels: Tank levels, in feet
+
+    :return: Component name -> attribute values, for the valves and pumps
+    :rtype: dict
+    """
+    import Models.FuelFarm.functionality as functionality
+    scratch = FuelFarm.new()
+    saved = {name: vars(components)[name] for name in components.COMPONENTS if name in vars(components)}
+    scratch.install()
+    try:
+        for name, level in zip(TANKS, levels):
+            functionality.change_tank_level(getattr(scratch, name), level)
+        for bit, name in enumerate(GATES):
+            if gates >> bit & 1:
+                getattr(functionality, "{}_open".format(name))()
+        for bit, name in enumerate(PUMPS):
+            if pumps >> bit & 1:
+                getattr(functionality, "{}_on".format(name))()
+    finally:
+        vars(components).update(saved)
+    return {name: dict(vars(getattr(scratch, name))) for name in SOLVED}
+
+
+def _solve_grid_point(levels, mask=LINEUPS - 1):
+    """All lineups of the masked actions at one pair of tank levels, reached in every order, as packed records."""
+    import Models.FuelFarm.functionality as functionality
+    scratch = FuelFarm.new()
+    saved = {name: vars(components)[name] for name in components.COMPONENTS if name in vars(components)}
+    scratch.install()
+    try:
+        for name, level in zip(TANKS, levels):
+            functionality.change_tank_level(getattr(scratch, name), level)
+        parts = [getattr(scratch, name) for name in components.COMPONENTS]
+        actions = [getattr(functionality, name) for name in ACTIONS]
+        positions = {name: position for position, name in enumerate(components.COMPONENTS)}
+        fields = [(positions[name], STATE_KEYS.get(field, field)) for name, field in FIELDS]
+        # A model state is a tuple of component state numbers; each distinct component state is stored once
+        numbers = {}
+        attributes = []
+        current = []
+
+        def number_of(items):
+            number = numbers.get(items)
+            if number is None:
+                number = numbers[items] = len(attributes)
+                attributes.append(dict(items))
+            return number
+
+        def snapshot():
+            """Model state after an action, re-reading only the components it changed."""
+            for position, part in enumerate(parts):
+                if vars(part) != attributes[current[position]]:
+                    current[position] = number_of(tuple(vars(part).items()))
+            return tuple(current)
+
+        def restore(state):
+            for position, number in enumerate(state):
+                if current[position] != number:
+                    own = vars(parts[position])
+                    own.clear()
+                    own.update(attributes[number])
+                    current[position] = number
+
+        def record(states, fixed):
+            rows = [[float(attributes[state[position]][key]) for position, key in fields] for state in states]
+            return [float(attributes[fixed[position]][key]) for position, key in fields] + \
+                [min(column) for column in zip(*rows)] + [max(column) for column in zip(*rows)]
+
+        current.extend(number_of(tuple(vars(part).items())) for part in parts)
+        start = snapshot()
+        records = {0: record([start], start)}
+        layer, fixed_order = {0: {start}}, {0: start}
+        while layer:
+            following, following_fixed = {}, {}
+            for number, states in layer.items():
+                for bit, action in enumerate(actions):
+                    if number >> bit & 1 or not mask >> bit & 1:
+                        continue
+                    reached = following.setdefault(number | 1 << bit, set())
+                    for state in states:
+                        restore(state)
+                        action()
+                        reached.add(snapshot())
+                    if number < 1 << bit:  # Every earlier action has a lower bit: the fixed order
+                        restore(fixed_order[number])
+                        action()
+                        following_fixed[number | 1 << bit] = snapshot()
+            for number, states in following.items():
+                records[number] = record(states, following_fixed[number])
+            layer, fixed_order = following, following_fixed
+    finally:
+        vars(components).update(saved)
+    values = array.array("d")
+    missing = [float("nan")] * RECORD_VALUES
+    for number in range(LINEUPS):
+        values.extend(records.get(number, missing))
+    return values.tobytes()
+
+
+def build(path, levels1=DEFAULT_LEVELS, levels2=None, workers=None, mask=LINEUPS - 1):
+    """Solve every lineup over the tank level grid and write the table.
+
+    :param path: Output file
+    :param levels1: Tank 1 grid levels, in feet
+    :param levels2: Tank 2 grid levels, in feet; the same as tank 1 by default
+    :param workers: Worker processes; os.cpu_count() by default, 1 to build in this process
+    :param mask: Lineup bits of the actions to solve for; lineups using any other action are left NaN
+
+    :except ValueError: Grid levels not strictly ascending
+
+    :return: Number of lineups solved
+    :rtype: int
+    """
+    levels1 = [float(level) for level in levels1]
+    levels2 = levels1 if levels2 is None else [float(level) for level in levels2]
+    for grid in (levels1, levels2):
+        if not grid or any(low >= high for low, high in zip(grid, grid[1:])):
+            raise ValueError("Grid levels must be strictly ascending.")
+    points = [(level1, level2) for level1 in levels1 for level2 in levels2]
+    workers = workers or os.cpu_count() or 1
+
+    with open(path, "wb") as table:
+        table.write(HEADER.pack(MAGIC, VERSION, len(levels1), len(levels2), RECORD_VALUES).ljust(HEADER_SIZE, b"\0"))
+        table.write(array.array("d", levels1 + levels2).tobytes())
+        if workers == 1:
+            for point in points:
+                table.write(_solve_grid_point(point, mask))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(workers, len(points))) as executor:
+                for block in executor.map(functools.partial(_solve_grid_point, mask=mask), points):  # In grid order
+                    table.write(block)
+    return len(points) * sum(1 for number in range(LINEUPS) if number & mask == number)
+
+
+class ConfigTable:
+    """Memory-mapped lineup table.
+
+    Methods: values(), bounds(), solution(), apply(), check(), run(), table_info(), install(), uninstall(), close()
+    """
+    def __init__(self, path):
+        """Map a table file read-only.
+
+        :except ValueError: Not a table file, or a different format version
+        """
+        with open(path, "rb") as table:
+            self._map = mmap.mmap(table.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count1, count2, record_values = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_values != RECORD_VALUES:
+            self._map.close()
+            raise ValueError("{} is not a version {} configuration table.".format(path, VERSION))
+        self._view = memoryview(self._map)[HEADER_SIZE:].cast("d")
+        self.levels1 = self._view[:count1].tolist()
+        self.levels2 = self._view[count1:count1 + count2].tolist()
+        self._records = count1 + count2
+        self._originals = {}
+        self._installed = {}
+        self._actions = None
+        self.served = 0
+        self.fallbacks = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+
+    @staticmethod
+    def _bracket(grid, level):
+        """Grid indices either side of a level and the weight of the upper one; clamped to the grid."""
+        if level <= grid[0] or len(grid) == 1:
+            return 0, 0, 0.0
+        if level >= grid[-1]:
+            return len(grid) - 1, len(grid) - 1, 0.0
+        upper = bisect.bisect_right(grid, level)
+        lower = upper - 1
+        return lower, upper, (level - grid[lower]) / (grid[upper] - grid[lower])
+
+    def _record(self, index1, index2, number):
+        start = self._records + ((index1 * len(self.levels2) + index2) * LINEUPS + number) * RECORD_VALUES
+        return self._view[start:start + RECORD_VALUES]
+
+    def _interpolated(self, gates, pumps, levels):
+        """Interpolated record for a lineup: fixed order, lowest, and highest values, in FIELDS order each."""
+        number = gates | pumps << len(GATES)
+        low1, high1, weight1 = self._bracket(self.levels1, levels[0])
+        low2, high2, weight2 = self._bracket(self.levels2, levels[1])
+        if not weight1 and not weight2:  # On a grid point
+            return self._record(low1, low2, number).tolist()
+        corners = [(low1, low2, (1 - weight1) * (1 - weight2)), (low1, high2, (1 - weight1) * weight2),
+                   (high1, low2, weight1 * (1 - weight2)), (high1, high2, weight1 * weight2)]
+        result = [0.0] * RECORD_VALUES
+        for index1, index2, weight in corners:
+            if weight:
+                result = [total + weight * value for total, value in zip(result, self._record(index1, index2, number))]
+        return result
+
+    def values(self, gates, pumps, levels):
+        """Interpolated state of a lineup reached in the fixed order.
+
+        :param gates: Open gate bit mask
+        :param pumps: Running pump bit mask
+        :param levels: (tank 1, tank 2) levels, in feet
+
+        :return: A float per field, in FIELDS order
+        :rtype: list
+        """
+        return self._interpolated(gates, pumps, levels)[:len(FIELDS)]
+
+    def bounds(self, gates, pumps, levels):
+        """Interpolated lowest and highest value of each field over every order of reaching a lineup.
+
+        :return: (lowest, highest), each a float per field in FIELDS order
+        :rtype: tuple
+        """
+        record = self._interpolated(gates, pumps, levels)
+        count = len(FIELDS)
+        return record[count:2 * count], record[2 * count:]
+
+    def solution(self, gates, pumps, levels):
+        """values() grouped by component, in the shape apply() writes to a model.
+
+        :return: Component name -> {field: value}
+        :rtype: dict
+        """
+        solution = {}
+        for (name, field), value in zip(FIELDS, self.values(gates, pumps, levels)):
+            solution.setdefault(name, {})[field] = value
+        return solution
+
+    @staticmethod
+    def _levels(model):
+        return [getattr(model, tank).level for tank in TANKS]
+
+    def apply(self, gates, pumps, model=components):
+        """Set the gates and pumps of a model to a lineup's fixed-order state at the model's tank levels."""
+        for name, fields in self.solution(gates, pumps, self._levels(model)).items():
+            component = getattr(model, name)
+            for field, value in fields.items():
+                setattr(component, field, int(round(value)) if field in ("position", "speed") else value)
+
+    def check(self, model=components, tolerance=1e-6):
+        """Compare a model's gates and pumps with the table for its current lineup and tank levels.
+
+        A value is accepted if some order of opening the lineup's gates and starting its pumps from a reset farm gives
+        it. Lineups reached by closing gates or stopping pumps may leave values no opening order produces.
+
+        :return: (component, field, lowest, highest, model value) for every value outside the range by more than the
+            tolerance
+        :rtype: list
+        """
+        gates, pumps = lineup(model)
+        differences = []
+        lowest, highest = self.bounds(gates, pumps, self._levels(model))
+        for (name, field), low, high in zip(FIELDS, lowest, highest):
+            actual = getattr(getattr(model, name), field)
+            margin = tolerance * max(1.0, abs(low), abs(high))
+            if actual < low - margin or actual > high + margin:
+                differences.append((name, field, low, high, actual))
+        return differences
+
+    def _unique(self, gates, pumps, levels, tolerance):
+        """Whether every opening order reaches the same state of a lineup."""
+        record = self._interpolated(gates, pumps, levels)
+        count = len(FIELDS)
+        return all(abs(high - low) <= tolerance * max(1.0, abs(low))  # False for NaN, in lineups not built
+                   for low, high in zip(record[count:2 * count], record[2 * count:]))
+
+    def _exact(self, name, model, tolerance):
+        """Lineup an opening command leads to, if the table gives exactly what the action would; else None."""
+        bit = COMMANDS.get(name)
+        if bit is None:
+            return None
+        gates, pumps = lineup(model)
+        number = gates | pumps << len(GATES)
+        if number >> bit & 1:
+            return None
+        levels = self._levels(model)
+        for (component, field), value in zip(FIELDS, self.values(gates, pumps, levels)):
+            if not abs(getattr(getattr(model, component), field) - value) <= tolerance * max(1.0, abs(value)):
+                return None  # Not the fixed-order state, e.g. after a gate was closed or between grid levels
+        target = number | 1 << bit
+        target = target & (1 << len(GATES)) - 1, target >> len(GATES)
+        if number < 1 << bit or self._unique(target[0], target[1], levels, tolerance):
+            return target
+        return None
+
+    def run(self, name, tolerance=1e-9):
+        """Carry out an action on the installed model, from the table where that is exact.
+
+        :param name: Action name, e.g. "gate3_open"
+        :param tolerance: Relative difference below which table and model values count as equal
+
+        :return: What the action returns; None when served from the table
+        """
+        target = self._exact(name, components, tolerance)
+        if target is None:
+            self.fallbacks += 1
+            return self._action(name)()
+        self.apply(target[0], target[1])
+        self.served += 1
+        return None
+
+    def _action(self, name):
+        original = self._originals.get(name)
+        if original is not None:
+            return original
+        import Models.FuelFarm.functionality as functionality
+        return getattr(functionality, name)
+
+    def table_info(self):
+        return TableInfo(self.served, self.fallbacks)
+
+    def _table_action(self, name):
+        table = self
+
+        @functools.wraps(self._originals[name])
+        def action():
+            return table.run(name)
+        return action
+
+    def install(self, actions=None):
+        """Replace the gate and pump actions with ones served from the table where exact.
+
+        :param actions: Module holding the actions; Models.FuelFarm.functionality by default
+        """
+        if actions is None:
+            import Models.FuelFarm.functionality as actions
+        if self._installed:
+            return
+        names = [gate + suffix for gate in GATES for suffix in ("_open", "_close")]
+        names += [pump + suffix for pump in PUMPS for suffix in ("_on", "_off")]
+        for name in names:
+            self._originals[name] = getattr(actions, name)
+            self._installed[name] = self._table_action(name)
+        for name, wrapper in self._installed.items():
+            setattr(actions, name, wrapper)
+        self._actions = actions
+
+    def uninstall(self):
+        """Restore the original actions, unless something else has replaced them since."""
+        for name, wrapper in self._installed.items():
+            if getattr(self._actions, name, None) is wrapper:
+                setattr(self._actions, name, self._originals[name])
+        self._installed.clear()
+        self._originals.clear()
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    start = time.perf_counter()
+    solved = build(sys.argv[1] if len(sys.argv) > 1 else "fuel_farm_table.bin")
+    print("{} lineups solved in {:.1f} s".format(solved, time.perf_counter() - start))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC factory.py
+
+Purpose: Independent FuelFarm model instances, cloned from a prebuilt template.
+
+The template is constructed once per process. Every component holds only numbers, strings, and tuples, so a clone is a
+new instance of the same class with a copy of the template instance's __dict__; no constructor or calculation reruns.
+functionality and the HMI work on the Models.FuelFarm.components module attributes, so a farm is put into use with
+install().
+
+Classes:
+    FuelFarm: One set of FuelFarm components
+
+Functions:
+    clone(): Copy a component without running its constructor
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import Models.FuelFarm.components as components
+
+
+def clone(component):
+    """Copy a component's state into a new instance of its class."""
+    copy = object.__new__(type(component))
+    copy.__dict__.update(component.__dict__)
+    return copy
+
+
+class FuelFarm:
+    """Tanks, valves, and pumps of one FuelFarm model; attributes are named as in components.COMPONENTS.
+
+    Methods: new(), copy(), install()
+    """
+    _template = None
+
+    def __init__(self, parts):
+        """:param parts: Component name -> component, for each name in components.COMPONENTS"""
+        missing = set(components.COMPONENTS) - set(parts)
+        if missing:
+            raise ValueError("Missing components: {}".format(", ".join(sorted(missing))))
+        self.__dict__.update(parts)
+
+    @classmethod
+    def template(cls):
+        """Components in their initial state, constructed on first use and never modified."""
+        if cls._template is None:
+            cls._template = components.construct()
+        return cls._template
+
+    @classmethod
+    def new(cls):
+        """Farm in the initial state, cloned from the template."""
+        return cls({name: clone(part) for name, part in cls.template().items()})
+
+    def copy(self):
+        """Independent farm in this farm's current state."""
+        return type(self)({name: clone(getattr(self, name)) for name in components.COMPONENTS})
+
+    def parts(self):
+        """Component name -> component."""
+        return {name: getattr(self, name) for name in components.COMPONENTS}
+
+    def install(self, module=components):
+        """Make this farm the model that functionality, the interlocks, and the HMI operate on.
+
+        :param module: Module whose component attributes are replaced
+        """
+        vars(module).update(self.parts())
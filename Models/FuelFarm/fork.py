@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC fork.py
+
+Purpose: Copy-on-write forks of the running FuelFarm model for what-if analysis.
+
+Forking copies the attribute dict of every live component into the fork's snapshot, once. The live components are
+neither modified nor watched, so the rest of the model, and every other component in the process, sees nothing of the
+fork. A fork builds its component from the snapshot the first time it is used: a plain instance of the component's
+class with its own copy of the dict, as factory.clone() makes. Components a fork never uses are not copied again, and
+forking a fork re-snapshots only the components it has used; the others share the snapshot, which is never written.
+
+Fork components are ordinary instances, so isinstance() checks, methods, properties, copy, and pickle behave as for
+the live components.
+
+Classes:
+    Fork: Independent view of the model from the moment it was forked
+
+Functions:
+    fork(): Fork the live model
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import contextlib
+
+import Models.FuelFarm.components as components
+
+_MISSING = object()
+
+
+def _snapshot(component):
+    """Class and a copy of the attribute dict of a component."""
+    return type(component), dict(vars(component))
+
+
+class Fork:
+    """Copy-on-write view of the FuelFarm model; components are attributes named as in components.COMPONENTS.
+
+    Methods: parts(), fork(), changes(), active(), run()
+    """
+    def __init__(self, layers):
+        """:param layers: Component name -> (class, attribute dict); the dicts are shared and must not be modified"""
+        self._layers = layers
+        self._parts = {}
+
+    def __getattr__(self, name):
+        layers = self.__dict__.get("_layers", {})
+        if name not in layers:
+            raise AttributeError(name)
+        part = self._parts.get(name)
+        if part is None:
+            cls, state = layers[name]
+            part = self._parts[name] = object.__new__(cls)
+            part.__dict__.update(state)
+        return part
+
+    def parts(self):
+        """Component name -> component, for every component."""
+        return {name: getattr(self, name) for name in self._layers}
+
+    def fork(self):
+        """Fork this fork in its current state."""
+        layers = dict(self._layers)
+        for name, part in self._parts.items():
+            layers[name] = _snapshot(part)
+        return Fork(layers)
+
+    def changes(self):
+        """Attributes changed in this fork since it was created, by component name."""
+        changed = {}
+        for name, part in self._parts.items():
+            state = self._layers[name][1]
+            attributes = {key: value for key, value in vars(part).items() if state.get(key, _MISSING) != value}
+            if attributes:
+                changed[name] = attributes
+        return changed
+
+    @contextlib.contextmanager
+    def active(self, module=components):
+        """Point the components module at this fork while the block runs, so functionality acts on the fork.
+
+        Not thread-safe: other threads using the module see the fork until the block exits.
+        """
+        saved = {name: vars(module)[name] for name in self._layers if name in vars(module)}
+        vars(module).update(self.parts())
+        try:
+            yield self
+        finally:
+            vars(module).update(saved)
+
+    def run(self, action, *args):
+        """Call a functionality action against this fork.
+
+        :return: The action's return value
+        """
+        with self.active():
+            return action(*args)
+
+
+def fork(module=components):
+    """Fork the live model; the live components carry on unaffected by the fork and vice versa.
+
+    :return: Independent view of the model as it is now
+    :rtype: Fork
+    """
+    return Fork({name: _snapshot(getattr(module, name)) for name in components.COMPONENTS})
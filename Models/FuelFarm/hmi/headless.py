@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC headless.py
+
+Purpose: Minimal stand-ins for the Kivy modules hmilayout imports, so the HMI's command and refresh logic can run in
+tests and benchmarks on machines without Kivy or a display.
+
+The stand-ins only cover what hmilayout uses at import time and from its methods: App, PageLayout, Config.set(),
+Clock scheduling (recorded, never run), and kivy.require(). Widgets are never created; callers pass stand-in layouts
+with the attributes a method touches, e.g. types.SimpleNamespace(table=types.SimpleNamespace(data=[])).
+
+Functions:
+    install(): Register the stand-ins if Kivy isn't importable
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import sys
+import types
+
+
+class _Clock:
+    """Records scheduled callbacks instead of running them."""
+    def __init__(self):
+        self.scheduled = []
+
+    def schedule_interval(self, callback, interval):
+        self.scheduled.append((callback, interval))
+        return callback
+
+    def schedule_once(self, callback, timeout=0):
+        self.scheduled.append((callback, timeout))
+        return callback
+
+
+def install():
+    """Register Kivy stand-ins in sys.modules, unless Kivy itself can be imported.
+
+    :return: True if the stand-ins are in use
+    :rtype: bool
+    """
+    if "kivy" in sys.modules:
+        return getattr(sys.modules["kivy"], "HEADLESS", False)
+    try:
+        import kivy  # noqa: F401
+        return False
+    except ImportError:
+        pass
+
+    def module(name, **attributes):
+        stand_in = types.ModuleType(name)
+        stand_in.__dict__.update(attributes)
+        sys.modules[name] = stand_in
+        return stand_in
+
+    module("kivy", HEADLESS=True, require=lambda version: None)
+    module("kivy.app", App=type("App", (), {"run": lambda self: None}))
+    module("kivy.config", Config=types.SimpleNamespace(set=lambda section, option, value: None))
+    module("kivy.clock", Clock=_Clock())
+    module("kivy.uix")
+    module("kivy.uix.pagelayout", PageLayout=type("PageLayout", (), {}))
+    return True
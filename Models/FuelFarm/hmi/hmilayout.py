@@ -1,216 +1,139 @@
 import Models.FuelFarm.components as components
 import Models.FuelFarm.functionality as functionality
+import Models.FuelFarm.interlocks as interlocks
+import Models.FuelFarm.hmi.terminal as terminal
+import Simulation.metrics as metrics
+import Simulation.tracing as tracing
+
+import os
+import sys
+import time
 
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.uix.pagelayout import PageLayout
 from kivy.config import Config
 
 import kivy
 kivy.require("1.10.0")
 
-Config.set("graphics", "width", "1112")
-Config.set("graphics", "height", "849")
-Config.set("graphics", "resizable", False)
+SCAN_PERIOD = 0.1  # Seconds between interlock scans
+
+interlock_engine = None  # Created when the app starts
+component_registry = None  # Use current_registry(); rebuilt when the model is replaced
+commands = {}
+_syncing = set()  # Groups of buttons the HMI is moving itself; their on_state must not command the device
+
+
+def command_table(registry):
+    """Device group -> (action when released, action when pressed), as functionality attribute names."""
+    table = {}
+    for name in registry.names():
+        tags = registry.tags(name)
+        if "gate" in tags:
+            table[name] = (name + "_close", name + "_open")
+        elif "pump" in tags:
+            table[name] = (name + "_off", name + "_on")
+    return table
+
+
+def current_registry():
+    """Registry of the installed model's components.
+
+    components.build() and FuelFarm.install() put new component objects in the components module, so the registry and
+    the command table are rebuilt whenever a registered component is no longer the one the module holds.
+    """
+    global component_registry, commands
+    if component_registry is None or any(component_registry.get(name) is not getattr(components, name)
+                                         for name in components.COMPONENTS):
+        component_registry = components.registry()
+        commands = command_table(component_registry)
+    return component_registry
+
+
+def device_state(group):
+    """Button state showing a device's actual state: "down" while a gate is open or a pump is running."""
+    registry = current_registry()
+    component = registry[group]
+    active = component.speed > 0 if "pump" in registry.tags(group) else component.position > 0
+    return "down" if active else "normal"
+
+
+def set_button(button, state):
+    """Move a toggle button without commanding its device."""
+    if button.state != state:
+        _syncing.add(button.group)
+        try:
+            button.state = state
+        finally:
+            _syncing.discard(button.group)
+
+
+def configure_window():
+    """Fix the window size; must run before the app creates its window."""
+    Config.set("graphics", "width", "1112")
+    Config.set("graphics", "height", "849")
+    Config.set("graphics", "resizable", False)
 
 
 class HMILayout(PageLayout):
     # Methods are associated with their class; each class would have its own .kv file
-    @staticmethod
-    def on_state(device):  # Get the status of the device
-        if device.state == "down":
-            if device.group not in ["pump1", "pump2", "pump3"]:
-                exec("functionality.{}_open()".format(device.group))  # Dynamically call valve open()
-            else:
-                exec("functionality.{}_on()".format(device.group))  # Dynamically call pump on()
-        else:
-            if device.group not in ["pump1", "pump2", "pump3"]:
-                exec("functionality.{}_close()".format(device.group))  # Dynamically call valve close()
+    def on_state(self, device):  # Get the status of the device
+        if device.group in _syncing:
+            return  # Moved by the HMI to match the device, not by the operator
+        start = time.perf_counter()
+        tracer = tracing.DEFAULT
+        # The trace completes at the next populate(), i.e. when the operator presses Refresh, so its end-to-end
+        # latency includes that wait; a command that raises is closed here instead
+        with tracer.command(group=device.group, state=device.state) as trace:
+            current_registry()
+            released, pressed = commands[device.group]
+            action = pressed if device.state == "down" else released  # Open/on or close/off
+            with tracer.span(trace, "update"):
+                blocked = getattr(functionality, action)()
+            if blocked:  # An interlock permissive refused the command; the device hasn't moved
+                self.status.text = blocked
+                set_button(device, device_state(device.group))
             else:
-                exec("functionality.{}_off()".format(device.group))  # Dynamically call pump off()
+                self.status.text = ""
+                if interlock_engine is not None:
+                    with tracer.span(trace, "propagate"):
+                        self.scan()  # Trip anything the command made unsafe
+        metrics.DEFAULT.command(time.perf_counter() - start)
+
+    def scan(self, dt=None):
+        """Enforce the interlock trips; runs every SCAN_PERIOD seconds and after each command.
+
+        Each scan is recorded as a scan cycle, so scans longer than the period count as overruns.
+
+        :param dt: Seconds since the last scan, passed by the Kivy clock
+
+        :return: Trips that fired
+        :rtype: list
+        """
+        if interlock_engine is None:
+            return []
+        with metrics.DEFAULT.timed_scan():
+            fired = interlock_engine.scan()
+            if fired:
+                self.status.text = "Trip: {}".format("; ".join(rule.description for rule in fired))
+                self.sync_buttons()
+        return fired
+
+    def sync_buttons(self):
+        """Show each device's actual state on its button, e.g. after a trip stopped a pump."""
+        current_registry()
+        for group in commands:
+            button = self.ids.get(group)
+            if button is not None:
+                set_button(button, device_state(group))
 
     def populate(self):
-        # Make dictionaries to populate table
-        tank_properties1 = {}
-        tank_properties2 = {}
-
-        valve_properties1 = {}
-        valve_properties2 = {}
-        valve_properties3 = {}
-        valve_properties4 = {}
-        valve_properties5 = {}
-        valve_properties6 = {}
-        valve_properties7 = {}
-        valve_properties8 = {}
-        valve_properties9 = {}
-        valve_properties10 = {}
-
-        pump_properties1 = {}
-        pump_properties2 = {}
-        pump_properties3 = {}
-
-        # Convert instances to dictionaries
-        for key, value in vars(components.tank1).items():
-            tank_properties1[key] = value
-        for key, value in vars(components.tank2).items():
-            tank_properties2[key] = value
-
-        for key, value in vars(components.gate1).items():
-            valve_properties1[key] = value
-        for key, value in vars(components.gate2).items():
-            valve_properties2[key] = value
-        for key, value in vars(components.gate3).items():
-            valve_properties3[key] = value
-        for key, value in vars(components.gate4).items():
-            valve_properties4[key] = value
-        for key, value in vars(components.gate5).items():
-            valve_properties5[key] = value
-        for key, value in vars(components.gate6).items():
-            valve_properties6[key] = value
-        for key, value in vars(components.gate7).items():
-            valve_properties7[key] = value
-        for key, value in vars(components.gate8).items():
-            valve_properties8[key] = value
-        for key, value in vars(components.gate9).items():
-            valve_properties9[key] = value
-        for key, value in vars(components.gate10).items():
-            valve_properties10[key] = value
-
-        for key, value in vars(components.pump1).items():
-            pump_properties1[key] = value
-        # if valve_properties5["flow_out"] == 0.0:  # if inlet valve closed, ensure no flow through pump
-        #     pump_properties1["_Pump__flow_rate_out"] = pump_properties1["_Pump__outlet_pressure"] = 0.0
-
-        for key, value in vars(components.pump2).items():
-            pump_properties2[key] = value
-        if valve_properties6["flow_out"] == 0.0:
-            pump_properties2["_Pump__flow_rate_out"] = pump_properties2["_Pump__outlet_pressure"] = 0.0
-
-        for key, value in vars(components.pump3).items():
-            pump_properties3[key] = value
-        if valve_properties7["flow_out"] == 0.0:
-            pump_properties3["_Pump__flow_rate_out"] = pump_properties3["_Pump__outlet_pressure"] = 0.0
-
-        # Populate table
-        self.table.data = [{"value": "Tank"}, {"value": "Level"}, {"value": "Pressure Out"}, {"value": "Flow Out"},
-                           {"value": ""}, {"value": ""},
-                           # Tank 1
-                           {"value": tank_properties1["name"]},
-                           {"value": str(tank_properties1["_Tank__level"])},
-                           {"value": "{:.2f}".format((tank_properties1["_Tank__tank_press"]))},
-                           {"value": "{:.2f}".format((tank_properties1["flow_out"]))},
-                           {"value": ""},
-                           {"value": ""},
-                           # Tank 2
-                           {"value": tank_properties2["name"]},
-                           {"value": str(tank_properties2["_Tank__level"])},
-                           {"value": "{:.2f}".format((tank_properties2["_Tank__tank_press"]))},
-                           {"value": "{:.2f}".format((tank_properties2["flow_out"]))},
-                           {"value": ""},
-                           {"value": ""},
-
-                           # Spacer row
-                           {"value": ""}, {"value": ""}, {"value": ""}, {"value": ""}, {"value": ""}, {"value": ""},
-
-                           {"value": "Valve"}, {"value": "Position"}, {"value": "Pressure In"}, {"value": "Flow In"},
-                           {"value": "Pressure Out"}, {"value": "Flow Out"},
-                           # Valve 1
-                           {"value": valve_properties1["name"]},
-                           {"value": str(valve_properties1["_Valve__position"])},
-                           {"value": "{:.2f}".format((valve_properties1["press_in"]))},
-                           {"value": "{:.2f}".format((valve_properties1["flow_in"]))},
-                           {"value": "{:.2f}".format((valve_properties1["press_out"]))},
-                           {"value": "{:.2f}".format((valve_properties1["flow_out"]))},
-                           # Valve 2
-                           {"value": valve_properties2["name"]},
-                           {"value": str(valve_properties2["_Valve__position"])},
-                           {"value": "{:.2f}".format((valve_properties2["press_in"]))},
-                           {"value": "{:.2f}".format((valve_properties2["flow_in"]))},
-                           {"value": "{:.2f}".format((valve_properties2["press_out"]))},
-                           {"value": "{:.2f}".format((valve_properties2["flow_out"]))},
-                           # Valve 3
-                           {"value": valve_properties3["name"]},
-                           {"value": str(valve_properties3["_Valve__position"])},
-                           {"value": "{:.2f}".format((valve_properties3["press_in"]))},
-                           {"value": "{:.2f}".format((valve_properties3["flow_in"]))},
-                           {"value": "{:.2f}".format((valve_properties3["press_out"]))},
-                           {"value": "{:.2f}".format((valve_properties3["flow_out"]))},
-                           # Valve 4
-                           {"value": valve_properties4["name"]},
-                           {"value": str(valve_properties4["_Valve__position"])},
-                           {"value": "{:.2f}".format((valve_properties4["press_in"]))},
-                           {"value": "{:.2f}".format((valve_properties4["flow_in"]))},
-                           {"value": "{:.2f}".format((valve_properties4["press_out"]))},
-                           {"value": "{:.2f}".format((valve_properties4["flow_out"]))},
-                           # Valve 5
-                           {"value": valve_properties5["name"]},
-                           {"value": str(valve_properties5["_Valve__position"])},
-                           {"value": "{:.2f}".format((valve_properties5["press_in"]))},
-                           {"value": "{:.2f}".format((valve_properties5["flow_in"]))},
-                           {"value": "{:.2f}".format((valve_properties5["press_out"]))},
-                           {"value": "{:.2f}".format((valve_properties5["flow_out"]))},
-                           # Valve 6
-                           {"value": valve_properties6["name"]},
-                           {"value": str(valve_properties6["_Valve__position"])},
-                           {"value": "{:.2f}".format((valve_properties6["press_in"]))},
-                           {"value": "{:.2f}".format((valve_properties6["flow_in"]))},
-                           {"value": "{:.2f}".format((valve_properties6["press_out"]))},
-                           {"value": "{:.2f}".format((valve_properties6["flow_out"]))},
-                           # Valve 7
-                           {"value": valve_properties7["name"]},
-                           {"value": str(valve_properties7["_Valve__position"])},
-                           {"value": "{:.2f}".format((valve_properties7["press_in"]))},
-                           {"value": "{:.2f}".format((valve_properties7["flow_in"]))},
-                           {"value": "{:.2f}".format((valve_properties7["press_out"]))},
-                           {"value": "{:.2f}".format((valve_properties7["flow_out"]))},
-                           # Valve 8
-                           {"value": valve_properties8["name"]},
-                           {"value": str(valve_properties8["_Valve__position"])},
-                           {"value": "{:.2f}".format((valve_properties8["press_in"]))},
-                           {"value": "{:.2f}".format((valve_properties8["flow_in"]))},
-                           {"value": "{:.2f}".format((valve_properties8["press_out"]))},
-                           {"value": "{:.2f}".format((valve_properties8["flow_out"]))},
-                           # Valve 9
-                           {"value": valve_properties9["name"]},
-                           {"value": str(valve_properties9["_Valve__position"])},
-                           {"value": "{:.2f}".format((valve_properties9["press_in"]))},
-                           {"value": "{:.2f}".format((valve_properties9["flow_in"]))},
-                           {"value": "{:.2f}".format((valve_properties9["press_out"]))},
-                           {"value": "{:.2f}".format((valve_properties9["flow_out"]))},
-                           # Valve 10
-                           {"value": valve_properties10["name"]},
-                           {"value": str(valve_properties10["_Valve__position"])},
-                           {"value": "{:.2f}".format((valve_properties10["press_in"]))},
-                           {"value": "{:.2f}".format((valve_properties10["flow_in"]))},
-                           {"value": "{:.2f}".format((valve_properties10["press_out"]))},
-                           {"value": "{:.2f}".format((valve_properties10["flow_out"]))},
-
-                           # Spacer row
-                           {"value": ""}, {"value": ""}, {"value": ""}, {"value": ""}, {"value": ""}, {"value": ""},
-
-                           {"value": "Pump"}, {"value": "Speed"}, {"value": "Wattage"}, {"value": "Pressure Out"},
-                           {"value": "Flow Out"}, {"value": ""},
-                           # Pump 1
-                           {"value": pump_properties1["name"]},
-                           {"value": "{:.2f}".format((pump_properties1["_Pump__speed"]))},
-                           {"value": "{:.2f}".format((pump_properties1["_Pump__wattage"]))},
-                           {"value": "{:.2f}".format((pump_properties1["_Pump__outlet_pressure"]))},
-                           {"value": "{:.2f}".format((pump_properties1["_Pump__flow_rate_out"]))},
-                           {"value": ""},
-                           # Pump 2
-                           {"value": pump_properties2["name"]},
-                           {"value": "{:.2f}".format((pump_properties2["_Pump__speed"]))},
-                           {"value": "{:.2f}".format((pump_properties2["_Pump__wattage"]))},
-                           {"value": "{:.2f}".format((pump_properties2["_Pump__outlet_pressure"]))},
-                           {"value": "{:.2f}".format((pump_properties2["_Pump__flow_rate_out"]))},
-                           {"value": ""},
-                           # Pump 3
-                           {"value": pump_properties3["name"]},
-                           {"value": "{:.2f}".format((pump_properties3["_Pump__speed"]))},
-                           {"value": "{:.2f}".format((pump_properties3["_Pump__wattage"]))},
-                           {"value": "{:.2f}".format((pump_properties3["_Pump__outlet_pressure"]))},
-                           {"value": "{:.2f}".format((pump_properties3["_Pump__flow_rate_out"]))},
-                           {"value": ""},
-                           ]
+        start = time.perf_counter()
+        with tracing.DEFAULT.render():
+            source = terminal.farm_source(current_registry())  # Same rows as the terminal dashboard
+            self.table.data = [{"value": cell} for row in source.rows() for cell in row]
+        metrics.DEFAULT.refresh(time.perf_counter() - start)
 
     def clear(self):
         self.table.data = []
@@ -218,8 +141,39 @@ class HMILayout(PageLayout):
 
 class HMIApp(App):
     def build(self):
-        return HMILayout()
+        global interlock_engine
+        current_registry()
+        if interlock_engine is None:
+            interlock_engine = interlocks.build_engine()
+            interlock_engine.install()  # Blocked commands return a warning instead of changing the model
+        layout = HMILayout()
+        Clock.schedule_interval(layout.scan, SCAN_PERIOD)  # Catch conditions that turn unsafe between commands
+        return layout
+
+
+def start_metrics(port):
+    """Serve the metrics on localhost, e.g. http://127.0.0.1:9108/metrics; the HMI runs on without them on failure.
+
+    :param port: TCP port, as text from the environment
+    :return: The server, or None if it couldn't start
+    """
+    try:
+        server = metrics.MetricsServer(port=int(port))
+        server.start()
+        return server
+    except (OSError, ValueError) as error:  # Port in use, e.g. by a second HMI, or not a number
+        print("Metrics endpoint not started on port {}: {}".format(port, error), file=sys.stderr)
+        return None
+
+
+def main():
+    configure_window()
+    if os.environ.get("VPLC_METRICS"):
+        start_metrics(os.environ["VPLC_METRICS"])  # VPLC_METRICS=9108 to scrape http://127.0.0.1:9108/metrics
+    if os.environ.get("VPLC_TRACE"):
+        tracing.DEFAULT.open(os.environ["VPLC_TRACE"])  # Summarize with python -m Simulation.tracing <file>
+    HMIApp().run()
 
 
 if __name__ == "__main__":
-    HMIApp().run()
+    main()
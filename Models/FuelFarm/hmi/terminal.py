@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC terminal.py
+
+Purpose: Headless curses dashboard showing the same tank, valve, and pump table as the Kivy HMI.
+
+Only the rows that fit on screen are read from the model each refresh, and only cells whose text changed since the
+last refresh are redrawn, so a farm with thousands of components costs about as much to watch as a small one.
+Between refreshes the loop blocks waiting for a key, so an idle dashboard uses no CPU.
+
+Classes:
+    TableSource: Lazily formatted table rows for a set of components
+    Dashboard: Diffing terminal renderer
+
+Functions:
+    farm_source(): TableSource for the FuelFarm model
+    main(): Command-line entry point
+
+Keys: q quits; up/down, page up/down, home/end scroll.
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import argparse
+import time
+
+COLUMNS = 6
+SPACER = ("",) * COLUMNS
+TANK_HEADER = ("Tank", "Level", "Pressure Out", "Flow Out", "", "")
+VALVE_HEADER = ("Valve", "Position", "Pressure In", "Flow In", "Pressure Out", "Flow Out")
+PUMP_HEADER = ("Pump", "Speed", "Wattage", "Pressure Out", "Flow Out", "")
+
+
+def tank_row(tank):
+    return (tank.name, str(tank.level), "{:.2f}".format(tank.static_tank_press), "{:.2f}".format(tank.flow_out),
+            "", "")
+
+
+def valve_row(valve):
+    return (valve.name, str(valve.position), "{:.2f}".format(valve.press_in), "{:.2f}".format(valve.flow_in),
+            "{:.2f}".format(valve.press_out), "{:.2f}".format(valve.flow_out))
+
+
+def pump_row(pump, inlet=None):
+    if inlet is not None and inlet.flow_out == 0.0:  # Inlet valve closed; no flow through pump
+        press, flow = 0.0, 0.0
+    else:
+        press, flow = pump.outlet_pressure, pump.flow
+    return (pump.name, "{:.2f}".format(pump.speed), "{:.2f}".format(pump.power), "{:.2f}".format(press),
+            "{:.2f}".format(flow), "")
+
+
+class TableSource:
+    """Table rows for tanks, valves, and pumps, laid out like HMILayout.populate().
+
+    Rows are formatted on request, so reading a screenful costs the same however many components there are.
+    """
+    def __init__(self, tanks, valves, pumps, inlets=None):
+        """Set the components to show.
+
+        :param tanks: Tanks, in display order
+        :param valves: Valves, in display order
+        :param pumps: Pumps, in display order
+        :param inlets: {pump: inlet valve}; a pump shows no flow or pressure while its inlet valve passes no flow
+        """
+        self.inlets = inlets or {}
+        # (first row, header, components, row formatter); each section after the first starts with a spacer row
+        self.sections = []
+        row = 0
+        for header, items, formatter in ((TANK_HEADER, list(tanks), tank_row),
+                                         (VALVE_HEADER, list(valves), valve_row),
+                                         (PUMP_HEADER, list(pumps), self._pump_row)):
+            if self.sections:
+                row += 1
+            self.sections.append((row, header, items, formatter))
+            row += 1 + len(items)
+        self.length = row
+
+    def _pump_row(self, pump):
+        return pump_row(pump, self.inlets.get(pump))
+
+    def __len__(self):
+        return self.length
+
+    def rows(self, start=0, stop=None):
+        """Format rows start through stop - 1.
+
+        :return: Tuples of COLUMNS strings
+        :rtype: list
+        """
+        stop = self.length if stop is None else min(stop, self.length)
+        rows = []
+        for number in range(max(start, 0), stop):
+            rows.append(self.row(number))
+        return rows
+
+    def row(self, number):
+        """Format a single row."""
+        for first, header, items, formatter in reversed(self.sections):
+            if number >= first:
+                offset = number - first
+                if offset == 0:
+                    return header
+                return formatter(items[offset - 1])
+            if number == first - 1:
+                return SPACER
+        raise IndexError(number)
+
+
+def farm_source(registry=None):
+    """TableSource for the FuelFarm components, matching the Kivy HMI table.
+
+    :param registry: ComponentRegistry of the farm; components.registry() by default
+    """
+    from PipingSystems.pump.pump import Pump
+    from PipingSystems.storage_tank.tank import Tank
+    if registry is None:
+        import Models.FuelFarm.components as components
+        registry = components.registry()
+    return TableSource(registry.of_type(Tank), registry.tagged("gate"), registry.of_type(Pump),
+                       inlets={registry["pump2"]: registry["gate6"], registry["pump3"]: registry["gate7"]})
+
+
+class Dashboard:
+    """Draws a TableSource and redraws only the cells that changed.
+
+    Methods: changes(), draw(), scroll(), run()
+    """
+    def __init__(self, source, interval=1.0, column_width=16):
+        """Configure the dashboard.
+
+        :param source: TableSource
+        :param interval: Seconds between refreshes
+        :param column_width: Characters per column
+        """
+        self.source = source
+        self.interval = interval
+        self.column_width = column_width
+        self.top = 0
+        self.shown = {}  # Screen line: row last drawn there
+        self.frames = 0
+
+    def changes(self, height):
+        """Cells that differ from what is on screen, for a screen of the given height.
+
+        :return: (line, column, text) for each changed cell; the screen state is updated as if they were drawn
+        :rtype: list
+        """
+        width = self.column_width
+        changed = []
+        for line, row in enumerate(self.source.rows(self.top, self.top + height)):
+            previous = self.shown.get(line)
+            if previous == row:
+                continue
+            for column, text in enumerate(row):
+                if previous is None or previous[column] != text:
+                    changed.append((line, column * width, text[:width - 1].ljust(width - 1)))
+            self.shown[line] = row
+        for line in [line for line in self.shown if line >= min(height, len(self.source) - self.top)]:
+            changed.append((line, 0, " " * (width * COLUMNS - 1)))  # Scrolled past the end of the table
+            del self.shown[line]
+        return changed
+
+    def draw(self, screen):
+        """Write changed cells to a curses window.
+
+        :return: Number of cells written
+        :rtype: int
+        """
+        height, width = screen.getmaxyx()
+        changed = self.changes(height - 1)  # Last line is the status bar
+        for line, column, text in changed:
+            if column < width:
+                screen.addstr(line, column, text[:width - column - 1])
+        status = " {}-{} of {} rows | q quit | {} cells".format(self.top + 1, min(self.top + height - 1,
+                                                                                   len(self.source)),
+                                                                 len(self.source), len(changed))
+        screen.addstr(height - 1, 0, status[:width - 1].ljust(width - 1))
+        screen.refresh()
+        self.frames += 1
+        return len(changed)
+
+    def scroll(self, lines, height):
+        """Move the visible window, keeping it within the table."""
+        self.top = max(0, min(self.top + lines, len(self.source) - height))
+
+    def run(self, screen):
+        """Refresh loop for curses.wrapper(); returns when q is pressed."""
+        import curses
+        curses.curs_set(0)
+        screen.timeout(int(self.interval * 1000))
+        keys = {curses.KEY_UP: -1, curses.KEY_DOWN: 1}
+        next_draw = 0.0
+        while True:
+            if time.monotonic() >= next_draw:
+                self.draw(screen)
+                next_draw = time.monotonic() + self.interval
+            key = screen.getch()  # Blocks until a key or the refresh interval
+            page = screen.getmaxyx()[0] - 1
+            if key in (ord("q"), ord("Q")):
+                return
+            if key == curses.KEY_RESIZE:
+                screen.clear()
+                self.shown.clear()
+                next_draw = 0.0
+            elif key in keys or key in (curses.KEY_NPAGE, curses.KEY_PPAGE, curses.KEY_HOME, curses.KEY_END):
+                step = {curses.KEY_NPAGE: page, curses.KEY_PPAGE: -page, curses.KEY_HOME: -len(self.source),
+                        curses.KEY_END: len(self.source)}.get(key, keys.get(key))
+                self.scroll(step, page)
+                next_draw = 0.0
+
+
+def main(argv=None):
+    """Run the dashboard against the FuelFarm model."""
+    parser = argparse.ArgumentParser(description="Terminal dashboard for the FuelFarm model.")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between refreshes")
+    parser.add_argument("--width", type=int, default=16, help="Characters per column")
+    args = parser.parse_args(argv)
+    import curses
+    curses.wrapper(Dashboard(farm_source(), args.interval, args.width).run)
+
+
+if __name__ == "__main__":
+    main()
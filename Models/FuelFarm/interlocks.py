@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+FuelFarm interlocks.py
+
+Purpose: Safety interlocks and permissives for the fuel farm pumps. The suction checks make explicit what
+HMILayout.populate() assumes when it shows no flow through a pump whose inlet valve is closed.
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+
+from Simulation.interlocks import InterlockEngine, Permissive, Trip
+
+RULES = [
+    # Pumps may not start without suction
+    Permissive("pump1_on", "gate5.position == 100", "pump1 cannot run unless gate5 open"),
+    Permissive("pump2_on", "gate6.position == 100", "pump2 cannot run unless gate6 open"),
+    Permissive("pump3_on", "gate7.position == 100", "pump3 cannot run unless gate7 open"),
+
+    # Pumps may not restart against an open discharge relief
+    Permissive("pump1_on", "relief1.position == 0", "pump1 cannot run while relief1 open"),
+    Permissive("pump2_on", "relief2.position == 0", "pump2 cannot run while relief2 open"),
+    Permissive("pump3_on", "relief3.position == 0", "pump3 cannot run while relief3 open"),
+
+    # Loss of suction while running
+    Trip(["gate5.position == 0", "pump1.speed > 0"], "pump1_off", "trip pump1 on gate5 closed"),
+    Trip(["gate6.position == 0", "pump2.speed > 0"], "pump2_off", "trip pump2 on gate6 closed"),
+    Trip(["gate7.position == 0", "pump3.speed > 0"], "pump3_off", "trip pump3 on gate7 closed"),
+
+    # Overpressure on the pump discharge; re-arms when the pump stops, so a pump started with the relief open trips too
+    Trip(["relief1.position == 100", "pump1.speed > 0"], "pump1_off", "trip pump1 on relief1 open"),
+    Trip(["relief2.position == 100", "pump2.speed > 0"], "pump2_off", "trip pump2 on relief2 open"),
+    Trip(["relief3.position == 100", "pump3.speed > 0"], "pump3_off", "trip pump3 on relief3 open"),
+]
+
+
+def build_engine(rules=None):
+    """Compile the fuel farm interlocks against the live components and functionality.
+
+    :param rules: Rules to use instead of RULES
+
+    :return: Compiled engine; call install() to enforce permissives and scan() every cycle to enforce trips
+    :rtype: InterlockEngine
+    """
+    return InterlockEngine(ffc, fff, RULES if rules is None else rules)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC registry.py
+
+Purpose: Index of tanks, valves, and pumps by name, type, and user tags.
+
+Each component is filed under its name, under every class it inherits from (so a Gate is found as a Gate and as a
+Valve), and under each of its tags. Every index is a dict kept up to date on register and unregister, so a lookup by
+name, type, or tag is a single dict access, and iterating a type or tag touches only its members, however large the
+model.
+
+Classes:
+    ComponentRegistry: Name, type, and tag index of components
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+from PipingSystems.pump.pump import Pump
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Valve
+
+COMPONENT_TYPES = (Tank, Valve, Pump)
+
+_EMPTY = {}
+
+
+class ComponentRegistry:
+    """Components indexed by name, type, and tag; iteration is in registration order.
+
+    Methods: register(), unregister(), get(), of_type(), tagged(), query(), tag(), untag(), tags(), names()
+    """
+    def __init__(self, components=()):
+        """Start a registry.
+
+        :param components: Components to register under their own names
+        """
+        self._components = {}
+        self._types = {}
+        self._tagged = {}
+        self._tags = {}
+        for component in components:
+            self.register(component)
+
+    def __len__(self):
+        return len(self._components)
+
+    def __iter__(self):
+        return iter(self._components.values())
+
+    def __contains__(self, name):
+        return name in self._components
+
+    def __getitem__(self, name):
+        return self._components[name]
+
+    def get(self, name, default=None):
+        return self._components.get(name, default)
+
+    def names(self):
+        return self._components.keys()
+
+    def register(self, component, name=None, tags=()):
+        """Add a component.
+
+        :param component: Tank, Valve, or Pump
+        :param name: Registry name; the component's own name by default
+        :param tags: Tags to file the component under
+
+        :except TypeError: Not a tank, valve, or pump
+        :except ValueError: Name already registered
+
+        :return: Registry name
+        :rtype: str
+        """
+        if not isinstance(component, COMPONENT_TYPES):
+            raise TypeError("Only tanks, valves, and pumps can be registered.")
+        if name is None:
+            name = component.name
+        if name in self._components:
+            raise ValueError("{} is already registered.".format(name))
+        self._components[name] = component
+        for kind in type(component).__mro__[:-1]:  # Every class except object
+            self._types.setdefault(kind, {})[name] = component
+        self._tags[name] = set()
+        self.tag(name, *tags)
+        return name
+
+    def unregister(self, name):
+        """Remove a component from every index.
+
+        :except KeyError: Name not registered
+
+        :return: The component
+        """
+        component = self._components.pop(name)
+        for kind in type(component).__mro__[:-1]:
+            del self._types[kind][name]
+        for tag in self._tags.pop(name):
+            del self._tagged[tag][name]
+        return component
+
+    def tag(self, name, *tags):
+        """Add tags to a registered component.
+
+        :except KeyError: Name not registered
+        """
+        component = self._components[name]
+        for tag in tags:
+            self._tagged.setdefault(tag, {})[name] = component
+        self._tags[name].update(tags)
+
+    def untag(self, name, *tags):
+        """Remove tags from a registered component; tags it does not have are ignored."""
+        current = self._tags[name]
+        for tag in tags:
+            if tag in current:
+                current.discard(tag)
+                del self._tagged[tag][name]
+
+    def tags(self, name):
+        """Tags of a registered component.
+
+        :rtype: frozenset
+        """
+        return frozenset(self._tags[name])
+
+    def of_type(self, kind):
+        """Components that are instances of a class, including subclasses.
+
+        :return: Live view of the components, in registration order
+        """
+        return self._types.get(kind, _EMPTY).values()
+
+    def tagged(self, tag):
+        """Components with a tag.
+
+        :return: Live view of the components, in registration order
+        """
+        return self._tagged.get(tag, _EMPTY).values()
+
+    def query(self, kind=None, tags=()):
+        """Components of a type that have all of the given tags.
+
+        Only the smallest of the matching indexes is iterated; membership of the others is checked by name.
+
+        :return: Components, in the smallest index's order
+        :rtype: list
+        """
+        indexes = [self._tagged.get(tag, _EMPTY) for tag in tags]
+        if kind is not None:
+            indexes.append(self._types.get(kind, _EMPTY))
+        if not indexes:
+            return list(self._components.values())
+        indexes.sort(key=len)
+        smallest, others = indexes[0], indexes[1:]
+        return [component for name, component in smallest.items() if all(name in other for other in others)]
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC tags.py
+
+Purpose: Hierarchical tag paths, such as "Farm1/Tank1/Level", mapped to component fields.
+
+Tags are stored in a trie with one level per path segment. A literal segment is a single dict lookup; a segment with
+wildcards ("Pump*", "Gate?", "*") only scans the children of the nodes reached so far, and "**" matches any number of
+segments. The most recently resolved patterns are cached until the database changes, and a Subscription keeps its
+resolved points, so a repeated bulk read is one attribute access per tag with no path handling at all. Both caches are
+bounded, so a long-running server answering arbitrary queries doesn't grow.
+
+Fields are read through the components' public properties, so clients never see mangled names such as _Pump__wattage.
+Tags whose property setter doesn't take the value read, such as a tank's pressure (set from a level), are read-only.
+
+Classes:
+    Point: A tag's path, component, and field
+    TagDatabase: Trie of tag paths
+    Subscription: Resolved wildcard pattern for repeated reads
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import collections
+import fnmatch
+import functools
+import re
+
+from PipingSystems.pump.pump import Pump
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Valve
+
+SEPARATOR = "/"
+WILDCARDS = re.compile(r"[*?\[]")
+
+# Tag name -> component attribute, per component type
+TANK_POINTS = {"Level": "level", "Pressure": "static_tank_press", "FlowOut": "flow_out"}
+VALVE_POINTS = {"Position": "position", "PressureIn": "press_in", "FlowIn": "flow_in", "PressureOut": "press_out",
+                "FlowOut": "flow_out"}
+PUMP_POINTS = {"Speed": "speed", "Power": "power", "PressureOut": "outlet_pressure", "Flow": "flow"}
+POINTS = ((Tank, TANK_POINTS), (Valve, VALVE_POINTS), (Pump, PUMP_POINTS))
+READ_ONLY = frozenset(["static_tank_press"])  # The setter recalculates from a level; it can't take a pressure
+CACHE_SIZE = 256  # Resolved patterns kept per database, and compiled wildcard segments
+
+Point = collections.namedtuple("Point", "path component field")
+
+
+def split(path):
+    """Path segments.
+
+    :except ValueError: Empty path or segment
+    """
+    segments = path.split(SEPARATOR)
+    if not all(segments):
+        raise ValueError("Invalid tag path: {!r}".format(path))
+    return segments
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _compiled(segment):
+    """Match function for a wildcard segment."""
+    return re.compile(fnmatch.translate(segment)).match
+
+
+class _Node:
+    __slots__ = ("children", "point")
+
+    def __init__(self):
+        self.children = {}
+        self.point = None
+
+
+class TagDatabase:
+    """Tag paths indexed by a trie.
+
+    Methods: add(), add_component(), add_registry(), remove(), point(), resolve(), read(), write(), read_many(),
+    subscribe()
+    """
+    def __init__(self):
+        self._root = _Node()
+        self._count = 0
+        self._resolved = collections.OrderedDict()  # Pattern -> points, least recently used first
+        self.generation = 0  # Changes whenever tags are added or removed
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, path):
+        return self._find(path) is not None
+
+    def _changed(self):
+        self.generation += 1
+        self._resolved.clear()
+
+    def add(self, path, component, field):
+        """Map a path to a component field.
+
+        :except ValueError: Path already in use, or containing wildcards
+        :except AttributeError: Component has no such field
+        """
+        if WILDCARDS.search(path):
+            raise ValueError("Tag paths cannot contain wildcards: {!r}".format(path))
+        getattr(component, field)  # Fail now rather than on the first read
+        node = self._root
+        for segment in split(path):
+            node = node.children.setdefault(segment, _Node())
+        if node.point is not None:
+            raise ValueError("{} is already a tag.".format(path))
+        node.point = Point(path, component, field)
+        self._count += 1
+        self._changed()
+        return node.point
+
+    def add_component(self, prefix, component):
+        """Add the standard tags of a tank, valve, or pump under a prefix, e.g. "Farm1/Pump1/Power".
+
+        :except TypeError: Not a tank, valve, or pump
+        """
+        for kind, points in POINTS:
+            if isinstance(component, kind):
+                return [self.add(prefix + SEPARATOR + tag, component, field) for tag, field in points.items()]
+        raise TypeError("Only tanks, valves, and pumps have standard tags.")
+
+    def add_registry(self, registry, prefix):
+        """Add the standard tags of every component in a ComponentRegistry; "pump1" becomes prefix/Pump1/...
+
+        :return: Number of tags added
+        :rtype: int
+        """
+        added = 0
+        for name in registry.names():
+            added += len(self.add_component(prefix + SEPARATOR + name.capitalize(), registry[name]))
+        return added
+
+    def remove(self, path):
+        """Remove a tag, pruning nodes left empty.
+
+        :except KeyError: No such tag
+        """
+        segments = split(path)
+        trail = [self._root]
+        for segment in segments:
+            node = trail[-1].children.get(segment)
+            if node is None:
+                raise KeyError(path)
+            trail.append(node)
+        if trail[-1].point is None:
+            raise KeyError(path)
+        trail[-1].point = None
+        for parent, segment, node in reversed(list(zip(trail, segments, trail[1:]))):
+            if node.children or node.point is not None:
+                break
+            del parent.children[segment]
+        self._count -= 1
+        self._changed()
+
+    def _find(self, path):
+        node = self._root
+        for segment in path.split(SEPARATOR):
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node.point
+
+    def point(self, path):
+        """Point for an exact path.
+
+        :except KeyError: No such tag
+        """
+        point = self._find(path)
+        if point is None:
+            raise KeyError(path)
+        return point
+
+    def resolve(self, pattern):
+        """Points matching a pattern, in path order.
+
+        Within a segment, * matches any run of characters, ? one character, and [...] a set; a ** segment matches
+        any number of segments, including none.
+
+        :rtype: list
+        """
+        resolved = self._resolved
+        points = resolved.get(pattern)
+        if points is None:
+            found = {}
+            self._match(self._root, split(pattern), 0, found)
+            points = resolved[pattern] = [found[path] for path in sorted(found)]
+            if len(resolved) > CACHE_SIZE:
+                resolved.popitem(last=False)
+        else:
+            resolved.move_to_end(pattern)
+        return points
+
+    def _match(self, node, segments, index, found):
+        if index == len(segments):
+            if node.point is not None:
+                found[node.point.path] = node.point
+            return
+        segment = segments[index]
+        if segment == "**":
+            self._match(node, segments, index + 1, found)
+            for child in node.children.values():
+                self._match(child, segments, index, found)
+        elif WILDCARDS.search(segment):
+            matches = _compiled(segment)
+            for name, child in node.children.items():
+                if matches(name):
+                    self._match(child, segments, index + 1, found)
+        else:
+            child = node.children.get(segment)
+            if child is not None:
+                self._match(child, segments, index + 1, found)
+
+    def read(self, path):
+        """Current value of a tag."""
+        point = self.point(path)
+        return getattr(point.component, point.field)
+
+    def write(self, path, value):
+        """Set a tag; the component's property setter validates the value.
+
+        :except ValueError: Read-only tag
+        """
+        point = self.point(path)
+        if point.field in READ_ONLY:
+            raise ValueError("{} is read-only.".format(path))
+        setattr(point.component, point.field, value)
+
+    def read_many(self, pattern):
+        """Current values of every tag matching a pattern.
+
+        :return: Path -> value
+        :rtype: dict
+        """
+        return {path: getattr(component, field) for path, component, field in self.resolve(pattern)}
+
+    def subscribe(self, pattern):
+        """Subscription to the tags matching a pattern."""
+        return Subscription(self, pattern)
+
+
+class Subscription:
+    """Wildcard pattern resolved once and re-resolved only when tags are added or removed.
+
+    Methods: points(), read(), changes()
+    """
+    def __init__(self, database, pattern):
+        self.database = database
+        self.pattern = pattern
+        self._generation = None
+        self._points = []
+        self._last = {}
+
+    def points(self):
+        """Points currently matching the pattern."""
+        if self._generation != self.database.generation:
+            self._points = self.database.resolve(self.pattern)
+            self._generation = self.database.generation
+        return self._points
+
+    def read(self):
+        """Current values of the subscribed tags.
+
+        :return: Path -> value
+        :rtype: dict
+        """
+        return {path: getattr(component, field) for path, component, field in self.points()}
+
+    def changes(self):
+        """Tags whose values changed since the last call; the first call returns every tag.
+
+        :return: Path -> new value
+        :rtype: dict
+        """
+        values = self.read()
+        last = self._last
+        changed = {path: value for path, value in values.items() if path not in last or last[path] != value}
+        self._last = values
+        return changed
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC relief_bank.py
+
+Purpose: Evaluate many Relief valves per scan.
+
+Relief.valve_operation() handles one valve per call. A ReliefBank keeps the open/close setpoints and the latched
+position of every valve in flat arrays and evaluates all of them in one step, returning only the valves that changed
+state. Only those valves are opened or closed. valve_operation() also re-opens valves that are already open, which
+copies their inlet flow and pressure to the outlet again; sync() does the same for the whole bank, for callers whose
+valve inlets have moved.
+
+Two evaluation paths are provided:
+    - a list of inlet pressures, one per valve, is compared element-wise against the setpoint arrays;
+    - a single header pressure shared by every valve uses a threshold index: closed valves sorted by opening setpoint,
+      and open and partially open valves sorted by closing setpoint, so only valves whose setpoint was crossed are
+      visited. The per-valve path only updates positions and leaves the index to be rebuilt when a header pressure
+      next arrives. sync() uses two more indices of every valve, by opening and by closing setpoint, so the valves to
+      re-open or re-close are slices.
+
+Classes:
+    BankChange: Indices of valves that opened and closed
+    ReliefBank: Array-backed group of Relief valves
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+
+import bisect
+import collections
+import numbers
+from array import array
+
+BankChange = collections.namedtuple("BankChange", "opened, closed")
+
+
+class ReliefBank:
+    """Group of Relief valves evaluated together.
+
+    Semantics match Relief.valve_operation(): a valve opens when inlet pressure >= its open setpoint, otherwise closes
+    when pressure <= its close setpoint, otherwise keeps its position. Valves between their setpoints are not touched.
+
+    Methods: evaluate(), sync(), refresh(), positions()
+    """
+    def __init__(self, valves):
+        """Capture valve setpoints and positions.
+
+        :param valves: Relief valves
+        """
+        self.valves = list(valves)
+        self.refresh()
+
+    def refresh(self):
+        """Re-read setpoints and positions from the valves, e.g. after set_open_pressure() was called."""
+        self.setpoint_open = array("d", (valve.setpoint_open for valve in self.valves))
+        self.setpoint_close = array("d", (valve.setpoint_close for valve in self.valves))
+        self._position = [valve.position for valve in self.valves]
+        self._reindex()
+        self._all_by_open = sorted((setpoint, i) for i, setpoint in enumerate(self.setpoint_open))
+        self._all_by_close = sorted((setpoint, i) for i, setpoint in enumerate(self.setpoint_close))
+
+    def _reindex(self):
+        """Sort the valves into threshold indices by position."""
+        self._closed_by_open = sorted((self.setpoint_open[i], i) for i, pos in enumerate(self._position) if pos != 100)
+        self._open_by_close = sorted((self.setpoint_close[i], i) for i, pos in enumerate(self._position) if pos == 100)
+        self._partial_by_close = sorted((self.setpoint_close[i], i) for i, pos in enumerate(self._position)
+                                        if pos not in (0, 100))
+        self._stale = False
+
+    def positions(self):
+        """Get the position of every valve, in bank order."""
+        return list(self._position)
+
+    def evaluate(self, press_in, apply=True):
+        """Evaluate every valve against its inlet pressure.
+
+        :param press_in: Header pressure shared by all valves, or one pressure per valve
+        :param apply: Open/close the Relief objects that changed state
+
+        :except ValueError: Pressure list length doesn't match the bank
+
+        :return: Indices of the valves that opened and that closed
+        :rtype: BankChange
+        """
+        if isinstance(press_in, numbers.Number):
+            change = self._evaluate_header(press_in)
+        else:
+            change = self._evaluate_each(press_in)
+
+        if apply:
+            for i in change.opened:
+                self.valves[i].open()
+            for i in change.closed:
+                self.valves[i].close()
+        return change
+
+    def sync(self, press_in):
+        """Call open() or close() on every valve past a setpoint, as valve_operation() does, so the outlets of valves that
+        stay open follow their inlets. Positions must be up to date, i.e. evaluate() has seen the same pressure.
+
+        :param press_in: Header pressure shared by all valves, or one pressure per valve
+        """
+        if isinstance(press_in, numbers.Number):
+            self._apply_header(press_in)
+        else:
+            self._apply_each(press_in)
+
+    def _apply_header(self, press):
+        """Open every valve at or above its open setpoint and close every other valve at or below its close setpoint."""
+        valves = self.valves
+        for _, i in self._all_by_open[:bisect.bisect_right(self._all_by_open, (press, len(valves)))]:
+            valves[i].open()
+        for _, i in self._all_by_close[bisect.bisect_left(self._all_by_close, (press, -1)):]:
+            if press < self.setpoint_open[i]:
+                valves[i].close()
+
+    def _apply_each(self, pressures):
+        """valve_operation() with the bank's setpoints."""
+        for valve, press, open_set, close_set in zip(self.valves, pressures, self.setpoint_open, self.setpoint_close):
+            if press >= open_set:
+                valve.open()
+            elif press <= close_set:
+                valve.close()
+
+    def _evaluate_header(self, press):
+        """Use the threshold index for a pressure common to all valves."""
+        if self._stale:
+            self._reindex()
+        closed_by_open = self._closed_by_open
+        open_by_close = self._open_by_close
+
+        # Closed (or partially open) valves with setpoint_open <= press open
+        split = bisect.bisect_right(closed_by_open, (press, len(self.valves)))
+        opened = [i for _, i in closed_by_open[:split]]
+
+        # Open valves with setpoint_close >= press close, unless the open setpoint still holds them open
+        split_close = bisect.bisect_left(open_by_close, (press, -1))
+        closing = open_by_close[split_close:]
+        closed = [i for _, i in closing if press < self.setpoint_open[i]]
+        # Partially open valves with setpoint_close >= press also close
+        partial = self._partial_by_close
+        if partial:
+            split_partial = bisect.bisect_left(partial, (press, -1))
+            closed.extend(i for _, i in partial[split_partial:] if press < self.setpoint_open[i])
+
+        self._commit(opened, closed)
+        return BankChange(sorted(opened), sorted(closed))
+
+    def _evaluate_each(self, pressures):
+        """Compare one pressure per valve against the setpoint arrays."""
+        if len(pressures) != len(self.valves):
+            raise ValueError("One pressure per valve is required.")
+        opened = []
+        closed = []
+        for i, press, open_set, close_set, pos in zip(range(len(pressures)), pressures, self.setpoint_open,
+                                                       self.setpoint_close, self._position):
+            if press >= open_set:
+                if pos != 100:
+                    opened.append(i)
+            elif press <= close_set and pos != 0:
+                closed.append(i)
+        # Per-valve pressures don't use the threshold indices; rebuild them if a header pressure comes next
+        position = self._position
+        for i in opened:
+            position[i] = 100
+        for i in closed:
+            position[i] = 0
+        if opened or closed:
+            self._stale = True
+        return BankChange(opened, closed)
+
+    def _commit(self, opened, closed):
+        """Latch the new positions and move the valves between threshold indices."""
+        if not opened and not closed:
+            return
+        position = self._position
+        partial = self._partial_by_close
+        for i in opened:
+            if position[i] != 100:
+                self._closed_by_open.remove((self.setpoint_open[i], i))
+                if position[i] != 0:
+                    del partial[bisect.bisect_left(partial, (self.setpoint_close[i], i))]
+            position[i] = 100
+            bisect.insort(self._open_by_close, (self.setpoint_close[i], i))
+        for i in closed:
+            if position[i] == 100:
+                self._open_by_close.remove((self.setpoint_close[i], i))
+                bisect.insort(self._closed_by_open, (self.setpoint_open[i], i))
+            elif position[i] != 0:
+                del partial[bisect.bisect_left(partial, (self.setpoint_close[i], i))]
+            position[i] = 0
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    from PipingSystems.valve.valve import Relief
+
+    valves = []
+    for n in range(500):
+        open_set = random.uniform(50, 70)
+        valves.append(Relief("Relief {}".format(n), open_press=open_set, close_press=open_set - 5))
+    bank = ReliefBank(valves)
+    start = time.perf_counter()
+    for tick in range(1000):
+        bank.evaluate(45 + 30 * (tick % 20) / 20)
+    print("{:.1f} us per header scan of {} valves".format((time.perf_counter() - start) * 1000, len(valves)))
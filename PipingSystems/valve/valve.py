@@ -10,6 +10,10 @@ Classes:
     Globe: Valve subclass; provides for a throttling valve
     Relief: Valve subclass; provides for a pressure-operated open/close valve
 
+Functions:
+    characteristic_table(): Build a flow characteristic lookup table from (position, fraction) points
+    characteristic_flows(): Throttled flow for many valves at once
+
 Author: Cody Jackson
 
 Date: 4/9/18
@@ -20,6 +24,55 @@ Version 0.1
 
 import math
 
+RANGEABILITY = 50  # Ratio of maximum to minimum controllable flow for equal-percentage trim
+
+# Fraction of inlet flow passed at each whole percent open, 0 - 100
+FLOW_CHARACTERISTICS = {
+    "linear": tuple(position / 100 for position in range(101)),
+    "equal_percentage": (0.0,) + tuple(math.pow(RANGEABILITY, position / 100 - 1) for position in range(1, 101)),
+    "quick_opening": tuple(math.sqrt(position / 100) for position in range(101)),
+}
+
+
+def characteristic_table(points):
+    """Build a custom flow characteristic lookup table.
+
+    Values between the given points are linearly interpolated.
+
+    :param points: (percent open, fraction of full flow) pairs, including positions 0 and 100
+
+    :except ValueError: Points don't span 0 - 100% open, or two points share a position
+
+    :return: Fraction of full flow at each whole percent open
+    :rtype: tuple
+    """
+    points = sorted(points)
+    if points[0][0] != 0 or points[-1][0] != 100:
+        raise ValueError("Points must include 0 and 100 percent open.")
+    if any(x0 >= x1 for (x0, _), (x1, _) in zip(points, points[1:])):
+        raise ValueError("Point positions must be strictly increasing.")
+    table = []
+    segment = 0
+    for position in range(101):
+        while points[segment + 1][0] < position:
+            segment += 1
+        (x0, y0), (x1, y1) = points[segment], points[segment + 1]
+        table.append(y0 + (y1 - y0) * (position - x0) / (x1 - x0))
+    return tuple(table)
+
+
+def characteristic_flows(flows_in, positions, table=FLOW_CHARACTERISTICS["linear"]):
+    """Calculate throttled flow for many valves sharing a flow characteristic.
+
+    :param flows_in: Flow rate into each valve
+    :param positions: Percent open of each valve, 0 - 100
+    :param table: Flow characteristic lookup table
+
+    :return: Flow rate out of each valve
+    :rtype: list
+    """
+    return [flow * table[position] for flow, position in zip(flows_in, positions)]
+
 
 class Valve:
     """Generic class for valves.
@@ -202,6 +255,9 @@ class Gate(Valve):
 class Globe(Valve):
     """Throttling valve.
 
+    Flow through a partially open valve follows the valve's inherent flow characteristic: linear, equal_percentage,
+    quick_opening, or a custom table from characteristic_table().
+
     Subclasses Valve.
 
     Methods:
@@ -209,10 +265,45 @@ class Globe(Valve):
         turn_handle()
     """
 
+    def __init__(self, name="", sys_flow_in=0.0, sys_flow_out=0.0, drop=0.0, position=0, flow_coeff=0.0,
+                 press_in=0.0, characteristic="linear"):
+        """Inherits base initialization and adds the valve flow characteristic."""
+        super(Globe, self).__init__(name, sys_flow_in, sys_flow_out, drop, position, flow_coeff, press_in)
+        self.characteristic = characteristic
+
+    @property
+    def characteristic(self):
+        """Get the name of the valve flow characteristic, or the custom lookup table."""
+        return self.__characteristic
+
+    @characteristic.setter
+    def characteristic(self, characteristic):
+        """Select the valve flow characteristic.
+
+        :param characteristic: Name from FLOW_CHARACTERISTICS, or a 101 entry lookup table
+
+        :except ValueError: Unknown characteristic or wrong table length
+        """
+        if isinstance(characteristic, str):
+            if characteristic not in FLOW_CHARACTERISTICS:
+                raise ValueError("Unknown flow characteristic: {}".format(characteristic))
+            self.flow_table = FLOW_CHARACTERISTICS[characteristic]
+        elif len(characteristic) != 101:
+            raise ValueError("Flow characteristic table needs 101 entries.")
+        else:
+            characteristic = tuple(characteristic)  # The caller's list may change later
+            self.flow_table = characteristic
+        self.__characteristic = characteristic
+
     def read_position(self):
         """Identify the position of the valve."""
         return "{name} is {position}% open.".format(name=self.name, position=self.position)
 
+    def open(self):
+        """Open the valve fully; outlet pressure follows the inlet as for any valve, flow follows the characteristic."""
+        super(Globe, self).open()
+        self.flow_out = self.flow_in * self.flow_table[100]
+
     def turn_handle(self, new_position):
         """Change the status of the valve.
         
@@ -224,11 +315,17 @@ class Globe(Valve):
             self.open()
         elif new_position == 0:
             self.close()
+        elif not 0 < new_position < 100:
+            return "Warning: Invalid valve position."
         else:
-            self.position = new_position
-            self.flow_out = self.flow_in * self.position / 100
-            self.press_drop(self.flow_out)
-            self.get_press_out(self.press_in)
+            self._throttle(new_position)
+
+    def _throttle(self, new_position):
+        """Set the position and the flow and pressures that follow from the flow characteristic."""
+        self.position = new_position
+        self.flow_out = self.flow_in * self.flow_table[self.position]
+        self.press_drop(self.flow_out)
+        self.get_press_out(self.press_in)
 
 
 class Relief(Valve):
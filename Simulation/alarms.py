@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC alarms.py
+
+Purpose: Evaluate high/low alarms for many process values per scan.
+
+Each alarm point watches one attribute of one component, e.g. Tank.level or Pump.power. Limits are kept in flat lists
+so a scan is one pass comparing every value against the band in which its point cannot change state. Only points that
+leave their band, or that have an on/off delay timer running, go through the full state machine.
+
+Classes:
+    AlarmEvent: Annunciation record
+    ScanResult: Events produced by one scan
+    AlarmEngine: Alarm configuration, state, shelving, and flood suppression
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+
+import collections
+import math
+import time
+
+NORMAL = "NORMAL"
+HIGH = "HI"
+LOW = "LO"
+
+AlarmEvent = collections.namedtuple("AlarmEvent", "tag, state, value, time")
+ScanResult = collections.namedtuple("ScanResult", "raised, cleared, suppressed")
+
+
+class AlarmEngine:
+    """Scan-based alarm engine.
+
+    A point goes into alarm when its value is above the high limit or below the low limit for at least on_delay
+    seconds. It returns to normal once the value is back inside the limits by more than the deadband for at least
+    off_delay seconds.
+
+    Shelved points keep tracking state but are not annunciated. When more than flood_threshold alarms are raised within
+    flood_window seconds, only points with priority <= flood_priority are annunciated until the rate drops; the rest
+    are reported as suppressed.
+
+    Methods: add(), scan(), evaluate(), shelve(), unshelve(), acknowledge(), active()
+    """
+    def __init__(self, flood_threshold=10, flood_window=60.0, flood_priority=1):
+        """Set flood suppression parameters.
+
+        :param flood_threshold: Number of annunciated alarms within the window that constitutes a flood
+        :param flood_window: Flood detection window, in seconds
+        :param flood_priority: Lowest (numerically highest) priority still annunciated during a flood
+        """
+        self.flood_threshold = flood_threshold
+        self.flood_window = flood_window
+        self.flood_priority = flood_priority
+
+        self.tags = []
+        self.index = {}
+        self._bindings = []
+        self._high = []
+        self._low = []
+        self._deadband = []
+        self._on_delay = []
+        self._off_delay = []
+        self._priority = []
+
+        self._state = []
+        self._band_low = []
+        self._band_high = []
+        self._pending = {}  # index -> (target state, time condition first seen)
+        self._shelved = {}  # index -> time shelving expires (math.inf for indefinite)
+        self._unacked = set()
+        self._since = {}
+        self._recent = collections.deque()
+
+    def add(self, tag, component, attribute, high=None, low=None, deadband=0.0, on_delay=0.0, off_delay=0.0,
+            priority=2):
+        """Configure an alarm point.
+
+        :param tag: Unique alarm name
+        :param component: Object to read, e.g. a Tank
+        :param attribute: Attribute to read, e.g. "level"
+        :param high: High alarm limit; None disables it
+        :param low: Low alarm limit; None disables it
+        :param deadband: Distance back inside a limit needed to clear the alarm
+        :param on_delay: Seconds the condition must persist before the alarm is raised
+        :param off_delay: Seconds the value must be normal before the alarm clears
+        :param priority: 1 is most important
+
+        :except ValueError: Duplicate tag or inconsistent limits
+        """
+        if tag in self.index:
+            raise ValueError("Alarm {} already exists.".format(tag))
+        high = math.inf if high is None else high
+        low = -math.inf if low is None else low
+        if low > high:
+            raise ValueError("Low limit must not exceed high limit.")
+        if deadband < 0:
+            raise ValueError("Deadband must be 0 or greater.")
+
+        self.index[tag] = len(self.tags)
+        self.tags.append(tag)
+        self._bindings.append((component, attribute))
+        self._high.append(high)
+        self._low.append(low)
+        self._deadband.append(deadband)
+        self._on_delay.append(on_delay)
+        self._off_delay.append(off_delay)
+        self._priority.append(priority)
+        self._state.append(NORMAL)
+        self._band_low.append(low)
+        self._band_high.append(high)
+
+    def _set_band(self, i):
+        """Update the range of values in which point i cannot change state."""
+        state = self._state[i]
+        if state == HIGH:
+            self._band_low[i] = self._high[i] - self._deadband[i]
+            self._band_high[i] = math.inf
+        elif state == LOW:
+            self._band_low[i] = -math.inf
+            self._band_high[i] = self._low[i] + self._deadband[i]
+        else:
+            self._band_low[i] = self._low[i]
+            self._band_high[i] = self._high[i]
+
+    def _target(self, i, value):
+        """State the value calls for, taking the deadband into account."""
+        if value > self._high[i]:
+            return HIGH
+        if value < self._low[i]:
+            return LOW
+        state = self._state[i]
+        if state == HIGH and value >= self._high[i] - self._deadband[i]:
+            return HIGH
+        if state == LOW and value <= self._low[i] + self._deadband[i]:
+            return LOW
+        return NORMAL
+
+    def scan(self, now=None):
+        """Read every configured point and evaluate it.
+
+        :param now: Scan time, in seconds; defaults to the monotonic clock
+
+        :return: Alarms raised, cleared, and suppressed this scan
+        :rtype: ScanResult
+        """
+        values = [getattr(component, attribute) for component, attribute in self._bindings]
+        return self.evaluate(values, now)
+
+    def evaluate(self, values, now=None):
+        """Evaluate one value per configured point, in configuration order.
+
+        :param values: Current values
+        :param now: Scan time, in seconds; defaults to the monotonic clock
+
+        :return: Alarms raised, cleared, and suppressed this scan
+        :rtype: ScanResult
+        """
+        if now is None:
+            now = time.monotonic()
+        raised = []
+        cleared = []
+        suppressed = []
+
+        if self._shelved:
+            for i in [i for i, until in self._shelved.items() if until <= now]:
+                del self._shelved[i]
+
+        changed = [i for i, value, low, high in zip(range(len(values)), values, self._band_low, self._band_high)
+                   if not low <= value <= high]
+        if self._pending:
+            changed = sorted(set(changed).union(self._pending))
+
+        for i in changed:
+            value = values[i]
+            target = self._target(i, value)
+            if target == self._state[i]:
+                self._pending.pop(i, None)
+                continue
+
+            pending = self._pending.get(i)
+            if pending is None or pending[0] != target:
+                pending = self._pending[i] = (target, now)
+            delay = self._off_delay[i] if target == NORMAL else self._on_delay[i]
+            if now - pending[1] < delay:
+                continue
+
+            del self._pending[i]
+            previous = self._state[i]
+            self._state[i] = target
+            self._set_band(i)
+            if target == NORMAL:
+                self._since.pop(i, None)
+            else:
+                self._since[i] = now
+                self._unacked.add(i)
+            if i in self._shelved:
+                continue
+
+            if target == NORMAL:
+                cleared.append(AlarmEvent(self.tags[i], previous, value, now))
+                continue
+
+            event = AlarmEvent(self.tags[i], target, value, now)
+            if self._flooded(now) and self._priority[i] > self.flood_priority:
+                suppressed.append(event)
+            else:
+                self._recent.append(now)
+                raised.append(event)
+
+        return ScanResult(raised, cleared, suppressed)
+
+    def _flooded(self, now):
+        """Determine whether the annunciation rate is above the flood threshold."""
+        recent = self._recent
+        while recent and recent[0] <= now - self.flood_window:
+            recent.popleft()
+        return len(recent) >= self.flood_threshold
+
+    def shelve(self, tag, until=math.inf):
+        """Stop annunciating an alarm.
+
+        :param tag: Alarm name
+        :param until: Time at which shelving expires; indefinite by default
+        """
+        self._shelved[self.index[tag]] = until
+
+    def unshelve(self, tag):
+        """Resume annunciating an alarm."""
+        self._shelved.pop(self.index[tag], None)
+
+    def acknowledge(self, tag):
+        """Acknowledge an active alarm."""
+        self._unacked.discard(self.index[tag])
+
+    def state(self, tag):
+        """Get the alarm state of a point: NORMAL, HI, or LO."""
+        return self._state[self.index[tag]]
+
+    def active(self):
+        """List the points currently in alarm.
+
+        :return: (tag, state, time raised, acknowledged, shelved) for each active point
+        :rtype: list
+        """
+        return [(self.tags[i], self._state[i], self._since.get(i), i not in self._unacked, i in self._shelved)
+                for i, state in enumerate(self._state) if state != NORMAL]
+
+
+if __name__ == "__main__":
+    from PipingSystems.storage_tank.tank import Tank
+
+    points = 2000
+    tanks = [Tank("Tank {}".format(n), level=20.0) for n in range(points)]
+    engine = AlarmEngine()
+    for n, tank in enumerate(tanks):
+        engine.add("tank{}.level".format(n), tank, "level", high=34.0, low=2.0, deadband=0.5, on_delay=2.0)
+    engine.scan(0.0)
+    tanks[7].level = 35.0
+    engine.scan(1.0)
+    print(engine.scan(3.0))
+
+    start = time.perf_counter()
+    for tick in range(100):
+        engine.scan(4.0 + tick)
+    print("{:.3f} ms per scan of {} points".format((time.perf_counter() - start) * 10, points))
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC integrator.py
+
+Purpose: Integrate tank inventories over time with an adaptive-step ODE solver.
+
+solve() is an embedded Runge-Kutta 5(4) (Dormand-Prince) integrator. The step size grows through steady periods and
+shrinks where the solution changes quickly. Events are functions of (t, y) whose zero crossings are located within each
+accepted step on a cubic Hermite interpolant, so tank-empty, tank-full, and setpoint crossings are found precisely
+without shrinking every step.
+
+TankInventory builds the level equations for a set of tanks drained by gravity and connected by pump transfers, and
+handles the discontinuities (a tank running dry, a tank filling) by stopping at the event and restarting.
+
+Classes:
+    Event: Zero-crossing event definition
+    Solution: Result of solve()
+    TankInventory: Tank level model and event handling
+
+Functions:
+    solve(): Adaptive Dormand-Prince integration with event location
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+
+import math
+
+import utility_formulas
+
+# Dormand-Prince 5(4) tableau
+_C = (0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0)
+_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+# Difference between the 5th and 4th order weights, used for the error estimate
+_E = (71 / 57600, 0.0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40)
+
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 5.0
+
+
+class Event:
+    """Zero crossing of function(t, y).
+
+    :param function: Event function; an event occurs where it crosses zero
+    :param terminal: Stop integration at the event
+    :param direction: 1 for rising crossings only, -1 for falling only, 0 for both
+    :param name: Label for reporting
+    """
+    def __init__(self, function, terminal=False, direction=0, name=""):
+        self.function = function
+        self.terminal = terminal
+        self.direction = direction
+        self.name = name or getattr(function, "__name__", "event")
+
+
+class Solution:
+    """Integration result.
+
+    t and y hold accepted step end points; events holds (event, time, state) for every located crossing, in order.
+    """
+    def __init__(self):
+        self.t = []
+        self.y = []
+        self.events = []
+        self.terminated = None
+        self.steps = 0
+        self.rejected = 0
+        self.evaluations = 0
+
+
+def _hermite(t0, y0, f0, t1, y1, f1, t):
+    """Cubic Hermite interpolation between two accepted points."""
+    h = t1 - t0
+    s = (t - t0) / h
+    s2 = s * s
+    s3 = s2 * s
+    h00 = 2 * s3 - 3 * s2 + 1
+    h10 = (s3 - 2 * s2 + s) * h
+    h01 = -2 * s3 + 3 * s2
+    h11 = (s3 - s2) * h
+    return [h00 * a + h10 * da + h01 * b + h11 * db for a, da, b, db in zip(y0, f0, y1, f1)]
+
+
+def _crossed(event, g0, g1):
+    """Determine whether an event function changed sign in the allowed direction."""
+    if g0 == 0 or (g0 < 0) == (g1 < 0) and g1 != 0:
+        return False
+    rising = g1 > g0
+    return event.direction == 0 or (event.direction > 0) == rising
+
+
+def _locate(event, t0, y0, f0, t1, y1, f1, g0, g1):
+    """Find an event time inside [t0, t1] with the Illinois variant of regula falsi."""
+    a, b = t0, t1
+    ga, gb = g0, g1
+    side = 0
+    tolerance = 4 * 2.2e-16 * max(abs(t0), abs(t1), 1.0)
+    for _ in range(100):
+        if abs(b - a) <= tolerance:
+            break
+        t = (a * gb - b * ga) / (gb - ga)
+        if not a < t < b:
+            t = 0.5 * (a + b)
+        g = event.function(t, _hermite(t0, y0, f0, t1, y1, f1, t))
+        if g == 0:
+            return t
+        if (g < 0) == (ga < 0):
+            a, ga = t, g
+            if side == -1:
+                gb /= 2
+            side = -1
+        else:
+            b, gb = t, g
+            if side == 1:
+                ga /= 2
+            side = 1
+    return b  # End of the bracket on the far side of the crossing
+
+
+def _error_norm(err, y, y_new, rtol, atol):
+    total = 0.0
+    for e, a, b in zip(err, y, y_new):
+        scale = atol + rtol * max(abs(a), abs(b))
+        total += (e / scale) ** 2
+    return math.sqrt(total / len(err))
+
+
+def solve(fun, t0, t_end, y0, events=(), rtol=1e-6, atol=1e-9, max_step=math.inf, first_step=None):
+    """Integrate dy/dt = fun(t, y) from t0 to t_end.
+
+    :param fun: Derivative function returning a list
+    :param t0: Start time
+    :param t_end: End time; must be greater than t0
+    :param y0: Initial state
+    :param events: Event instances
+    :param rtol: Relative error tolerance
+    :param atol: Absolute error tolerance
+    :param max_step: Largest step allowed
+    :param first_step: Initial step; estimated if not given
+
+    :except ValueError: t_end not after t0
+
+    :return: Accepted points and located events
+    :rtype: Solution
+    """
+    if t_end <= t0:
+        raise ValueError("End time must be after start time.")
+    sol = Solution()
+    t = t0
+    y = [float(v) for v in y0]
+    f = fun(t, y)
+    sol.evaluations += 1
+    sol.t.append(t)
+    sol.y.append(y)
+    g_prev = [event.function(t, y) for event in events]
+
+    if first_step is None:
+        d0 = math.sqrt(sum(v * v for v in y) / len(y))
+        d1 = math.sqrt(sum(v * v for v in f) / len(f))
+        h = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    else:
+        h = first_step
+    h = min(h, max_step, t_end - t0)
+
+    n = len(y)
+    while t < t_end:
+        h = min(h, max_step, t_end - t)
+        k = [f]
+        for stage in range(1, 7):
+            coeffs = _A[stage]
+            y_stage = [y[i] + h * sum(c * k[j][i] for j, c in enumerate(coeffs) if c) for i in range(n)]
+            if stage == 6:
+                y_new = y_stage
+            k.append(fun(t + _C[stage] * h, y_stage))
+        sol.evaluations += 6
+        err = [h * sum(e * k[j][i] for j, e in enumerate(_E) if e) for i in range(n)]
+        err_norm = _error_norm(err, y, y_new, rtol, atol)
+
+        if err_norm > 1.0:
+            sol.rejected += 1
+            h *= max(MIN_FACTOR, SAFETY * err_norm ** -0.2)
+            continue
+
+        t_new = t + h
+        f_new = k[6]  # First same as last
+        sol.steps += 1
+
+        g_new = [event.function(t_new, y_new) for event in events]
+        found = []
+        for event, g0, g1 in zip(events, g_prev, g_new):
+            if _crossed(event, g0, g1):
+                t_event = _locate(event, t, y, f, t_new, y_new, f_new, g0, g1)
+                found.append((t_event, event))
+        found.sort(key=lambda item: item[0])
+        for t_event, event in found:
+            y_event = y_new if t_event == t_new else _hermite(t, y, f, t_new, y_new, f_new, t_event)
+            sol.events.append((event, t_event, y_event))
+            if event.terminal:
+                sol.t.append(t_event)
+                sol.y.append(y_event)
+                sol.terminated = event
+                return sol
+
+        t, y, f, g_prev = t_new, y_new, f_new, g_new
+        sol.t.append(t)
+        sol.y.append(y)
+        factor = MAX_FACTOR if err_norm == 0 else min(MAX_FACTOR, max(MIN_FACTOR, SAFETY * err_norm ** -0.2))
+        h *= factor
+    return sol
+
+
+class TankInventory:
+    """Level model for tanks drained by gravity and linked by pump transfers.
+
+    Gravity outflow uses the Hazen-Williams relation from utility_formulas.gravity_flow_rate(). If a pipe length is
+    given for a tank, the hydraulic gradient is the fluid level over that length, so outflow falls off as the tank
+    drains; otherwise the tank's fixed outlet slope is used, matching Tank.gravity_flow().
+
+    Transfers move a pump's flow from one tank (or an external source, None) to another (or an external sink, None).
+    A transfer stops when its source runs dry or its destination fills.
+
+    Methods: add_transfer(), watch_pressure(), run()
+    """
+    def __init__(self, tanks, gallons_per_foot, max_level, pipe_lengths=None, gravity_drain=None):
+        """Set up the level model.
+
+        :param tanks: Tank instances; their levels are the initial state
+        :param gallons_per_foot: Tank capacity per foot of level
+        :param max_level: Level at which a tank is full, in feet
+        :param pipe_lengths: Outlet pipe length per tank, in feet; None entries use the fixed outlet slope
+        :param gravity_drain: Whether each tank drains by gravity; all do by default
+        """
+        self.tanks = list(tanks)
+        self.gallons_per_foot = gallons_per_foot
+        self.max_level = max_level
+        self.pipe_lengths = list(pipe_lengths) if pipe_lengths is not None else [None] * len(self.tanks)
+        self.gravity_drain = list(gravity_drain) if gravity_drain is not None else [True] * len(self.tanks)
+        self.transfers = []
+        self.watches = []
+        self.time = 0.0
+        self.log = []
+
+    def add_transfer(self, pump, source, destination):
+        """Move pump.flow (gpm) from the source tank index to the destination tank index; None is outside the model."""
+        self.transfers.append([pump, source, destination, True])
+
+    def watch_pressure(self, tank_index, press, callback):
+        """Call callback(inventory, tank_index) when the tank's static pressure crosses a setpoint, e.g. a relief valve.
+
+        :param press: Pressure, in psi
+        """
+        self.watches.append((tank_index, press, callback))
+
+    def outflow(self, index, level):
+        """Gravity outflow of a tank at a given level, in gpm."""
+        tank = self.tanks[index]
+        if level <= 0 or not self.gravity_drain[index]:
+            return 0.0
+        length = self.pipe_lengths[index]
+        slope = tank.pipe_slope if length is None else level / length
+        return utility_formulas.gravity_flow_rate(tank.pipe_diam, slope, tank.pipe_coeff)
+
+    def derivative(self, t, levels):
+        """Rate of change of every tank level, in ft/s."""
+        flows = [-self.outflow(i, level) for i, level in enumerate(levels)]
+        for pump, source, destination, active in self.transfers:
+            if not active:
+                continue
+            if source is not None:
+                flows[source] -= pump.flow
+            if destination is not None:
+                flows[destination] += pump.flow
+        scale = 1 / (self.gallons_per_foot * 60)
+        return [flow * scale for flow in flows]
+
+    def _events(self, levels):
+        events = []
+        for i, level in enumerate(levels):
+            draining = self.gravity_drain[i] or any(t[1] == i and t[3] for t in self.transfers)
+            if level > 0 and draining:
+                events.append(Event(lambda t, y, i=i: y[i], terminal=True, direction=-1, name=("empty", i)))
+            if level < self.max_level and any(t[2] == i and t[3] for t in self.transfers):
+                events.append(Event(lambda t, y, i=i: y[i] - self.max_level, terminal=True, direction=1,
+                                    name=("full", i)))
+        for n, (i, press, _) in enumerate(self.watches):
+            density = self.tanks[i].fluid_density
+            events.append(Event(lambda t, y, i=i, p=press, d=density: utility_formulas.static_press(y[i], d) - p,
+                                terminal=True, name=("pressure", n)))
+        return events
+
+    def run(self, duration, rtol=1e-8, atol=1e-10, max_step=math.inf):
+        """Advance the model, handling events as they occur, and write the final levels to the tanks.
+
+        :param duration: Simulated time to advance, in seconds
+
+        :return: (time, kind, tank index) for each event handled
+        :rtype: list
+        """
+        t_end = self.time + duration
+        levels = [tank.level for tank in self.tanks]
+        handled = []
+        while self.time < t_end:
+            self._stop_transfers(levels)
+            sol = solve(self.derivative, self.time, t_end, levels, self._events(levels), rtol=rtol, atol=atol,
+                        max_step=max_step)
+            self.log.append(sol)
+            self.time = sol.t[-1]
+            levels = [min(max(level, 0.0), self.max_level) for level in sol.y[-1]]
+            if sol.terminated is None:
+                break
+            kind, index = sol.terminated.name
+            if kind == "empty":
+                levels[index] = 0.0
+                handled.append((self.time, "empty", index))
+            elif kind == "full":
+                levels[index] = self.max_level
+                handled.append((self.time, "full", index))
+            else:
+                tank_index, _, callback = self.watches[index]
+                self.tanks[tank_index].level = levels[tank_index]
+                callback(self, tank_index)
+                handled.append((self.time, "pressure", tank_index))
+                levels = self._nudge(levels)
+        for tank, level in zip(self.tanks, levels):
+            tank.level = level
+        return handled
+
+    def _stop_transfers(self, levels):
+        """Stop the transfers out of empty tanks and into full ones.
+
+        Run before each segment, not only after an event: a tank may start the run empty or full, and no crossing is
+        reported for it then, so its transfers would otherwise carry on and the clamp would lose the volume moved.
+        """
+        for transfer in self.transfers:
+            source, destination = transfer[1], transfer[2]
+            if (source is not None and levels[source] <= 0.0) or \
+                    (destination is not None and levels[destination] >= self.max_level):
+                transfer[3] = False
+
+    def _nudge(self, levels):
+        """Step just past a pressure crossing so the same crossing isn't reported again on restart."""
+        h = 1e-9 * max(1.0, abs(self.time))
+        rates = self.derivative(self.time, levels)
+        self.time += h
+        return [level + rate * h for level, rate in zip(levels, rates)]
+
+
+if __name__ == "__main__":
+    from PipingSystems.storage_tank.tank import Tank
+
+    tank = Tank("Tank 1", level=36.0, fluid_density=1.629869, outlet_diam=16, outlet_slope=0.25)
+    inventory = TankInventory([tank], 27778, 36.0, pipe_lengths=[144.0])
+    print(inventory.run(7 * 86400))
+    sol = inventory.log[0]
+    print("{} steps, {} rejected, {} evaluations".format(sol.steps, sol.rejected, sol.evaluations))
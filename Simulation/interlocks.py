@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC interlocks.py
+
+Purpose: Declarative interlock and permissive logic for a model's actions.
+
+Rules are written against component names and attributes, e.g. "gate6.position == 100", and compiled once into a flat
+evaluation plan: every distinct component attribute is read exactly once per scan and every distinct condition is
+evaluated exactly once, no matter how many rules share it.
+
+A permissive blocks an action (a function in an actions module, such as Models.FuelFarm.functionality) unless all of
+its conditions hold. A trip calls an action when all of its conditions become true.
+
+Classes:
+    Condition: Single comparison of a component attribute against a value
+    Permissive: Conditions that must hold before an action may run
+    Trip: Conditions that force an action
+    InterlockEngine: Compiled rule set
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+
+import collections
+import functools
+import operator
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+class Condition(collections.namedtuple("Condition", "component, attribute, op, value")):
+    """Comparison of component.attribute against a constant."""
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, text):
+        """Create a condition from text such as "gate6.position == 100".
+
+        :param text: "<component>.<attribute> <operator> <number>"
+
+        :except ValueError: Text not in the expected form
+
+        :return: Parsed condition
+        :rtype: Condition
+        """
+        try:
+            target, op, value = text.split()
+            component, attribute = target.split(".")
+            if op not in OPERATORS:
+                raise ValueError
+            return cls(component, attribute, op, float(value))
+        except ValueError:
+            raise ValueError("Invalid condition: {}".format(text))
+
+    def __str__(self):
+        return "{}.{} {} {:g}".format(self.component, self.attribute, self.op, self.value)
+
+
+def _conditions(conditions):
+    """Accept a condition, condition text, or a sequence of either."""
+    if isinstance(conditions, (str, Condition)):
+        conditions = [conditions]
+    return tuple(Condition.parse(c) if isinstance(c, str) else c for c in conditions)
+
+
+class Permissive:
+    """Action may only run while all conditions hold."""
+    def __init__(self, action, conditions, description=""):
+        self.action = action
+        self.conditions = _conditions(conditions)
+        self.description = description or "{} requires {}".format(action, " and ".join(map(str, self.conditions)))
+
+
+class Trip:
+    """Action runs when all conditions become true."""
+    def __init__(self, conditions, action, description=""):
+        self.action = action
+        self.conditions = _conditions(conditions)
+        self.description = description or "{} on {}".format(action, " and ".join(map(str, self.conditions)))
+
+
+class InterlockEngine:
+    """Compiled interlock rules for a component namespace and an actions module.
+
+    Methods: scan(), permitted(), check(), install(), uninstall()
+    """
+    def __init__(self, components, actions, rules):
+        """Compile the rules.
+
+        :param components: Object providing components as attributes, e.g. Models.FuelFarm.components
+        :param actions: Object providing action functions as attributes, e.g. Models.FuelFarm.functionality
+        :param rules: Permissive and Trip instances
+
+        :except AttributeError: A rule refers to an action that doesn't exist
+        """
+        self.components = components
+        self.actions = actions
+        self.permissives = [rule for rule in rules if isinstance(rule, Permissive)]
+        self.trips = [rule for rule in rules if isinstance(rule, Trip)]
+        self.blocked = collections.Counter()
+        self._originals = {}
+
+        for rule in self.permissives + self.trips:
+            getattr(actions, rule.action)
+
+        reads = {}
+        conditions = {}
+        for rule in self.permissives + self.trips:
+            for cond in rule.conditions:
+                reads.setdefault((cond.component, cond.attribute), len(reads))
+                conditions.setdefault(cond, len(conditions))
+
+        # attrgetter resolves "gate6.position" on every call, so components swapped into the namespace are honoured
+        self._reads = [operator.attrgetter("{}.{}".format(*key)) for key in reads]
+        self._plan = [(reads[(cond.component, cond.attribute)], OPERATORS[cond.op], cond.value)
+                      for cond in conditions]
+        self._permissive_plan = {}
+        for rule in self.permissives:
+            self._permissive_plan.setdefault(rule.action, []).append(
+                (rule, [(self._reads[reads[(c.component, c.attribute)]], OPERATORS[c.op], c.value)
+                        for c in rule.conditions]))
+        self._trip_plan = [(rule, [conditions[cond] for cond in rule.conditions]) for rule in self.trips]
+        self._trip_checks = [[(self._reads[reads[(c.component, c.attribute)]], OPERATORS[c.op], c.value)
+                              for c in rule.conditions] for rule in self.trips]
+        self._tripped = [False] * len(self.trips)
+
+    def scan(self):
+        """Evaluate every trip and run the actions of newly tripped rules.
+
+        A trip fires once when its conditions become true and re-arms after they clear. Fired trips are checked again
+        after their actions run, so a trip whose own action cleared its conditions (e.g. stopping the pump it guards)
+        re-arms at once and fires again if they return before the next scan.
+
+        :return: Trips that fired this scan
+        :rtype: list
+        """
+        components = self.components
+        values = [read(components) for read in self._reads]
+        results = [op(values[i], value) for i, op, value in self._plan]
+
+        fired = []
+        for n, (rule, indices) in enumerate(self._trip_plan):
+            active = all(results[i] for i in indices)
+            if active and not self._tripped[n]:
+                fired.append((n, rule))
+            self._tripped[n] = active
+        for _, rule in fired:
+            getattr(self.actions, rule.action)()
+        for n, _ in fired:
+            self._tripped[n] = all(op(read(components), value) for read, op, value in self._trip_checks[n])
+        return [rule for _, rule in fired]
+
+    def check(self, action):
+        """Find the permissive that currently blocks an action.
+
+        :param action: Action name, e.g. "pump2_on"
+
+        :return: Blocking rule, or None if the action is permitted
+        :rtype: Permissive
+        """
+        components = self.components
+        for rule, conditions in self._permissive_plan.get(action, ()):
+            for read, op, value in conditions:
+                if not op(read(components), value):
+                    return rule
+        return None
+
+    def permitted(self, action):
+        """Determine whether an action may run."""
+        return self.check(action) is None
+
+    def install(self):
+        """Route guarded actions through their permissives.
+
+        Callers that look the action up on the actions module at call time, such as the HMI, are blocked while a
+        permissive isn't met; the blocked call returns a warning string instead of acting.
+        """
+        for action in self._permissive_plan:
+            if action in self._originals:
+                continue
+            original = getattr(self.actions, action)
+            self._originals[action] = original
+            setattr(self.actions, action, self._guard(action, original))
+
+    def uninstall(self):
+        """Restore the unguarded actions."""
+        for action, original in self._originals.items():
+            setattr(self.actions, action, original)
+        self._originals.clear()
+
+    def _guard(self, action, original):
+        @functools.wraps(original)
+        def guarded(*args, **kwargs):
+            rule = self.check(action)
+            if rule is not None:
+                self.blocked[action] += 1
+                return "Interlock: {}.".format(rule.description)
+            return original(*args, **kwargs)
+        return guarded
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC memory_report.py
+
+Purpose: Memory taken by tank, valve, and pump instances, per component type and per attribute.
+
+Each component is charged for its instance, its attribute dict, and every attribute value it references that no
+earlier component already referenced, so objects shared across the model (interned strings, small integers, shared
+tuples) are counted once. Attribute bytes are reported under the names stored in the instance dict, e.g.
+_Pump__wattage, which is where the name-mangled fields show up. Totals are deterministic for a given Python version,
+so they can be stored as a benchmark baseline and compared to catch memory regressions (see benchmarks.memory).
+
+Classes:
+    TypeUsage: Memory of all instances of one class
+    MemoryReport: Per-type usage, totals, and projections
+
+Functions:
+    components_of(): Components of a model, registry, or iterable
+    measure(): Walk a model and build a MemoryReport
+    format_report(): Text table of a report
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import collections
+import sys
+
+from PipingSystems.pump.pump import Pump
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Valve
+
+COMPONENT_TYPES = (Tank, Valve, Pump)
+
+
+class TypeUsage:
+    """Instance count and bytes for one component class."""
+    def __init__(self, cls):
+        self.cls = cls
+        self.name = cls.__name__
+        self.count = 0
+        self.instance_bytes = 0
+        self.dict_bytes = 0
+        self.fields = collections.Counter()  # Attribute name -> value bytes
+
+    @property
+    def value_bytes(self):
+        return sum(self.fields.values())
+
+    @property
+    def total(self):
+        return self.instance_bytes + self.dict_bytes + self.value_bytes
+
+    @property
+    def per_instance(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class MemoryReport:
+    """Memory of a set of components.
+
+    Methods: kind(), project(), project_type(), as_dict()
+    """
+    def __init__(self):
+        self.types = {}  # Class name -> TypeUsage
+
+    @property
+    def count(self):
+        return sum(usage.count for usage in self.types.values())
+
+    @property
+    def total(self):
+        return sum(usage.total for usage in self.types.values())
+
+    def kind(self, kind):
+        """Instance count and bytes of every class derived from a base class, e.g. Valve.
+
+        :rtype: tuple
+        """
+        usages = [usage for usage in self.types.values() if issubclass(usage.cls, kind)]
+        return sum(usage.count for usage in usages), sum(usage.total for usage in usages)
+
+    def project(self, count):
+        """Bytes for a model of count components with the same mix of types.
+
+        :rtype: float
+        """
+        return self.total / self.count * count if self.count else 0.0
+
+    def project_type(self, name, count):
+        """Bytes for count instances of one class.
+
+        :except KeyError: Class not in the report
+        """
+        return self.types[name].per_instance * count
+
+    def as_dict(self):
+        """Bytes per instance of each class, plus the model total; the form stored as a benchmark baseline.
+
+        :rtype: dict
+        """
+        results = {"memory.{}".format(name): usage.per_instance for name, usage in self.types.items()}
+        results["memory.total"] = float(self.total)
+        return results
+
+
+def components_of(model):
+    """Components of a model.
+
+    :param model: ComponentRegistry, FuelFarm, components module (anything with COMPONENTS), or an iterable
+
+    :return: Tanks, valves, and pumps, in model order; anything else is skipped
+    :rtype: list
+    """
+    names = getattr(model, "COMPONENTS", None)
+    if names is None and hasattr(model, "parts"):  # factory.FuelFarm
+        items = model.parts().values()
+    elif names is not None:
+        items = [getattr(model, name) for name in names]
+    else:
+        items = model  # ComponentRegistry iterates over its components
+    return [item for item in items if isinstance(item, COMPONENT_TYPES)]
+
+
+def measure(model):
+    """Walk a model's components and account for their memory.
+
+    :rtype: MemoryReport
+    """
+    report = MemoryReport()
+    seen = set()
+    for component in components_of(model):
+        name = type(component).__name__
+        usage = report.types.get(name)
+        if usage is None:
+            usage = report.types[name] = TypeUsage(type(component))
+        usage.count += 1
+        usage.instance_bytes += sys.getsizeof(component)
+        attributes = vars(component)
+        usage.dict_bytes += sys.getsizeof(attributes)
+        for field, value in attributes.items():
+            shared = id(value) in seen
+            seen.add(id(value))
+            usage.fields[field] += 0 if shared else sys.getsizeof(value)  # Shared fields still listed, with 0
+    return report
+
+
+def format_report(report, target=None):
+    """Text table of bytes per type and per field.
+
+    :param report: MemoryReport
+    :param target: Component count to project the total to
+    """
+    lines = ["{:<24}{:>8}{:>12}{:>14}".format("Type", "Count", "Bytes", "Per instance")]
+    for usage in sorted(report.types.values(), key=lambda usage: usage.total, reverse=True):
+        lines.append("{:<24}{:>8}{:>12}{:>14.1f}".format(usage.name, usage.count, usage.total, usage.per_instance))
+        lines.append("    {:<20}{:>20}".format("(instance)", usage.instance_bytes))
+        lines.append("    {:<20}{:>20}".format("(__dict__)", usage.dict_bytes))
+        for field, size in usage.fields.most_common():
+            lines.append("    {:<20}{:>20}".format(field, size))
+    for kind in COMPONENT_TYPES:
+        count, size = report.kind(kind)
+        if count:
+            lines.append("{:<24}{:>8}{:>12}{:>14.1f}".format("All " + kind.__name__, count, size, size / count))
+    lines.append("{:<24}{:>8}{:>12}".format("Total", report.count, report.total))
+    if target:
+        lines.append("Projected for {} components: {:.1f} MiB".format(target, report.project(target) / 2 ** 20))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import Models.FuelFarm.components as components
+    print(format_report(measure(components), target=100000))
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC metrics.py
+
+Purpose: Performance counters for the simulation and HMI, served locally in Prometheus text format.
+
+Metric updates are plain attribute arithmetic with no locks. Each metric is meant to be written by one thread (the
+simulation loop or the HMI); the HTTP server thread only reads, so a scrape never blocks or slows the scan cycle. A
+scrape may see one metric a single update ahead of another, which is acceptable for monitoring.
+
+Classes:
+    Counter: Monotonic count
+    Gauge: Value that goes up and down, optionally computed at scrape time
+    Histogram: Bucketed observations
+    Registry: Collection of metrics rendered together
+    SimulationMetrics: Standard tick, scan, command, queue, HMI, and memory metrics
+    MetricsServer: Local HTTP endpoint
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import bisect
+import math
+import threading
+import time
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Counter:
+    """Monotonically increasing count."""
+    kind = "counter"
+
+    def __init__(self, name, help_text=""):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        return [(self.name, self.value)]
+
+
+class Gauge:
+    """Value that can go up and down.
+
+    If a function is given, it is called at scrape time instead of storing a value, e.g. for process memory.
+    """
+    kind = "gauge"
+
+    def __init__(self, name, help_text="", function=None):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self.function = function
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        return [(self.name, self.function() if self.function is not None else self.value)]
+
+
+class Histogram:
+    """Observations counted into upper-bounded buckets."""
+    kind = "histogram"
+
+    def __init__(self, name, help_text="", buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)  # Last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        counts = list(self.counts)
+        rows = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (math.inf,), counts):
+            cumulative += count
+            label = "+Inf" if bound == math.inf else repr(float(bound))
+            rows.append(('{}_bucket{{le="{}"}}'.format(self.name, label), cumulative))
+        rows.append(("{}_sum".format(self.name), self.sum))
+        rows.append(("{}_count".format(self.name), cumulative))
+        return rows
+
+
+class Registry:
+    """Set of metrics exposed together."""
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        """Add a metric.
+
+        :except ValueError: Name already registered
+
+        :return: The metric, for chaining
+        """
+        if metric.name in self.metrics:
+            raise ValueError("Metric {} already registered.".format(metric.name))
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text=""):
+        return self.register(Counter(name, help_text))
+
+    def gauge(self, name, help_text="", function=None):
+        return self.register(Gauge(name, help_text, function))
+
+    def histogram(self, name, help_text="", buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, buckets))
+
+    def render(self):
+        """Format every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in list(self.metrics.values()):
+            if metric.help:
+                lines.append("# HELP {} {}".format(metric.name, metric.help))
+            lines.append("# TYPE {} {}".format(metric.name, metric.kind))
+            for name, value in metric.samples():
+                lines.append("{} {}".format(name, _format_value(value)))
+        return "\n".join(lines) + "\n"
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
+
+
+def max_rss_bytes():
+    """Peak resident memory of this process, in bytes; 0 where unavailable."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    import sys
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # Linux reports kilobytes
+
+
+class SimulationMetrics:
+    """Standard simulator metrics.
+
+    Methods: tick(), scan(), command(), refresh(), timed_scan()
+    """
+    def __init__(self, registry=None, scan_budget=0.1):
+        """Create the metrics.
+
+        :param registry: Registry to add the metrics to; a new one by default
+        :param scan_budget: Scan cycle duration, in seconds, beyond which a scan counts as an overrun
+        """
+        self.registry = Registry() if registry is None else registry
+        self.scan_budget = scan_budget
+        reg = self.registry
+        self.ticks = reg.counter("virtualplc_ticks_total", "Simulation events or ticks processed")
+        self.queue_depth = reg.gauge("virtualplc_event_queue_depth", "Events waiting in the scheduler")
+        self.sim_time = reg.gauge("virtualplc_simulated_seconds", "Current simulated time")
+        self.scans = reg.histogram("virtualplc_scan_duration_seconds", "Scan cycle duration")
+        self.overruns = reg.counter("virtualplc_scan_overruns_total", "Scan cycles longer than the scan budget")
+        self.commands = reg.histogram("virtualplc_command_latency_seconds", "Operator command handling time")
+        self.hmi_refresh = reg.histogram("virtualplc_hmi_refresh_seconds", "HMI table refresh time")
+        self.memory = reg.gauge("virtualplc_process_max_rss_bytes", "Peak resident memory", max_rss_bytes)
+
+    def tick(self, queue_depth=0, sim_time=None):
+        """Record one simulation event or tick."""
+        self.ticks.value += 1
+        self.queue_depth.value = queue_depth
+        if sim_time is not None:
+            self.sim_time.value = sim_time
+
+    def scan(self, duration):
+        """Record a scan cycle duration, in seconds."""
+        self.scans.observe(duration)
+        if duration > self.scan_budget:
+            self.overruns.value += 1
+
+    def command(self, latency):
+        """Record the time taken to handle an operator command, in seconds."""
+        self.commands.observe(latency)
+
+    def refresh(self, duration):
+        """Record an HMI refresh duration, in seconds."""
+        self.hmi_refresh.observe(duration)
+
+    def timed_scan(self):
+        """Context manager that records the duration of the enclosed scan."""
+        return _Timer(self.scan)
+
+
+class _Timer:
+    __slots__ = ("record", "start")
+
+    def __init__(self, record):
+        self.record = record
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.record(time.perf_counter() - self.start)
+
+
+DEFAULT = SimulationMetrics()
+
+
+class MetricsServer:
+    """HTTP endpoint serving a registry at /metrics from a background thread.
+
+    Methods: start(), stop()
+    """
+    def __init__(self, registry=None, host="127.0.0.1", port=9108):
+        """Configure the endpoint; binds to localhost by default.
+
+        :param registry: Registry to serve; DEFAULT's registry by default
+        :param port: TCP port; 0 picks a free port
+        """
+        self.registry = DEFAULT.registry if registry is None else registry
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Start serving.
+
+        :return: The bound port
+        :rtype: int
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # Keep scrapes out of the console
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC monte_carlo.py
+
+Purpose: Propagate uncertainty in hydraulic parameters through a tank -> valve -> pump lineup.
+
+Field values such as the Hazen-Williams coefficient of the tank outlet piping, the rough Cv estimate used by
+Valve.calc_coeff(), and the displacement of a positive displacement pump are rarely known exactly. The engine samples
+them from distributions and evaluates every realization column-wise (one pass per output over the sampled columns),
+optionally split across a process pool, then reports percentile bands for the outputs.
+
+Classes:
+    Fixed: Degenerate distribution; always returns the same value
+    Uniform: Uniform distribution between two bounds
+    Normal: Normal distribution, optionally clipped to bounds
+    Triangular: Triangular distribution
+    MonteCarlo: Sampling engine
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+
+import math
+import random
+
+import utility_formulas
+from PipingSystems.pump import pump
+
+PARAMETERS = ("pipe_coeff", "valve_coeff", "displacement")
+OUTPUTS = ("tank_flow_out", "pump_power", "valve_press_out")
+
+
+class Fixed:
+    """Parameter that is known exactly."""
+    def __init__(self, value):
+        self.value = value
+
+    def sample(self, rng, count):
+        return [self.value] * count
+
+
+class Uniform:
+    """Parameter equally likely anywhere between low and high."""
+    def __init__(self, low, high):
+        if high < low:
+            raise ValueError("Upper bound must be >= lower bound.")
+        self.low = low
+        self.high = high
+
+    def sample(self, rng, count):
+        uniform = rng.uniform
+        return [uniform(self.low, self.high) for _ in range(count)]
+
+
+class Normal:
+    """Normally distributed parameter.
+
+    Values outside the optional bounds are clipped to the bound, e.g. to keep a roughness coefficient positive.
+    """
+    def __init__(self, mean, std_dev, low=None, high=None):
+        if std_dev < 0:
+            raise ValueError("Standard deviation must be 0 or greater.")
+        self.mean = mean
+        self.std_dev = std_dev
+        self.low = -math.inf if low is None else low
+        self.high = math.inf if high is None else high
+
+    def sample(self, rng, count):
+        gauss = rng.gauss
+        mean, std_dev, low, high = self.mean, self.std_dev, self.low, self.high
+        return [min(max(gauss(mean, std_dev), low), high) for _ in range(count)]
+
+
+class Triangular:
+    """Parameter with a most likely value and hard limits."""
+    def __init__(self, low, mode, high):
+        if not low <= mode <= high:
+            raise ValueError("Bounds must satisfy low <= mode <= high.")
+        self.low = low
+        self.mode = mode
+        self.high = high
+
+    def sample(self, rng, count):
+        triangular = rng.triangular
+        return [triangular(self.low, self.high, self.mode) for _ in range(count)]
+
+
+def percentile(sorted_values, pct):
+    """Linearly interpolated percentile of an already sorted sequence.
+
+    :param sorted_values: Values in ascending order
+    :param pct: Percentile, 0 - 100
+
+    :return: Interpolated value at the requested percentile
+    :rtype: float
+    """
+    if not sorted_values:
+        raise ValueError("No values provided.")
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    fraction = rank - low
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * fraction
+
+
+def _evaluate(constants, distributions, count, seed):
+    """Sample and evaluate one batch of realizations.
+
+    Module level so that it can be shipped to worker processes.
+
+    :return: Output name -> list of values, one per realization
+    :rtype: dict
+    """
+    rng = random.Random(seed)
+    coeffs = distributions["pipe_coeff"].sample(rng, count)
+    valve_coeffs = distributions["valve_coeff"].sample(rng, count)
+    displacements = distributions["displacement"].sample(rng, count)
+
+    tank_full, geometry, press_in, valve_area, pump_speed, unit_power = constants
+
+    # Hazen-Williams: flow = sqrt(C^1.852 * d^4.8704 * slope / 4.52); only C varies between realizations
+    if tank_full:
+        flows = [math.sqrt(math.pow(c, 1.852) * geometry) for c in coeffs]
+    else:
+        flows = [0.0] * count
+
+    # Valve Cv = k * d^2, deltaP = (flow / Cv)^2 for a fully open valve passing the tank outflow
+    press_out = [press_in - (flow / (k * valve_area)) ** 2 for flow, k in zip(flows, valve_coeffs)]
+
+    # Positive displacement pump power is linear in flow at a fixed differential pressure
+    power = [pump_speed * disp * unit_power for disp in displacements]
+
+    return {"tank_flow_out": flows, "pump_power": power, "valve_press_out": press_out}
+
+
+class MonteCarlo:
+    """Monte Carlo engine for a tank feeding a valve, plus a positive displacement pump.
+
+    Sampled parameters:
+        pipe_coeff: Hazen-Williams roughness coefficient of the tank outlet pipe (Tank.pipe_coeff)
+        valve_coeff: Multiplier in the Cv estimate, Cv = valve_coeff * diameter**2 (15 in Valve.calc_coeff())
+        displacement: Pump displacement (PositiveDisplacement.displacement)
+
+    Each parameter defaults to a Fixed distribution at the model's current value.
+
+    Methods: set_distribution(), run()
+    """
+    def __init__(self, tank, valve_diameter, pump_model, pump_speed=None):
+        """Capture the lineup that realizations are evaluated against.
+
+        :param tank: Tank supplying the valve
+        :param valve_diameter: Valve diameter, in inches, used for the Cv estimate
+        :param pump_model: PositiveDisplacement pump
+        :param pump_speed: Pump speed, in rpm; defaults to the pump's current speed
+        """
+        self.tank = tank
+        self.valve_diameter = valve_diameter
+        self.pump = pump_model
+        self.pump_speed = pump_model.speed if pump_speed is None else pump_speed
+        self.distributions = {
+            "pipe_coeff": Fixed(tank.pipe_coeff),
+            "valve_coeff": Fixed(15),
+            "displacement": Fixed(pump_model.displacement),
+        }
+
+    def set_distribution(self, parameter, distribution):
+        """Replace the distribution used for a parameter.
+
+        :param parameter: One of PARAMETERS
+        :param distribution: Object providing sample(rng, count)
+
+        :except KeyError: Unknown parameter
+        """
+        if parameter not in self.distributions:
+            raise KeyError("Unknown parameter: {}".format(parameter))
+        self.distributions[parameter] = distribution
+
+    def _constants(self):
+        """Model values that are identical across realizations."""
+        tank = self.tank
+        geometry = math.pow(tank.pipe_diam, 4.8704) * tank.pipe_slope / 4.52
+        press_in = utility_formulas.head_to_press(self.pump.head_in)
+        delta_p = self.pump.diff_press_psi(press_in, self.pump.outlet_pressure)
+        unit_power = pump.Pump().pump_power(1.0, delta_p)  # Scratch pump; don't disturb the model's power value
+        return (tank.level > 0, geometry, tank.static_tank_press, math.pow(self.valve_diameter, 2),
+                self.pump_speed, unit_power)
+
+    def run(self, samples, seed=None, workers=1, percentiles=(5, 50, 95)):
+        """Evaluate the requested number of realizations.
+
+        :param samples: Number of realizations
+        :param seed: Seed for reproducible results
+        :param workers: Number of processes; 1 evaluates in-process
+        :param percentiles: Percentiles to report for each output
+
+        :return: Output name -> {percentile: value}
+        :rtype: dict
+        """
+        if samples < 1:
+            raise ValueError("At least one sample is required.")
+        constants = self._constants()
+        rng = random.Random(seed)
+
+        if workers <= 1:
+            results = [_evaluate(constants, self.distributions, samples, rng.getrandbits(64))]
+        else:
+            chunk = -(-samples // workers)
+            counts = [min(chunk, samples - start) for start in range(0, samples, chunk)]
+            seeds = [rng.getrandbits(64) for _ in counts]
+            from concurrent.futures import ProcessPoolExecutor  # Pulls in multiprocessing; only needed here
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_evaluate, [constants] * len(counts),
+                                            [self.distributions] * len(counts), counts, seeds))
+
+        bands = {}
+        for output in OUTPUTS:
+            values = sorted(value for result in results for value in result[output])
+            bands[output] = {pct: percentile(values, pct) for pct in percentiles}
+        return bands
+
+
+if __name__ == "__main__":
+    import time
+    import Models.FuelFarm.components as ffc
+    import Models.FuelFarm.functionality as fff
+
+    fff.pump1_on()
+    mc = MonteCarlo(ffc.tank1, 16, ffc.pump1)
+    mc.set_distribution("pipe_coeff", Normal(140, 10, low=1))
+    mc.set_distribution("valve_coeff", Triangular(12, 15, 18))
+    mc.set_distribution("displacement", Uniform(0.22, 0.26))
+    start = time.perf_counter()
+    for name, band in mc.run(100000, seed=1).items():
+        print(name, band)
+    print("{:.2f} s".format(time.perf_counter() - start))
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC profiling.py
+
+Purpose: Opt-in call counts and latency statistics for FuelFarm operations and component methods.
+
+Nothing is instrumented until Profiler.enable() is called: it swaps timing wrappers in for the functionality actions
+and the component methods and property setters, and disable() puts the originals back, so a disabled profiler costs
+nothing at all. Times are inclusive, e.g. gate3_open includes the Valve.open it calls.
+
+Classes:
+    OperationStats: Counters for one instrumented operation
+    Profiler: Instrumentation switch and hot-spot report
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import collections
+import functools
+import time
+
+from PipingSystems.pump import pump
+from PipingSystems.storage_tank import tank
+from PipingSystems.valve import valve
+
+# (owner, attribute) pairs instrumented by default, besides the functionality actions
+COMPONENT_TARGETS = [
+    (pump.Pump, "pump_power"),
+    (pump.CentrifPump, "adjust_speed"),
+    (pump.CentrifPump, "start_pump"),
+    (pump.PositiveDisplacement, "adjust_speed"),
+    (valve.Valve, "press_drop"),
+    (valve.Valve, "get_press_out"),
+    (valve.Valve, "valve_flow_out"),
+    (valve.Valve, "open"),
+    (valve.Valve, "close"),
+    (valve.Gate, "turn_handle"),
+    (valve.Globe, "turn_handle"),
+    (valve.Relief, "valve_operation"),
+    (tank.Tank, "gravity_flow"),
+    (tank.Tank, "level"),
+    (tank.Tank, "static_tank_press"),
+]
+
+
+class OperationStats:
+    """Call count, total time, and a ring buffer of recent latencies for one operation."""
+    __slots__ = ("calls", "total_ns", "samples", "_next")
+
+    def __init__(self, samples):
+        self.calls = 0
+        self.total_ns = 0
+        self.samples = [0] * samples
+        self._next = 0
+
+    def record(self, elapsed_ns):
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        self.samples[self._next] = elapsed_ns
+        self._next = (self._next + 1) % len(self.samples)
+
+    def percentile(self, pct):
+        """Latency percentile over the recent samples, in nanoseconds."""
+        recent = sorted(self.samples[:min(self.calls, len(self.samples))])
+        if not recent:
+            return 0
+        return recent[min(len(recent) - 1, int(len(recent) * pct / 100))]
+
+
+class Profiler:
+    """Instrumentation for the functionality actions and component methods.
+
+    Methods: enable(), disable(), reset(), stats(), report()
+    """
+    def __init__(self, samples=1024, actions=None, targets=None):
+        """Choose what to instrument.
+
+        :param samples: Number of recent latencies kept per operation for percentiles
+        :param actions: Module whose public functions are instrumented; Models.FuelFarm.functionality by default
+        :param targets: (class, attribute) pairs to instrument; COMPONENT_TARGETS by default
+        """
+        self.samples = samples
+        self.actions = actions
+        self.targets = COMPONENT_TARGETS if targets is None else targets
+        self.operations = {}
+        self.component_types = collections.Counter()
+        self.enabled = False
+        self._installed = []  # (owner, attribute, original, wrapper)
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    def _stats(self, name):
+        stats = self.operations.get(name)
+        if stats is None:
+            stats = self.operations[name] = OperationStats(self.samples)
+        return stats
+
+    def _wrap_function(self, name, func):
+        stats = self._stats(name)
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.record(clock() - start)
+        return timed
+
+    def _wrap_method(self, name, func):
+        stats = self._stats(name)
+        types = self.component_types
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def timed(instance, *args, **kwargs):
+            types[type(instance).__name__] += 1
+            start = clock()
+            try:
+                return func(instance, *args, **kwargs)
+            finally:
+                stats.record(clock() - start)
+        return timed
+
+    def enable(self):
+        """Install the timing wrappers."""
+        if self.enabled:
+            return
+        actions = self.actions
+        if actions is None:
+            import Models.FuelFarm.functionality as actions
+        for name, func in list(vars(actions).items()):
+            if callable(func) and not name.startswith("_") and getattr(func, "__module__", None) == actions.__name__:
+                self._install(actions, name, func, self._wrap_function("functionality.{}".format(name), func))
+
+        for owner, attribute in self.targets:
+            original = owner.__dict__[attribute]
+            name = "{}.{}".format(owner.__name__, attribute)
+            if isinstance(original, property):
+                fset = original.fset and self._wrap_method(name, original.fset)
+                wrapper = property(original.fget, fset, original.fdel, original.__doc__)
+            else:
+                wrapper = self._wrap_method(name, original)
+            self._install(owner, attribute, original, wrapper)
+        self.enabled = True
+
+    def _install(self, owner, attribute, original, wrapper):
+        setattr(owner, attribute, wrapper)
+        self._installed.append((owner, attribute, original, wrapper))
+
+    def disable(self):
+        """Restore the original functions.
+
+        An attribute that was replaced again after enable() (e.g. by an interlock engine) is left alone.
+        """
+        for owner, attribute, original, wrapper in reversed(self._installed):
+            current = owner.__dict__.get(attribute) if isinstance(owner, type) else getattr(owner, attribute, None)
+            if current is wrapper:
+                setattr(owner, attribute, original)
+        self._installed.clear()
+        self.enabled = False
+
+    def reset(self):
+        """Discard collected statistics."""
+        for stats in self.operations.values():
+            stats.__init__(self.samples)
+        self.component_types.clear()
+
+    def stats(self):
+        """Summarize every operation that was called.
+
+        :return: (name, calls, total ms, mean us, p50 us, p95 us, p99 us), hottest first
+        :rtype: list
+        """
+        rows = []
+        for name, stats in self.operations.items():
+            if not stats.calls:
+                continue
+            rows.append((name, stats.calls, stats.total_ns / 1e6, stats.total_ns / stats.calls / 1e3,
+                         stats.percentile(50) / 1e3, stats.percentile(95) / 1e3, stats.percentile(99) / 1e3))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows
+
+    def report(self, limit=20):
+        """Format the hottest operations and the calls per component type."""
+        lines = ["{:<40} {:>9} {:>10} {:>9} {:>9} {:>9} {:>9}".format(
+            "Operation", "Calls", "Total ms", "Mean us", "p50 us", "p95 us", "p99 us")]
+        for row in self.stats()[:limit]:
+            lines.append("{:<40} {:>9} {:>10.3f} {:>9.2f} {:>9.2f} {:>9.2f} {:>9.2f}".format(*row))
+        lines.append("")
+        lines.append("{:<40} {:>9}".format("Component type", "Calls"))
+        for name, count in self.component_types.most_common():
+            lines.append("{:<40} {:>9}".format(name, count))
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import Models.FuelFarm.functionality as fff
+
+    with Profiler() as profiler:
+        for _ in range(1000):
+            fff.gate1_open()
+            fff.gate3_open()
+            fff.gate5_open()
+            fff.pump1_on()
+            fff.pump1_off()
+            fff.gate1_close()
+    print(profiler.report())
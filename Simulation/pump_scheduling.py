@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC pump_scheduling.py
+
+Purpose: Choose which positive displacement pumps run, and at what speed, to meet a flow demand with the least power.
+
+A positive displacement pump's flow is its speed times its displacement, and Pump.pump_power is linear in flow at a
+fixed differential pressure, so each pump has a constant cost in kW per gpm. For one pump combination the cheapest
+dispatch runs every pump at its minimum speed and fills the rest of the demand from the cheapest pump up. Every
+combination's flow range and cheapest-first order is worked out once; the cost of all combinations at a demand value
+is then computed together and cached, since demand profiles repeat values; beyond CACHE_SIZE demand values the least
+recently used are dropped. Over a horizon, a dynamic program over the intervals adds the cost of starting pumps.
+
+Classes:
+    PumpScheduler: Single-interval dispatch and multi-interval schedules
+    Schedule: Result of PumpScheduler.schedule()
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import collections
+import math
+
+import utility_formulas
+
+CACHE_SIZE = 1024  # Demand values whose combination costs are kept
+
+Schedule = collections.namedtuple("Schedule", "speeds power energy starts")
+
+
+class PumpScheduler:
+    """Least-power pump dispatch.
+
+    Methods: dispatch(), schedule(), apply()
+    """
+    def __init__(self, pumps, max_speed=1480, min_speed=0, start_cost=0.0, fluid_spec_weight=62.4):
+        """Characterize the pumps.
+
+        :param pumps: PositiveDisplacement pumps; their displacement, head_in, and outlet_pressure are used
+        :param max_speed: Maximum speed, in rpm; a number for all pumps or a list per pump
+        :param min_speed: Minimum running speed, in rpm; a number or a list per pump
+        :param start_cost: Energy charged each time a pump starts, in kWh
+        :param fluid_spec_weight: Specific weight of fluid; default assumes water
+
+        :except ValueError: Pump without displacement or minimum speed above maximum
+        """
+        self.pumps = list(pumps)
+        count = len(self.pumps)
+        max_speeds = max_speed if isinstance(max_speed, (list, tuple)) else [max_speed] * count
+        min_speeds = min_speed if isinstance(min_speed, (list, tuple)) else [min_speed] * count
+        self.start_cost = start_cost
+        self.cost_per_gpm = []
+        self.min_flow = []
+        self.max_flow = []
+        for pump, low, high in zip(self.pumps, min_speeds, max_speeds):
+            if pump.displacement <= 0:
+                raise ValueError("{} has no displacement.".format(pump.name))
+            if low > high:
+                raise ValueError("Minimum speed is above maximum speed for {}.".format(pump.name))
+            diff_press = pump.diff_press_psi(utility_formulas.head_to_press(pump.head_in), pump.outlet_pressure)
+            power = pump.power
+            self.cost_per_gpm.append(pump.pump_power(1.0, diff_press, fluid_spec_weight))
+            pump.power = power  # pump_power() records its result; leave the pump as it was
+            self.min_flow.append(low * pump.displacement)
+            self.max_flow.append(high * pump.displacement)
+
+        # Per combination (bit mask): flow range, power at minimum flows, and members cheapest first
+        self.combinations = []
+        for mask in range(1 << count):
+            members = [i for i in range(count) if mask >> i & 1]
+            self.combinations.append((
+                mask,
+                sum(self.min_flow[i] for i in members),
+                sum(self.max_flow[i] for i in members),
+                sum(self.cost_per_gpm[i] * self.min_flow[i] for i in members),
+                sorted(members, key=self.cost_per_gpm.__getitem__),
+            ))
+        self.capacity = sum(self.max_flow)
+        self._bit_counts = [bin(mask).count("1") for mask in range(1 << count)]
+        self._costs = collections.OrderedDict()  # Demand -> combination costs, least recently used first
+
+    def _fill(self, members, demand, base_flow):
+        """Flow per member: minimum flows, then the remainder cheapest first."""
+        flows = {i: self.min_flow[i] for i in members}
+        remaining = demand - base_flow
+        for i in members:
+            take = min(remaining, self.max_flow[i] - self.min_flow[i])
+            flows[i] += take
+            remaining -= take
+        return flows
+
+    def costs(self, demand):
+        """Power of every combination at a demand, in kW; math.inf where a combination can't meet it.
+
+        :return: Power indexed by combination bit mask
+        :rtype: tuple
+        """
+        costs = self._costs
+        cached = costs.get(demand)
+        if cached is not None:
+            costs.move_to_end(demand)
+            return cached
+        cost_per_gpm = self.cost_per_gpm
+        spans = [mx - mn for mn, mx in zip(self.min_flow, self.max_flow)]
+        row = []
+        for mask, low, high, base, members in self.combinations:
+            if not low <= demand <= high:
+                row.append(math.inf)
+                continue
+            remaining = demand - low
+            for i in members:
+                take = remaining if remaining < spans[i] else spans[i]
+                base += cost_per_gpm[i] * take
+                remaining -= take
+                if remaining <= 0:
+                    break
+            row.append(base)
+        cached = costs[demand] = tuple(row)
+        if len(costs) > CACHE_SIZE:
+            costs.popitem(last=False)
+        return cached
+
+    def _speeds(self, mask, demand):
+        members = self.combinations[mask][4]
+        flows = self._fill(members, demand, self.combinations[mask][1])
+        return tuple(flows[i] / self.pumps[i].displacement if i in flows else 0.0 for i in range(len(self.pumps)))
+
+    def _check(self, demand):
+        if demand < 0 or demand > self.capacity:
+            raise ValueError("Demand of {} gpm is outside the pump capacity.".format(demand))
+
+    def dispatch(self, demand):
+        """Cheapest way to meet one demand, ignoring start costs.
+
+        :param demand: Flow demand, in gpm
+
+        :except ValueError: Demand is negative or above total capacity, or no combination can meet it
+
+        :return: Speed of each pump and total power, in kW
+        :rtype: tuple
+        """
+        self._check(demand)
+        row = self.costs(demand)
+        mask = min(range(len(row)), key=row.__getitem__)
+        if row[mask] == math.inf:
+            raise ValueError("No pump combination can deliver {} gpm.".format(demand))
+        return self._speeds(mask, demand), row[mask]
+
+    def _cheapest_predecessors(self, best):
+        """For every combination, the cheapest prior combination including the cost of starting pumps.
+
+        Starting cost depends only on which pumps are added, so rather than comparing every pair of combinations this
+        takes the minimum over supersets (switching pumps off is free), then over subsets with a charge per pump
+        added: O(n 2^n) instead of O(4^n) for n pumps.
+
+        :return: (cost, prior combination) per combination
+        :rtype: list
+        """
+        count = len(self.pumps)
+        size = 1 << count
+        start_cost = self.start_cost
+        bits = self._bit_counts
+        reached = [(cost, old) for old, cost in enumerate(best)]
+        for bit in range(count):  # Cheapest prior state containing each combination
+            flag = 1 << bit
+            for mask in range(size):
+                if not mask & flag and reached[mask | flag][0] < reached[mask][0]:
+                    reached[mask] = reached[mask | flag]
+        reached = [(cost - start_cost * bits[mask], old) for mask, (cost, old) in enumerate(reached)]
+        for bit in range(count):  # Cheapest of those within each combination
+            flag = 1 << bit
+            for mask in range(size):
+                if mask & flag and reached[mask ^ flag][0] < reached[mask][0]:
+                    reached[mask] = reached[mask ^ flag]
+        return [(cost + start_cost * bits[mask], old) for mask, (cost, old) in enumerate(reached)]
+
+    def schedule(self, demands, interval=1.0, running=()):
+        """Cheapest schedule for a demand profile, including start costs.
+
+        :param demands: Flow demand for each interval, in gpm
+        :param interval: Interval length, in hours
+        :param running: Indices of pumps already running before the first interval
+
+        :except ValueError: A demand can't be met
+
+        :return: Speeds per interval, power per interval in kW, total energy in kWh, and number of pump starts
+        :rtype: Schedule
+        """
+        states = range(len(self.combinations))
+        initial = sum(1 << i for i in running)
+        best = [0.0 if state == initial else math.inf for state in states]
+        back = []
+        for demand in demands:
+            self._check(demand)
+            row = self.costs(demand)
+            if self.start_cost:
+                reached = self._cheapest_predecessors(best)
+                choice = [old for _, old in reached]
+                best = [cost + power * interval for (cost, _), power in zip(reached, row)]
+            else:
+                prior = min(states, key=best.__getitem__)
+                choice = [prior] * len(best)
+                best = [best[prior] + power * interval for power in row]
+            back.append(choice)
+            if min(best) == math.inf:
+                raise ValueError("No pump combination can deliver {} gpm.".format(demand))
+
+        state = min(states, key=best.__getitem__)
+        energy = best[state]
+        masks = []
+        for choice in reversed(back):
+            masks.append(state)
+            state = choice[state]
+        masks.reverse()
+        speeds = [self._speeds(mask, demand) for mask, demand in zip(masks, demands)]
+        power = [self.costs(demand)[mask] for mask, demand in zip(masks, demands)]
+        starts = sum(bin(new & ~old).count("1") for old, new in zip([initial] + masks, masks))
+        return Schedule(speeds, power, energy, starts)
+
+    def apply(self, speeds):
+        """Set each pump to a speed from dispatch() or schedule()."""
+        for pump, speed in zip(self.pumps, speeds):
+            pump.adjust_speed(speed)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    from PipingSystems.pump.pump import PositiveDisplacement
+
+    station = [PositiveDisplacement("Pump {}".format(n), pump_head_in=head, press_out=50, displacement=0.24)
+               for n, head in enumerate((20.0, 35.0, 10.0, 25.0, 30.0, 15.0), 1)]
+    scheduler = PumpScheduler(station, min_speed=600, start_cost=5.0)
+    rng = random.Random(1)
+    profile = [rng.choice([0] + list(range(150, 2000, 50))) for _ in range(8760)]
+    start = time.perf_counter()
+    plan = scheduler.schedule(profile)
+    print("{} intervals in {:.2f} s: {:.0f} kWh, {} starts".format(len(profile), time.perf_counter() - start,
+                                                                  plan.energy, plan.starts))
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC scheduler.py
+
+Purpose: Discrete-event core for long simulations.
+
+Rather than advancing a model in fixed ticks, components and operators schedule their next state change and the
+scheduler jumps simulated time directly from one event to the next. Quiet periods cost nothing.
+
+Classes:
+    Event: Scheduled callback
+    EventScheduler: Priority-queue event loop
+    TankLevelProcess: Tank level that changes linearly between events and schedules its own empty, full, and threshold
+        crossings
+    PumpProcess: Pump transferring between tank processes that schedules its own start, stop, and trips
+    ReliefProcess: Relief valve that opens and closes itself at its pressure setpoints
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+
+import heapq
+import itertools
+import math
+
+import utility_formulas
+
+
+class Event:
+    """Callback scheduled at a simulated time."""
+    __slots__ = ("time", "priority", "callback", "args", "cancelled")
+
+    def __init__(self, time, priority, callback, args):
+        self.time = time
+        self.priority = priority
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Prevent the event from running."""
+        self.cancelled = True
+
+
+class EventScheduler:
+    """Event loop ordered by time, then priority (lower first), then scheduling order.
+
+    Methods: schedule(), schedule_in(), cancel(), peek(), step(), run()
+    """
+    def __init__(self, start=0.0, metrics=None):
+        """Set the initial simulated time.
+
+        :param start: Simulated time, in seconds
+        :param metrics: Optional Simulation.metrics.SimulationMetrics fed with each event processed
+        """
+        self.now = start
+        self.processed = 0
+        self.metrics = metrics
+        self._queue = []
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        """Number of pending (including cancelled, not yet discarded) events."""
+        return len(self._queue)
+
+    def schedule(self, time, callback, *args, priority=0):
+        """Run callback(*args) at an absolute simulated time.
+
+        :param time: Simulated time, in seconds
+        :param callback: Function to call
+        :param priority: Tie-breaker for events at the same time; lower runs first
+
+        :except ValueError: Time is in the past
+
+        :return: Handle that can be cancelled
+        :rtype: Event
+        """
+        if time < self.now:
+            raise ValueError("Cannot schedule an event in the past.")
+        event = Event(time, priority, callback, args)
+        heapq.heappush(self._queue, (time, priority, next(self._sequence), event))
+        return event
+
+    def schedule_in(self, delay, callback, *args, priority=0):
+        """Run callback(*args) after a delay, in seconds."""
+        return self.schedule(self.now + delay, callback, *args, priority=priority)
+
+    @staticmethod
+    def cancel(event):
+        """Cancel a scheduled event; it is discarded when reached."""
+        if event is not None:
+            event.cancel()
+
+    def peek(self):
+        """Get the time of the next pending event, or math.inf if none."""
+        queue = self._queue
+        while queue and queue[0][3].cancelled:
+            heapq.heappop(queue)
+        return queue[0][0] if queue else math.inf
+
+    def step(self):
+        """Advance to the next event and run it.
+
+        :return: False if no events remain
+        :rtype: bool
+        """
+        queue = self._queue
+        while queue:
+            time, _, _, event = heapq.heappop(queue)
+            if event.cancelled:
+                continue
+            self.now = time
+            self.processed += 1
+            event.callback(*event.args)
+            if self.metrics is not None:
+                self.metrics.tick(len(queue), time)
+            return True
+        return False
+
+    def run(self, until=math.inf, max_events=None):
+        """Process events in order.
+
+        :param until: Stop before events later than this time; simulated time is then advanced to it
+        :param max_events: Stop after this many events
+
+        :return: Number of events processed
+        :rtype: int
+        """
+        count = 0
+        while max_events is None or count < max_events:
+            next_time = self.peek()
+            if next_time == math.inf or next_time > until:
+                break
+            self.step()
+            count += 1
+        if until != math.inf and self.now < until and (max_events is None or count < max_events):
+            self.now = until
+        return count
+
+
+class TankLevelProcess:
+    """Tank whose level changes linearly with the net flow between events.
+
+    The Tank object is only written at event times: when the net flow changes, when the tank empties or fills, and when
+    a watched level is crossed. Call sync() to bring it up to date at any other time.
+
+    Methods: sync(), set_flow(), set_level(), watch(), watch_pressure()
+    """
+    def __init__(self, scheduler, tank, gallons_per_foot, max_level, on_empty=None, on_full=None):
+        """Attach a tank to the scheduler.
+
+        :param scheduler: EventScheduler
+        :param tank: Tank
+        :param gallons_per_foot: Tank capacity per foot of level
+        :param max_level: Level at which the tank is full, in feet
+        :param on_empty: Called with this process when the tank empties
+        :param on_full: Called with this process when the tank fills
+        """
+        self.scheduler = scheduler
+        self.tank = tank
+        self.gallons_per_foot = gallons_per_foot
+        self.max_level = max_level
+        self.on_empty = on_empty
+        self.on_full = on_full
+        self.net_flow = 0.0  # gpm; positive fills the tank
+        self._rate = 0.0  # ft/s
+        self._level = tank.level
+        self._since = scheduler.now
+        self._watches = []
+        self._event = None
+
+    def level_at(self, time):
+        """Calculate the tank level at a simulated time, assuming the current flow continues."""
+        level = self._level + self._rate * (time - self._since)
+        return min(max(level, 0.0), self.max_level)
+
+    def sync(self):
+        """Write the current level to the tank."""
+        now = self.scheduler.now
+        if now != self._since:
+            self._level = self.level_at(now)
+            self._since = now
+            self.tank.level = self._level
+
+    def set_flow(self, net_flow):
+        """Change the net flow into the tank.
+
+        :param net_flow: Inflow minus outflow, in gpm
+        """
+        self.sync()
+        self.net_flow = net_flow
+        self._rate = net_flow / self.gallons_per_foot / 60
+        self._reschedule()
+
+    def set_level(self, level):
+        """Set the level now, e.g. after an operator changed it, and carry on from there at the same net flow."""
+        self._level = min(max(level, 0.0), self.max_level)
+        self._since = self.scheduler.now
+        self.tank.level = self._level
+        self._reschedule()
+
+    def watch(self, level, callback):
+        """Call callback(process, level) whenever the tank level crosses the given level."""
+        self._watches.append((level, callback))
+        self.sync()
+        self._reschedule()
+
+    def watch_pressure(self, press, callback):
+        """Call callback(process, level) whenever static tank pressure crosses the given pressure, e.g. a relief setpoint.
+
+        :param press: Pressure, in psi
+        """
+        level = press * 144 / (self.tank.fluid_density * utility_formulas.GRAVITY)
+        self.watch(level, callback)
+
+    def _reschedule(self):
+        """Schedule the next level at which something happens."""
+        self.scheduler.cancel(self._event)
+        self._event = None
+        rate = self._rate
+        level = self._level
+        if rate > 0:
+            targets = [lvl for lvl, _ in self._watches if level < lvl < self.max_level] + [self.max_level]
+            target = min(targets)
+        elif rate < 0:
+            targets = [lvl for lvl, _ in self._watches if 0.0 < lvl < level] + [0.0]
+            target = max(targets)
+        else:
+            return
+        if target == level:  # Already empty or full
+            return
+        when = self._since + (target - level) / rate
+        self._event = self.scheduler.schedule(when, self._reached, target)
+
+    def _reached(self, target):
+        """Handle the tank reaching a scheduled level."""
+        self._event = None
+        self._level = target
+        self._since = self.scheduler.now
+        self.tank.level = target
+        for level, callback in self._watches:
+            if level == target:
+                callback(self, level)
+        if target == 0.0 and self.on_empty is not None:
+            self.on_empty(self)
+        elif target == self.max_level and self.on_full is not None:
+            self.on_full(self)
+        if self._event is None:
+            self._reschedule()
+
+
+class PumpProcess:
+    """Pump moving fuel out of one tank process and into another, switching itself on and off.
+
+    The pump's flow is added to the net flow of its tanks while it runs. A run started with a duration schedules its own
+    stop, and the pump trips (stops) when its source empties or its destination fills.
+
+    Methods: start(), stop(), schedule_run()
+    """
+    def __init__(self, scheduler, pump, speed, source=None, destination=None, on_trip=None):
+        """Attach a pump to the scheduler.
+
+        :param scheduler: EventScheduler
+        :param pump: Pump, stopped
+        :param speed: Running speed
+        :param source: TankLevelProcess the pump draws from; None is outside the model
+        :param destination: TankLevelProcess the pump delivers to; None is outside the model
+        :param on_trip: Called with this process and the tank process when the pump trips
+        """
+        self.scheduler = scheduler
+        self.pump = pump
+        self.speed = speed
+        self.source = source
+        self.destination = destination
+        self.on_trip = on_trip
+        self.trips = []  # (time, tank process)
+        self._flow = 0.0  # gpm currently added to the tanks
+        self._stop = None
+        for tank, hook in ((source, "on_empty"), (destination, "on_full")):
+            if tank is not None:
+                self._chain(tank, hook)
+
+    @property
+    def running(self):
+        return self.pump.speed > 0
+
+    def start(self, duration=None):
+        """Start the pump now.
+
+        :param duration: Seconds to run before stopping; runs until stopped or tripped by default
+
+        :return: False if the source is empty or the destination full, so the pump can't run
+        :rtype: bool
+        """
+        if (self.source is not None and self.source.level_at(self.scheduler.now) <= 0.0) or \
+                (self.destination is not None and
+                 self.destination.level_at(self.scheduler.now) >= self.destination.max_level):
+            return False
+        self.scheduler.cancel(self._stop)
+        self._stop = None
+        self.pump.adjust_speed(self.speed)
+        self._set_flow(self.pump.flow)
+        if duration is not None:
+            self._stop = self.scheduler.schedule_in(duration, self.stop)
+        return True
+
+    def stop(self):
+        """Stop the pump now."""
+        self.scheduler.cancel(self._stop)
+        self._stop = None
+        self.pump.adjust_speed(0)
+        self._set_flow(0.0)
+
+    def schedule_run(self, time, duration):
+        """Run the pump for a duration starting at a simulated time, e.g. an operator's planned transfer."""
+        return self.scheduler.schedule(time, self.start, duration)
+
+    def _set_flow(self, flow):
+        change = flow - self._flow
+        self._flow = flow
+        if change:
+            if self.source is not None:
+                self.source.set_flow(self.source.net_flow - change)
+            if self.destination is not None:
+                self.destination.set_flow(self.destination.net_flow + change)
+
+    def _chain(self, tank, hook):
+        """Add the trip to a tank process's empty or full callback, keeping the existing one."""
+        previous = getattr(tank, hook)
+
+        def callback(process):
+            if previous is not None:
+                previous(process)
+            if self.running:
+                self.stop()
+                self.trips.append((self.scheduler.now, process))
+                if self.on_trip is not None:
+                    self.on_trip(self, process)
+        setattr(tank, hook, callback)
+
+
+class ReliefProcess:
+    """Relief valve on a tank process that opens at its open setpoint and recloses at its close setpoint.
+
+    While open, the valve discharges a fixed flow out of the tank, so a tank filling past the open setpoint cycles the
+    valve between its setpoints without any polling.
+
+    Transitions are recorded in changes as (time, position).
+    """
+    def __init__(self, tank, relief, relief_flow=0.0, on_change=None):
+        """Attach a relief valve to a tank process.
+
+        :param tank: TankLevelProcess
+        :param relief: Relief valve; its setpoint_open and setpoint_close are static tank pressures, in psi
+        :param relief_flow: Flow out of the tank while the valve is open, in gpm
+        :param on_change: Called with this process when the valve opens or closes
+        """
+        self.tank = tank
+        self.relief = relief
+        self.relief_flow = relief_flow
+        self.on_change = on_change
+        self.changes = []
+        relief.valve_operation(utility_formulas.static_press(tank.tank.level, tank.tank.fluid_density))
+        if relief.position == 100 and relief_flow:
+            tank.set_flow(tank.net_flow - relief_flow)
+        tank.watch_pressure(relief.setpoint_open, self._open)
+        tank.watch_pressure(relief.setpoint_close, self._close)
+
+    def _open(self, process, level):
+        if process.net_flow > 0 and self.relief.position != 100:  # Rising through the setpoint
+            self.relief.open()
+            self._changed(-self.relief_flow)
+
+    def _close(self, process, level):
+        if process.net_flow < 0 and self.relief.position != 0:  # Falling through the setpoint
+            self.relief.close()
+            self._changed(self.relief_flow)
+
+    def _changed(self, flow_change):
+        self.changes.append((self.tank.scheduler.now, self.relief.position))
+        if flow_change:
+            self.tank.set_flow(self.tank.net_flow + flow_change)
+        if self.on_change is not None:
+            self.on_change(self)
+
+
+if __name__ == "__main__":
+    import time
+    from PipingSystems.storage_tank.tank import Tank
+
+    sched = EventScheduler()
+    tank = Tank("Tank 1", level=30.0, fluid_density=1.629869, outlet_diam=16, outlet_slope=0.25)
+    process = TankLevelProcess(sched, tank, 27778, 36.0, on_empty=lambda p: print("empty at", sched.now))
+
+    def transfer(on):
+        process.set_flow(-355.2 if on else 0.0)
+
+    for day in range(7):
+        for hour in (6, 14):
+            sched.schedule(day * 86400 + hour * 3600, transfer, True)
+            sched.schedule(day * 86400 + (hour + 4) * 3600, transfer, False)
+    start = time.perf_counter()
+    sched.run(until=7 * 86400)
+    process.sync()
+    print("Level after a week: {:.2f} ft, {} events in {:.4f} s".format(tank.level, sched.processed,
+                                                                      time.perf_counter() - start))
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC shared_state.py
+
+Purpose: Tank, valve, and pump state for a fleet of farms in one shared memory block.
+
+Worker processes each write the farms they own; a supervisor and HMIs attach to the block by name and read any farm
+directly from the shared pages, with nothing pickled or sent between processes.
+
+Layout (native byte order; every field is 8 bytes, so the block is also an array of doubles):
+
+    Header, 64 bytes
+        0   4s   magic b"VPLC"
+        4   u32  layout version (1)
+        8   u32  farm count
+        12  u32  tanks per farm
+        16  u32  valves per farm
+        20  u32  pumps per farm
+        24       reserved
+    Farm records, one after another from byte 64, each 8 * (1 + 3T + 5V + 4P) bytes
+        u64      sequence number
+        f64      per tank:  level, static pressure, flow out
+        f64      per valve: position, pressure in, flow in, pressure out, flow out
+        f64      per pump:  speed, power, outlet pressure, flow
+
+Consistency uses a seqlock per farm. The writer makes the sequence odd, writes the record, then makes it even again.
+A reader copies the record between two reads of the sequence and retries if the sequence was odd or changed, so it
+never returns a torn record and never blocks the writer. Each farm must have a single writer process. The seqlock
+relies on stores becoming visible in program order, as on x86-64.
+
+Classes:
+    FleetLayout: Offsets for a fleet's shared block
+    SharedFleet: Shared block with seqlocked farm records
+    FarmState: Consistent copy of one farm's record
+
+Functions:
+    farm_components(): Tanks, valves, and pumps of a FuelFarm in record order
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import array
+import collections
+import multiprocessing
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+
+MAGIC = b"VPLC"
+VERSION = 1
+HEADER = struct.Struct("=4sIIIII")
+HEADER_SIZE = 64
+
+TANK_FIELDS = ("level", "static_tank_press", "flow_out")
+VALVE_FIELDS = ("position", "press_in", "flow_in", "press_out", "flow_out")
+PUMP_FIELDS = ("speed", "power", "outlet_pressure", "flow")
+
+FarmState = collections.namedtuple("FarmState", "sequence tanks valves pumps")
+
+_CREATED = set()  # Blocks created by this process
+
+
+class FleetLayout:
+    """Sizes and word offsets of a fleet block."""
+    def __init__(self, farms, tanks=2, valves=16, pumps=3):
+        """Size the block; the defaults fit FuelFarm (see farm_components()).
+
+        :param farms: Number of farms
+        :param tanks: Tanks per farm
+        :param valves: Valves per farm
+        :param pumps: Pumps per farm
+
+        :except ValueError: No farms
+        """
+        if farms < 1:
+            raise ValueError("Fleet needs at least one farm.")
+        self.farms = farms
+        self.tanks = tanks
+        self.valves = valves
+        self.pumps = pumps
+        self.values = len(TANK_FIELDS) * tanks + len(VALVE_FIELDS) * valves + len(PUMP_FIELDS) * pumps
+        self.record_words = 1 + self.values
+        self.size = HEADER_SIZE + 8 * self.record_words * farms
+
+    def record(self, farm):
+        """Word index of a farm's sequence number; its values follow.
+
+        :except IndexError: No such farm
+        """
+        if not 0 <= farm < self.farms:
+            raise IndexError("Farm {} is outside the fleet.".format(farm))
+        return HEADER_SIZE // 8 + farm * self.record_words
+
+
+def farm_components(farm):
+    """Tanks, valves, and pumps of a FuelFarm (factory.FuelFarm, fork.Fork, or the components module) in record order.
+
+    :return: (tanks, valves, pumps)
+    :rtype: tuple
+    """
+    tanks = [farm.tank1, farm.tank2]
+    valves = [getattr(farm, "gate{}".format(number)) for number in range(1, 11)]
+    valves += [getattr(farm, "{}{}".format(kind, number)) for kind in ("relief", "throttle") for number in (1, 2, 3)]
+    pumps = [farm.pump1, farm.pump2, farm.pump3]
+    return tanks, valves, pumps
+
+
+class SharedFleet:
+    """Fleet state in shared memory.
+
+    Methods: create(), attach(), write(), write_components(), read(), read_values(), close(), unlink()
+    """
+    def __init__(self, memory, layout):
+        self.memory = memory
+        self.layout = layout
+        self.name = memory.name
+        self.words = memory.buf.cast("Q")
+        self.doubles = memory.buf.cast("d")
+
+    @classmethod
+    def create(cls, layout, name=None):
+        """Allocate a new block.
+
+        :param layout: FleetLayout
+        :param name: Shared memory name; generated if omitted
+        """
+        memory = shared_memory.SharedMemory(name=name, create=True, size=layout.size)
+        HEADER.pack_into(memory.buf, 0, MAGIC, VERSION, layout.farms, layout.tanks, layout.valves, layout.pumps)
+        _CREATED.add(memory.name)
+        return cls(memory, layout)
+
+    @classmethod
+    def attach(cls, name):
+        """Map an existing block by name; the layout is read from its header.
+
+        Only the creator frees the block. Before Python 3.13, attaching registers the block with this process's
+        resource tracker, which would free it when an unrelated reader exits; the registration is withdrawn unless
+        the tracker is the creator's (this process, or a multiprocessing child sharing its parent's tracker).
+
+        :except ValueError: Not a fleet block, or a different layout version
+        """
+        if sys.version_info >= (3, 13):
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            memory = shared_memory.SharedMemory(name=name)
+            if memory.name not in _CREATED and multiprocessing.parent_process() is None:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(memory._name, "shared_memory")
+        magic, version, farms, tanks, valves, pumps = HEADER.unpack_from(memory.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            memory.close()
+            raise ValueError("{} is not a version {} fleet block.".format(name, VERSION))
+        return cls(memory, FleetLayout(farms, tanks, valves, pumps))
+
+    def write(self, farm, values):
+        """Publish a farm's values under its seqlock.
+
+        :param farm: Farm index
+        :param values: layout.values floats in record order
+        """
+        start = self.layout.record(farm)
+        values = array.array("d", values)
+        if len(values) != self.layout.values:
+            raise ValueError("Farm record needs {} values.".format(self.layout.values))
+        words = self.words
+        sequence = words[start]
+        words[start] = sequence + 1  # Odd: write in progress
+        self.doubles[start + 1:start + 1 + len(values)] = values
+        words[start] = sequence + 2
+
+    def write_components(self, farm, tanks, valves, pumps):
+        """Publish a farm's state read from its component objects."""
+        values = []
+        for items, fields in ((tanks, TANK_FIELDS), (valves, VALVE_FIELDS), (pumps, PUMP_FIELDS)):
+            for item in items:
+                values.extend(float(getattr(item, field)) for field in fields)
+        self.write(farm, values)
+
+    def read_values(self, farm, timeout=1.0):
+        """Consistent copy of a farm's values.
+
+        :except TimeoutError: The record was being rewritten for the whole timeout
+
+        :return: Sequence number and the values in record order
+        :rtype: tuple
+        """
+        start = self.layout.record(farm)
+        stop = start + 1 + self.layout.values
+        words = self.words
+        doubles = self.doubles
+        deadline = None
+        while True:
+            before = words[start]
+            if not before & 1:
+                values = doubles[start + 1:stop].tolist()
+                if words[start] == before:
+                    return before, values
+            if deadline is None:
+                deadline = time.monotonic() + timeout
+            elif time.monotonic() > deadline:
+                raise TimeoutError("Farm {} record stayed busy.".format(farm))
+            time.sleep(0)  # Let the writer finish
+
+    def read(self, farm, timeout=1.0):
+        """Consistent copy of a farm's state, split into per-component tuples.
+
+        :rtype: FarmState
+        """
+        sequence, values = self.read_values(farm, timeout)
+        layout = self.layout
+        parts = []
+        position = 0
+        for count, width in ((layout.tanks, len(TANK_FIELDS)), (layout.valves, len(VALVE_FIELDS)),
+                             (layout.pumps, len(PUMP_FIELDS))):
+            parts.append([tuple(values[position + i * width:position + (i + 1) * width]) for i in range(count)])
+            position += count * width
+        return FarmState(sequence // 2, *parts)
+
+    def close(self):
+        """Unmap the block; views into it must not be used afterwards."""
+        self.words.release()
+        self.doubles.release()
+        self.memory.close()
+
+    def unlink(self):
+        """Free the block once every process has closed it; call from the creator."""
+        self.memory.unlink()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC streaming.py
+
+Purpose: A model's evolution as an iterator of state frames, with lazy stages to analyze it in constant memory.
+
+simulate() yields one Frame per time step: the component fields named by a Layout, read through the components'
+properties into a single tuple. A frame shares its Layout (names and index) with every other frame of the stream, so it
+costs one small tuple, and it never copies or references the components themselves. The model supplies the layout and
+the function that carries out its commands; for the FuelFarm, see Models.FuelFarm.cli.farm_layout() and apply_command().
+Stages are generator functions taking and returning an iterator, so a pipeline only holds the frames a stage needs at
+that moment:
+
+    pipe(simulate(farm_layout(), step=1.0, steps=1000000, advance=drain),
+         functools.partial(decimate, every=60),
+         functools.partial(crossings, name="tank1.level", threshold=12.0))
+
+Classes:
+    Layout: Frame field names and how to read them
+    Frame: Time and values of one step
+    Crossing: Threshold crossing found by crossings()
+    Window: Aggregate of one window from windows()
+
+Functions:
+    simulate(): Frame source
+    pipe(): Chain stages onto a source
+    decimate(), select(), crossings(), windows(): Stages
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import collections
+import fnmatch
+import itertools
+import math
+import operator
+
+
+class Layout:
+    """Field names of a frame stream and the component attributes behind them.
+
+    Methods: snapshot(), subset()
+    """
+    def __init__(self, points):
+        """:param points: (name, component, attribute), in frame order"""
+        self.names = tuple(name for name, _, _ in points)
+        self.index = {name: position for position, name in enumerate(self.names)}
+        self._readers = []  # (attrgetter, component, field count), one per run of fields on the same component
+        for component, group in itertools.groupby(points, key=lambda point: id(point[1])):
+            group = list(group)
+            self._readers.append((operator.attrgetter(*(field for _, _, field in group)), group[0][1], len(group)))
+
+    def snapshot(self):
+        """Current values of every field.
+
+        :rtype: tuple
+        """
+        values = []
+        for reader, component, count in self._readers:
+            value = reader(component)
+            if count == 1:
+                values.append(value)
+            else:
+                values.extend(value)
+        return tuple(values)
+
+    def subset(self, names):
+        """Layout of some of the names, for frames built from this layout's values; see select().
+
+        :return: New layout and the positions of its names in this layout
+        :rtype: tuple
+        """
+        layout = Layout.__new__(Layout)
+        layout.names = tuple(names)
+        layout.index = {name: position for position, name in enumerate(layout.names)}
+        layout._readers = []
+        return layout, [self.index[name] for name in layout.names]
+
+
+class Frame:
+    """Time and field values of one step; index by field name, e.g. frame["pump1.power"]."""
+    __slots__ = ("time", "values", "layout")
+
+    def __init__(self, time, values, layout):
+        self.time = time
+        self.values = values
+        self.layout = layout
+
+    def __getitem__(self, name):
+        return self.values[self.layout.index[name]]
+
+    def get(self, name, default=None):
+        position = self.layout.index.get(name)
+        return default if position is None else self.values[position]
+
+    @property
+    def names(self):
+        return self.layout.names
+
+    def as_dict(self):
+        return dict(zip(self.layout.names, self.values))
+
+    def __repr__(self):
+        return "Frame(time={!r}, {} fields)".format(self.time, len(self.values))
+
+
+Crossing = collections.namedtuple("Crossing", "time name value threshold rising")
+Window = collections.namedtuple("Window", "start end count mean minimum maximum")
+
+
+def simulate(layout, step=1.0, steps=None, commands=(), apply=None, advance=None):
+    """Frames of a model, one per step.
+
+    :param layout: Fields to read
+    :param step: Seconds of simulated time between frames
+    :param steps: Number of frames; unlimited by default
+    :param commands: Commands with a time attribute, in time order, applied when their time is reached
+    :param apply: Called with each command to carry it out on the model
+    :param advance: Called with the time before each frame, to move the model on, e.g. drain a tank
+
+    :except ValueError: Step not positive, or commands without an apply function; raised by this call, not the first
+        frame
+
+    :return: Frames
+    :rtype: generator
+    """
+    if step <= 0:
+        raise ValueError("Step must be positive.")
+    commands = iter(commands)
+    pending = next(commands, None)
+    if pending is not None and apply is None:
+        raise ValueError("Commands need an apply function.")
+    return _simulate(layout, step, steps, commands, pending, apply, advance)
+
+
+def _simulate(layout, step, steps, commands, pending, apply, advance):
+    """Frames for simulate(), which has checked the arguments; pending is the first command, taken from commands."""
+    for index in itertools.count() if steps is None else range(steps):
+        time = index * step
+        while pending is not None and pending.time <= time:
+            apply(pending)
+            pending = next(commands, None)
+        if advance is not None:
+            advance(time)
+        yield Frame(time, layout.snapshot(), layout)
+
+
+def pipe(source, *stages):
+    """Chain stages onto a source; each stage takes an iterator and returns one.
+
+    :return: Iterator of the last stage
+    """
+    stream = iter(source)
+    for stage in stages:
+        stream = stage(stream)
+    return stream
+
+
+def decimate(frames, every):
+    """Every nth frame, starting with the first."""
+    return itertools.islice(frames, 0, None, every)
+
+
+def select(frames, pattern):
+    """Frames narrowed to the fields whose names match a glob pattern, e.g. "pump*.power".
+
+    :except ValueError: No field matches
+    """
+    source = layout = pick = positions = None
+    for frame in frames:
+        if frame.layout is not source:
+            source = frame.layout
+            names = fnmatch.filter(source.names, pattern)
+            if not names:
+                raise ValueError("No fields match {!r}.".format(pattern))
+            layout, positions = source.subset(names)
+            pick = operator.itemgetter(*positions)
+        values = pick(frame.values)
+        yield Frame(frame.time, values if len(positions) > 1 else (values,), layout)
+
+
+def crossings(frames, name, threshold, direction=0):
+    """Times a field crosses a threshold between consecutive frames.
+
+    :param name: Field name
+    :param threshold: Level to watch
+    :param direction: 1 for rising crossings only, -1 for falling only, 0 for both
+
+    :return: Crossing for each crossing; the value is the one after the crossing
+    :rtype: generator
+    """
+    previous = None
+    for frame in frames:
+        value = frame[name]
+        if previous is not None:
+            rising = previous < threshold <= value
+            falling = previous >= threshold > value
+            if (rising and direction >= 0) or (falling and direction <= 0):
+                yield Crossing(frame.time, name, value, threshold, rising)
+        previous = value
+
+
+def windows(frames, name, size):
+    """Aggregates of a field over consecutive, non-overlapping windows of frames.
+
+    Only running totals are kept, so memory doesn't depend on the window size. A final partial window is included.
+
+    :param name: Field name
+    :param size: Frames per window
+
+    :except ValueError: Size not positive; raised by this call, not the first window
+
+    :return: Window for each window
+    :rtype: generator
+    """
+    if size <= 0:
+        raise ValueError("Window size must be positive.")
+    return _windows(frames, name, size)
+
+
+def _windows(frames, name, size):
+    """Windows for windows(), which has checked the size."""
+    count = 0
+    for frame in frames:
+        value = frame[name]
+        if count == 0:
+            start, total, minimum, maximum = frame.time, 0.0, math.inf, -math.inf
+        count += 1
+        total += value
+        minimum = min(minimum, value)
+        maximum = max(maximum, value)
+        end = frame.time
+        if count == size:
+            yield Window(start, end, count, total / count, minimum, maximum)
+            count = 0
+    if count:
+        yield Window(start, end, count, total / count, minimum, maximum)
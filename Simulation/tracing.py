@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC tracing.py
+
+Purpose: End-to-end latency traces of operator commands, from button press to the table refresh that shows the result.
+
+A trace starts when a command is received and collects spans with monotonic nanosecond timestamps:
+
+    command     receipt of the command to the end of its handling
+    update      the functionality action changing the model
+    propagate   the interlock scan that carries the change through the rest of the farm
+    render      the next table refresh, which completes every trace waiting for it
+
+The HMI table is refreshed only when the operator presses its Refresh button, so end-to-end latency there includes
+however long the operator waits before pressing it; the command span alone is the time the HMI took to act on the
+command. A command whose action raises is recorded with an error attribute and never waits for a render. At most
+max_waiting traces wait for a render; beyond that the oldest are left unrendered, keeping only their earlier spans.
+
+Spans are kept as tuples in memory and serialized only when the buffer fills or the tracer is flushed, in one write
+of JSON lines, so tracing adds a few microseconds per span to the control path. A disabled tracer (no file) records
+nothing and its spans are shared null contexts.
+
+Run as a script to summarize a trace file with latency histograms and percentiles:
+    python -m Simulation.tracing trace.jsonl --slo 100
+
+Classes:
+    Tracer: Span recorder with a buffered file writer
+
+Functions:
+    load(): Read a trace file
+    summarize(): Latency statistics per span and end to end
+    format_summary(): Text report with histograms
+    main(): Command-line summary tool
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import argparse
+import atexit
+import bisect
+import collections
+import contextlib
+import itertools
+import json
+import math
+import time
+
+SPANS = ("command", "update", "propagate", "render")
+END_TO_END = "end_to_end"
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+Span = collections.namedtuple("Span", "trace name start end attributes")
+Stats = collections.namedtuple("Stats", "count mean p50 p95 p99 maximum over_slo histogram")
+
+_NULL = contextlib.nullcontext()
+
+
+class Tracer:
+    """Records traces to a file; disabled until open() is called.
+
+    Methods: open(), begin(), span(), end(), command(), render(), flush(), close()
+    """
+    def __init__(self, path=None, buffer_size=512, clock=time.monotonic_ns, max_waiting=1024):
+        """Set up the tracer.
+
+        :param path: Trace file, appended to; tracing is disabled if omitted
+        :param buffer_size: Spans held before writing to the file
+        :param max_waiting: Traces held for the next render; older ones are never rendered
+        :param clock: Monotonic clock returning integer nanoseconds
+        """
+        self.buffer_size = buffer_size
+        self.clock = clock
+        self.max_waiting = max_waiting
+        self.enabled = False
+        self._file = None
+        self._buffer = []
+        self._ids = itertools.count(1)
+        self._open = {}  # Trace -> (start, attributes) of commands still being handled
+        self._waiting = collections.deque(maxlen=max_waiting)  # Traces handled and waiting for a render
+        if path is not None:
+            self.open(path)
+
+    def open(self, path):
+        """Start writing traces to a file."""
+        self.close()
+        self._file = open(path, "a", buffering=1 << 16)
+        self._ids = itertools.count(time.time_ns())  # Unique across runs appending to the same file
+        self.enabled = True
+        atexit.register(self.close)
+
+    def begin(self, **attributes):
+        """Start a trace at command receipt.
+
+        :return: Trace id, or None when tracing is disabled
+        """
+        if not self.enabled:
+            return None
+        trace = next(self._ids)
+        self._open[trace] = (self.clock(), attributes)
+        return trace
+
+    def span(self, trace, name):
+        """Context manager timing one step of a trace; does nothing for a None trace."""
+        if trace is None:
+            return _NULL
+        return self._span(trace, name)
+
+    @contextlib.contextmanager
+    def _span(self, trace, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self._record(trace, name, start, self.clock(), None)
+
+    def end(self, trace):
+        """Finish handling a command; the trace completes at the next render."""
+        if trace is None:
+            return
+        start, attributes = self._open.pop(trace)
+        self._record(trace, "command", start, self.clock(), attributes)
+        self._waiting.append(trace)
+
+    @contextlib.contextmanager
+    def command(self, **attributes):
+        """Trace the handling of one command: begin() on entry and end() on exit.
+
+        If the block raises, the trace is closed with an "error" attribute naming the exception and is not left
+        waiting for a render, so failed commands never stay open or skew end-to-end latency.
+
+        :return: Context manager yielding the trace id, or None when tracing is disabled
+        """
+        trace = self.begin(**attributes)
+        try:
+            yield trace
+        except BaseException as error:
+            if trace is not None:
+                start, attributes = self._open.pop(trace)
+                attributes = dict(attributes, error=type(error).__name__)
+                self._record(trace, "command", start, self.clock(), attributes)
+            raise
+        self.end(trace)
+
+    @contextlib.contextmanager
+    def render(self):
+        """Time a table refresh and complete every trace waiting for it."""
+        if not self._waiting:
+            yield
+            return
+        waiting, self._waiting = self._waiting, collections.deque(maxlen=self.max_waiting)
+        start = self.clock()
+        try:
+            yield
+        finally:
+            end = self.clock()
+            for trace in waiting:
+                self._record(trace, "render", start, end, None)
+
+    def _record(self, trace, name, start, end, attributes):
+        buffer = self._buffer
+        buffer.append((trace, name, start, end, attributes))
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered spans to the file."""
+        if self._file is None or not self._buffer:
+            return
+        lines = []
+        for trace, name, start, end, attributes in self._buffer:
+            record = {"trace": trace, "span": name, "start": start, "end": end}
+            if attributes:
+                record["attributes"] = attributes
+            lines.append(json.dumps(record, separators=(",", ":")))
+        self._buffer.clear()
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+
+    def close(self):
+        """Flush and close the file, disabling the tracer."""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+            atexit.unregister(self.close)
+        self.enabled = False
+        self._buffer.clear()
+        self._open.clear()
+        self._waiting.clear()
+
+
+DEFAULT = Tracer()
+
+
+def load(path):
+    """Spans in a trace file.
+
+    :return: Spans, in file order
+    :rtype: list
+    """
+    spans = []
+    with open(path) as trace_file:
+        for line in trace_file:
+            if line.strip():
+                record = json.loads(line)
+                spans.append(Span(record["trace"], record["span"], record["start"], record["end"],
+                                  record.get("attributes", {})))
+    return spans
+
+
+def _percentile(ordered, fraction):
+    """Nearest-rank percentile of a sorted list."""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _stats(durations, slo_ms):
+    ordered = sorted(durations)
+    histogram = [0] * (len(BUCKETS_MS) + 1)
+    for duration in ordered:
+        histogram[bisect.bisect_left(BUCKETS_MS, duration)] += 1
+    over = sum(1 for duration in ordered if duration > slo_ms) if slo_ms is not None else 0
+    return Stats(len(ordered), sum(ordered) / len(ordered), _percentile(ordered, 0.50), _percentile(ordered, 0.95),
+                 _percentile(ordered, 0.99), ordered[-1], over, histogram)
+
+
+def summarize(spans, slo_ms=None):
+    """Latency statistics, in milliseconds, per span name and end to end.
+
+    End to end runs from command receipt to the end of the render that displayed the result, for traces that reached
+    a render. When renders are manual, as in the HMI, this includes the wait before the operator asked for one.
+
+    :param spans: Spans, e.g. from load()
+    :param slo_ms: Latency objective; counts end-to-end traces over it
+
+    :return: Span name -> Stats, with END_TO_END last
+    :rtype: dict
+    """
+    durations = collections.defaultdict(list)
+    bounds = {}
+    rendered = set()
+    for span in spans:
+        durations[span.name].append((span.end - span.start) / 1e6)
+        start, end = bounds.get(span.trace, (span.start, span.end))
+        bounds[span.trace] = (min(start, span.start), max(end, span.end))
+        if span.name == "render":
+            rendered.add(span.trace)
+    end_to_end = [(bounds[trace][1] - bounds[trace][0]) / 1e6 for trace in rendered]
+    names = [name for name in SPANS if name in durations] + sorted(set(durations) - set(SPANS))
+    summary = {name: _stats(durations[name], None) for name in names}
+    if end_to_end:
+        summary[END_TO_END] = _stats(end_to_end, slo_ms)
+    return summary
+
+
+def format_summary(summary, slo_ms=None, width=40):
+    """Text report with a table of percentiles and an end-to-end histogram."""
+    lines = ["{:<12}{:>8}{:>10}{:>10}{:>10}{:>10}{:>10}".format("span", "count", "mean", "p50", "p95", "p99", "max")]
+    for name, stats in summary.items():
+        lines.append("{:<12}{:>8}{:>10.3f}{:>10.3f}{:>10.3f}{:>10.3f}{:>10.3f}".format(
+            name, stats.count, stats.mean, stats.p50, stats.p95, stats.p99, stats.maximum))
+    stats = summary.get(END_TO_END)
+    if stats is not None:
+        lines.append("")
+        lines.append("End-to-end latency (ms)")
+        peak = max(stats.histogram) or 1
+        labels = ["<= {:g}".format(bound) for bound in BUCKETS_MS] + ["> {:g}".format(BUCKETS_MS[-1])]
+        for label, count in zip(labels, stats.histogram):
+            lines.append("{:>10} {:>8} {}".format(label, count, "#" * int(round(width * count / peak))))
+        if slo_ms is not None:
+            lines.append("")
+            lines.append("{} of {} traces over the {:g} ms objective".format(stats.over_slo, stats.count, slo_ms))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize VirtualPLC command latency traces.")
+    parser.add_argument("path", help="Trace file written by Tracer")
+    parser.add_argument("--slo", type=float, metavar="MS", help="Exit with status 1 if any trace exceeds this latency")
+    args = parser.parse_args(argv)
+
+    summary = summarize(load(args.path), args.slo)
+    if not summary:
+        print("No spans in {}".format(args.path))
+        return 0
+    print(format_summary(summary, args.slo))
+    stats = summary.get(END_TO_END)
+    return 1 if stats is not None and stats.over_slo else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
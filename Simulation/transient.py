@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC transient.py
+
+Purpose: Water hammer analysis of a single pipe by the method of characteristics.
+
+The pipe is split into equal reaches and stepped at the Courant limit (time step = reach length / wave speed), so the
+characteristic lines run exactly through the grid points and no interpolation is needed. Each step updates every
+interior node at once with list comprehensions over the shifted head and flow lists, then applies the boundary at
+each end. Units are imperial: feet, seconds, and cubic feet per second internally; flows are given in gpm.
+
+Column separation is not modeled: heads that fall below vapor pressure are reported as computed.
+
+Classes:
+    Pipe: Pipe geometry, wave speed, and friction
+    Reservoir: Constant-head boundary, upstream or downstream
+    PumpTrip: Upstream positive displacement pump whose flow runs down with its speed
+    ValveClosure: Downstream valve closing over time
+    WaterHammer: Solver
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import collections
+import math
+
+from utility_formulas import GRAVITY, head_to_press
+from PipingSystems.valve.valve import FLOW_CHARACTERISTICS
+
+GPM_PER_CFS = 448.831
+
+TransientResult = collections.namedtuple("TransientResult", "times heads flows head_max head_min")
+
+
+class Pipe:
+    """Uniform pipe between two boundaries."""
+    def __init__(self, length, diameter, wave_speed=4000.0, friction=0.02, reaches=100):
+        """Describe the pipe.
+
+        :param length: Pipe length, in feet
+        :param diameter: Inside diameter, in inches
+        :param wave_speed: Pressure wave speed, in ft/s
+        :param friction: Darcy friction factor
+        :param reaches: Number of computational reaches; the grid has one more node
+
+        :except ValueError: Non-positive dimensions or fewer than 2 reaches
+        """
+        if length <= 0 or diameter <= 0 or wave_speed <= 0:
+            raise ValueError("Pipe length, diameter, and wave speed must be positive.")
+        if reaches < 2:
+            raise ValueError("Pipe needs at least 2 reaches.")
+        self.length = length
+        self.diameter = diameter
+        self.wave_speed = wave_speed
+        self.friction = friction
+        self.reaches = reaches
+        self.area = math.pi * (diameter / 12) ** 2 / 4  # ft^2
+        self.dx = length / reaches
+        self.dt = self.dx / wave_speed
+        self.impedance = wave_speed / (GRAVITY * self.area)  # B
+        self.resistance = friction * self.dx / (2 * GRAVITY * (diameter / 12) * self.area ** 2)  # R
+
+    def joukowsky(self, flow):
+        """Head rise from instantly stopping a flow, in feet.
+
+        :param flow: Flow rate, in gpm
+        """
+        return self.impedance * flow / GPM_PER_CFS
+
+
+class Reservoir:
+    """Constant head at either end of the pipe."""
+    def __init__(self, head):
+        """:param head: Hydraulic head, in feet"""
+        self.head = head
+
+    def start(self, head, flow):
+        pass
+
+    def upstream(self, time, cm, impedance):
+        return self.head, (self.head - cm) / impedance
+
+    def downstream(self, time, cp, impedance):
+        return self.head, (cp - self.head) / impedance
+
+
+class PumpTrip:
+    """Positive displacement pump feeding the upstream end.
+
+    Flow is proportional to speed, so when the pump trips its flow runs down linearly to zero over the rundown time.
+    The discharge check valve stops any reverse flow.
+    """
+    def __init__(self, head, trip_time=0.0, rundown=1.0):
+        """Describe the pump.
+
+        :param head: Steady discharge head, in feet
+        :param trip_time: Time the pump trips, in seconds
+        :param rundown: Time for the pump to stop after tripping, in seconds
+        """
+        self.head = head
+        self.trip_time = trip_time
+        self.rundown = rundown
+        self.flow = 0.0
+
+    def start(self, head, flow):
+        self.flow = flow
+
+    def speed_ratio(self, time):
+        """Fraction of the running speed at a given time."""
+        if time <= self.trip_time:
+            return 1.0
+        if self.rundown <= 0:
+            return 0.0
+        return max(0.0, 1.0 - (time - self.trip_time) / self.rundown)
+
+    def upstream(self, time, cm, impedance):
+        flow = max(0.0, self.flow * self.speed_ratio(time))
+        return cm + impedance * flow, flow
+
+
+class ValveClosure:
+    """Valve discharging to a constant tail head, stroking closed at a constant rate."""
+    def __init__(self, closure_time, start_time=0.0, tail_head=0.0, characteristic="linear"):
+        """Describe the closure.
+
+        :param closure_time: Stroke time from fully open to closed, in seconds; 0 for an instant closure
+        :param start_time: Time the valve starts to close, in seconds
+        :param tail_head: Head downstream of the valve, in feet
+        :param characteristic: Flow characteristic name from PipingSystems.valve.valve.FLOW_CHARACTERISTICS
+
+        :except ValueError: Unknown characteristic
+        """
+        if characteristic not in FLOW_CHARACTERISTICS:
+            raise ValueError("Unknown flow characteristic: {}".format(characteristic))
+        self.closure_time = closure_time
+        self.start_time = start_time
+        self.tail_head = tail_head
+        self.table = FLOW_CHARACTERISTICS[characteristic]
+        self.coeff = 0.0
+
+    def start(self, head, flow):
+        drop = head - self.tail_head
+        if drop <= 0:
+            raise ValueError("Valve must have a positive steady head drop.")
+        self.coeff = flow / math.sqrt(drop)  # Flow per root foot of head drop, fully open
+
+    def position(self, time):
+        """Percent open at a given time."""
+        if time <= self.start_time:
+            return 100.0
+        if self.closure_time <= 0:
+            return 0.0
+        return max(0.0, 100.0 * (1.0 - (time - self.start_time) / self.closure_time))
+
+    def opening(self, time):
+        """Fraction of the fully open flow coefficient at a given time, interpolated from the characteristic table."""
+        position = self.position(time)
+        low = int(position)
+        if low >= 100:
+            return self.table[100]
+        return self.table[low] + (self.table[low + 1] - self.table[low]) * (position - low)
+
+    def downstream(self, time, cp, impedance):
+        # Q|Q| = k(HP - tail) with HP = CP - BQ
+        k = (self.coeff * self.opening(time)) ** 2
+        if k == 0.0:
+            return cp, 0.0
+        kb = k * impedance
+        drive = cp - self.tail_head
+        if drive >= 0:
+            flow = (-kb + math.sqrt(kb * kb + 4 * k * drive)) / 2
+        else:
+            flow = (kb - math.sqrt(kb * kb - 4 * k * drive)) / 2
+        return cp - impedance * flow, flow
+
+
+class WaterHammer:
+    """Method of characteristics solver for one pipe.
+
+    Methods: step(), run(), pressure_envelope()
+    """
+    def __init__(self, pipe, upstream, downstream, flow):
+        """Set up the steady initial state.
+
+        :param pipe: Pipe
+        :param upstream: Reservoir or PumpTrip at node 0
+        :param downstream: Reservoir or ValveClosure at the last node
+        :param flow: Steady flow rate, in gpm
+        """
+        self.pipe = pipe
+        self.upstream = upstream
+        self.downstream = downstream
+        self.time = 0.0
+        flow_cfs = flow / GPM_PER_CFS
+        loss = pipe.resistance * flow_cfs * abs(flow_cfs)  # Friction loss per reach
+        self.heads = [upstream.head - loss * node for node in range(pipe.reaches + 1)]
+        self.flows = [flow_cfs] * (pipe.reaches + 1)
+        self.head_max = list(self.heads)
+        self.head_min = list(self.heads)
+        upstream.start(self.heads[0], flow_cfs)
+        downstream.start(self.heads[-1], flow_cfs)
+
+    def step(self):
+        """Advance one time step."""
+        pipe = self.pipe
+        b = pipe.impedance
+        r = pipe.resistance
+        heads = self.heads
+        flows = self.flows
+        self.time += pipe.dt
+        # C+ from each node but the last, C- from each node but the first
+        cp = [h + b * q - r * q * abs(q) for h, q in zip(heads[:-1], flows[:-1])]
+        cm = [h - b * q + r * q * abs(q) for h, q in zip(heads[1:], flows[1:])]
+        half_b = 0.5 / b
+        new_heads = [(p + m) * 0.5 for p, m in zip(cp[:-1], cm[1:])]
+        new_flows = [(p - m) * half_b for p, m in zip(cp[:-1], cm[1:])]
+        head_up, flow_up = self.upstream.upstream(self.time, cm[0], b)
+        head_down, flow_down = self.downstream.downstream(self.time, cp[-1], b)
+        self.heads = [head_up] + new_heads + [head_down]
+        self.flows = [flow_up] + new_flows + [flow_down]
+        self.head_max = [h if h > m else m for h, m in zip(self.heads, self.head_max)]
+        self.head_min = [h if h < m else m for h, m in zip(self.heads, self.head_min)]
+
+    def run(self, duration, probes=(-1,)):
+        """Step through a transient.
+
+        :param duration: Simulated time, in seconds
+        :param probes: Node indices whose head and flow are recorded every step; the valve end by default
+
+        :return: Times, {probe: heads in feet}, {probe: flows in gpm}, and the max/min head envelopes over all nodes
+        :rtype: TransientResult
+        """
+        steps = int(round(duration / self.pipe.dt))
+        times = [self.time]
+        heads = {probe: [self.heads[probe]] for probe in probes}
+        flows = {probe: [self.flows[probe] * GPM_PER_CFS] for probe in probes}
+        for _ in range(steps):
+            self.step()
+            times.append(self.time)
+            for probe in probes:
+                heads[probe].append(self.heads[probe])
+                flows[probe].append(self.flows[probe] * GPM_PER_CFS)
+        return TransientResult(times, heads, flows, self.head_max, self.head_min)
+
+    def pressure_envelope(self, spec_grav=1.0):
+        """Max and min pressure seen at each node so far, in psi.
+
+        :return: (max pressures, min pressures)
+        :rtype: tuple
+        """
+        return ([head_to_press(head, spec_grav) for head in self.head_max],
+                [head_to_press(head, spec_grav) for head in self.head_min])
+
+
+if __name__ == "__main__":
+    import time
+
+    line = Pipe(5000.0, 16, reaches=1000)
+    solver = WaterHammer(line, Reservoir(1500.0), ValveClosure(closure_time=1.0), flow=19500)
+    start = time.perf_counter()
+    result = solver.run(5.0)
+    print("{} nodes, {} steps in {:.2f} s".format(line.reaches + 1, len(result.times) - 1,
+                                                   time.perf_counter() - start))
+    print("Joukowsky rise {:.0f} ft, peak head at valve {:.0f} ft".format(line.joukowsky(19500),
+                                                                         max(result.heads[-1])))
+    print("Peak pressure {:.0f} psi".format(max(solver.pressure_envelope(0.84)[0])))
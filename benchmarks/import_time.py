@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC import_time.py
+
+Purpose: Report how long the entry-point modules take to import, to catch startup regressions.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --module Models.FuelFarm.functionality --top 10 --budget 50
+
+Each module is imported in a fresh interpreter with -X importtime. Modules the interpreter loads before running any code
+(site, encodings, ...) are measured separately and left out, so the total is what importing the module itself costs.
+The best of several runs is kept. Exit status is 1 if a module is over the budget.
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import argparse
+import collections
+import os
+import subprocess
+import sys
+
+ENTRY_POINTS = [
+    "Models.FuelFarm.components",
+    "Models.FuelFarm.functionality",
+    "Models.FuelFarm.interlocks",
+    "Models.FuelFarm.hmi.terminal",
+    "Models.FuelFarm.hmi.hmilayout",
+    "Simulation.monte_carlo",
+    "Simulation.metrics",
+    "benchmarks.runner",
+]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ImportRecord = collections.namedtuple("ImportRecord", "name self_us cumulative_us depth")
+ImportReport = collections.namedtuple("ImportReport", "module total_us records error")
+
+
+def parse(output):
+    """Parse -X importtime output.
+
+    :param output: Interpreter stderr
+
+    :return: One record per imported module, in the order reported (children before parents)
+    :rtype: list
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Column header
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append(ImportRecord(stripped, int(fields[0]), int(fields[1]), depth))
+    return records
+
+
+def _import_records(code, python):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run([python, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    return result.returncode, parse(result.stderr), result.stderr
+
+
+def measure(module, repeat=3, python=sys.executable):
+    """Time importing a module in fresh interpreters.
+
+    :param module: Dotted module name
+    :param repeat: Number of runs; the fastest is kept
+    :param python: Interpreter to run
+
+    :return: Total import time in microseconds, the records of the fastest run, and the error if the import failed
+    :rtype: ImportReport
+    """
+    _, startup, _ = _import_records("pass", python)
+    preloaded = {record.name for record in startup}
+    best = None
+    for _ in range(repeat):
+        status, records, stderr = _import_records("import {}".format(module), python)
+        if status != 0:
+            return ImportReport(module, None, [], stderr.strip().splitlines()[-1])
+        records = [record for record in records if record.name not in preloaded]
+        total = sum(record.cumulative_us for record in records if record.depth == 0)
+        if best is None or total < best.total_us:
+            best = ImportReport(module, total, records, None)
+    return best
+
+
+def format_report(reports, top=5):
+    """Format import totals and the heaviest modules under each entry point."""
+    lines = ["{:<40} {:>10}".format("Module", "Import ms")]
+    for report in reports:
+        if report.error is not None:
+            lines.append("{:<40} {:>10}  {}".format(report.module, "failed", report.error))
+            continue
+        lines.append("{:<40} {:>10.1f}".format(report.module, report.total_us / 1000))
+        for record in sorted(report.records, key=lambda record: record.self_us, reverse=True)[:top]:
+            lines.append("    {:<36} {:>10.1f}".format(record.name, record.self_us / 1000))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import times of the VirtualPLC entry points.")
+    parser.add_argument("--module", action="append", help="Module to measure; may be repeated (default: entry points)")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports listed per module")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, metavar="MS", help="Fail if any module takes longer to import")
+    args = parser.parse_args(argv)
+
+    reports = [measure(module, args.repeat) for module in args.module or ENTRY_POINTS]
+    print(format_report(reports, args.top))
+    if args.budget is not None:
+        over = [report for report in reports if report.error is None and report.total_us > args.budget * 1000]
+        if over:
+            print()
+            print("Over budget: {}".format(", ".join(report.module for report in over)))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC memory.py
+
+Purpose: Track the FuelFarm model's memory per component type against a stored baseline.
+
+Usage:
+    python -m benchmarks.memory --save benchmarks/memory_baseline.json
+    python -m benchmarks.memory --compare benchmarks/memory_baseline.json --threshold 0.05
+
+Bytes are counted by Simulation.memory_report, which is deterministic for a given Python version, so a small
+threshold is enough. Baselines use the same file format as benchmarks.runner. Exit status is 1 if anything grew by
+more than the threshold.
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import argparse
+import sys
+
+from benchmarks.runner import compare, load_baseline, save_baseline
+from Simulation.memory_report import format_report, measure
+
+DEFAULT_THRESHOLD = 0.05
+
+
+def run(model=None):
+    """Bytes per instance of each component class and the model total.
+
+    :param model: Model to measure; a new FuelFarm by default
+
+    :rtype: dict
+    """
+    if model is None:
+        from Models.FuelFarm.factory import FuelFarm
+        model = FuelFarm.new()
+    return measure(model).as_dict()
+
+
+def format_comparison(report):
+    """Format a comparison from benchmarks.runner.compare() as a table of bytes."""
+    lines = ["{:<40} {:>12} {:>12} {:>8}".format("Measure", "Baseline", "Current", "Change")]
+    for name, previous, current, change, regressed in report:
+        lines.append("{:<40} {:>10.1f} B {:>10.1f} B {:>+7.1%}{}".format(
+            name, previous, current, change, "  REGRESSION" if regressed else ""))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the VirtualPLC model's memory per component type.")
+    parser.add_argument("--save", metavar="PATH", help="Write the results to a baseline file")
+    parser.add_argument("--compare", metavar="PATH", help="Compare the results with a baseline file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed growth as a fraction of the baseline (default %(default)s)")
+    parser.add_argument("--target", type=int, default=100000, help="Component count to project the total to")
+    args = parser.parse_args(argv)
+
+    from Models.FuelFarm.factory import FuelFarm
+    report = measure(FuelFarm.new())
+    print(format_report(report, args.target))
+    results = report.as_dict()
+
+    if args.save:
+        save_baseline(results, args.save)
+    if args.compare:
+        comparison = compare(results, load_baseline(args.compare), args.threshold)
+        print()
+        print(format_comparison(comparison))
+        if any(item[4] for item in comparison):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC runner.py
+
+Purpose: Run the microbenchmark suite, store a baseline, and flag regressions against it.
+
+Usage:
+    python -m benchmarks.runner --save benchmarks/baseline.json
+    python -m benchmarks.runner --compare benchmarks/baseline.json --threshold 0.25
+
+Each benchmark is timed with timeit: the loop count is calibrated to about 0.2 s, the measurement repeated, and the best
+time per call kept, as it is the least affected by other load on the machine. A benchmark regresses when its time per
+call exceeds the baseline by more than the threshold fraction. Exit status is 1 if anything regressed.
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import argparse
+import fnmatch
+import json
+import platform
+import sys
+import timeit
+
+from benchmarks.suite import BENCHMARKS
+
+DEFAULT_THRESHOLD = 0.25
+
+
+def run(names=None, repeat=5, min_time=0.2):
+    """Time the selected benchmarks.
+
+    :param names: Benchmark names; all by default
+    :param repeat: Number of measurements per benchmark
+    :param min_time: Minimum duration of each measurement, in seconds
+
+    :return: Benchmark name -> seconds per call; None for benchmarks that couldn't run
+    :rtype: dict
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        func = BENCHMARKS[name]()
+        if func is None:
+            results[name] = None
+            continue
+        timer = timeit.Timer(func)
+        number = 1
+        while timer.timeit(number) < min_time and number < 10 ** 8:
+            number *= 10
+        results[name] = min(timer.repeat(repeat, number)) / number
+    return results
+
+
+def save_baseline(results, path):
+    """Write results to a baseline JSON file."""
+    data = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    with open(path, "w") as baseline:
+        json.dump(data, baseline, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    """Read the results from a baseline JSON file."""
+    with open(path) as baseline:
+        return json.load(baseline)["results"]
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, thresholds=None):
+    """Compare results with a baseline.
+
+    :param results: Benchmark name -> seconds per call
+    :param baseline: Baseline results in the same form
+    :param threshold: Allowed slowdown as a fraction of the baseline, e.g. 0.25 for 25%
+    :param thresholds: Per-benchmark overrides of the threshold
+
+    :return: (name, baseline time, current time, relative change, regressed) for benchmarks present in both
+    :rtype: list
+    """
+    thresholds = thresholds or {}
+    report = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if current is None or previous is None:
+            continue
+        change = (current - previous) / previous
+        report.append((name, previous, current, change, change > thresholds.get(name, threshold)))
+    return report
+
+
+def format_report(report):
+    """Format a comparison as a table."""
+    lines = ["{:<40} {:>12} {:>12} {:>8}".format("Benchmark", "Baseline", "Current", "Change")]
+    for name, previous, current, change, regressed in report:
+        lines.append("{:<40} {:>10.3f}us {:>10.3f}us {:>+7.1%}{}".format(
+            name, previous * 1e6, current * 1e6, change, "  REGRESSION" if regressed else ""))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the VirtualPLC microbenchmarks.")
+    parser.add_argument("--filter", default="*", help="Only run benchmarks matching this glob pattern")
+    parser.add_argument("--save", metavar="PATH", help="Write the results to a baseline file")
+    parser.add_argument("--compare", metavar="PATH", help="Compare the results with a baseline file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction of the baseline (default %(default)s)")
+    parser.add_argument("--limit", action="append", default=[], metavar="NAME=FRACTION",
+                        help="Per-benchmark threshold; may be repeated")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    names = fnmatch.filter(BENCHMARKS, args.filter)
+    results = run(names, args.repeat, args.min_time)
+    for name, seconds in results.items():
+        print("{:<40} {}".format(name, "skipped" if seconds is None else "{:.3f}us".format(seconds * 1e6)))
+
+    if args.save:
+        save_baseline(results, args.save)
+    if args.compare:
+        thresholds = {name: float(value) for name, value in (limit.split("=") for limit in args.limit)}
+        report = compare(results, load_baseline(args.compare), args.threshold, thresholds)
+        print()
+        print(format_report(report))
+        if any(item[4] for item in report):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
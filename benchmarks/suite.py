@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+VirtualPLC suite.py
+
+Purpose: Hot-path microbenchmarks for the piping components and the FuelFarm model.
+
+Each benchmark is a factory that does its setup and returns the zero-argument callable to be timed, or None when the
+benchmark can't run here. FuelFarm benchmarks install a fresh model in their setup, so their results don't depend on
+what ran before them. The HMI benchmark uses the headless Kivy stand-ins when Kivy isn't installed.
+
+Date: 10/18/26
+#################################
+Version 0.1
+    Initial build
+"""
+import itertools
+import types
+
+import utility_formulas
+from PipingSystems.pump.pump import CentrifPump
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Valve
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a benchmark factory under a name."""
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+# Utility formulas
+@benchmark("utility_formulas.gravity_flow_rate")
+def bench_gravity_flow_rate():
+    return lambda: utility_formulas.gravity_flow_rate(16, 0.25)
+
+
+@benchmark("utility_formulas.static_press")
+def bench_static_press():
+    return lambda: utility_formulas.static_press(36.0, 1.629869)
+
+
+@benchmark("utility_formulas.press_to_head")
+def bench_press_to_head():
+    return lambda: utility_formulas.press_to_head(13.1)
+
+
+@benchmark("utility_formulas.head_to_press")
+def bench_head_to_press():
+    return lambda: utility_formulas.head_to_press(30.2)
+
+
+# Components
+@benchmark("Valve.press_drop")
+def bench_press_drop():
+    valve = Valve("Valve", flow_coeff=3840, sys_flow_in=19542.9, sys_flow_out=19542.9)
+    return lambda: valve.press_drop(valve.flow_out)
+
+
+@benchmark("Valve.get_press_out")
+def bench_get_press_out():
+    valve = Valve("Valve", flow_coeff=3840, sys_flow_in=19542.9, sys_flow_out=19542.9, press_in=13.1)
+    return lambda: valve.get_press_out(13.1)
+
+
+@benchmark("CentrifPump.adjust_speed")
+def bench_adjust_speed():
+    pump = CentrifPump("Pump", 75, 12, 25, 125)
+    speeds = itertools.cycle([100, 125])
+    return lambda: pump.adjust_speed(next(speeds))
+
+
+@benchmark("Tank.level")
+def bench_tank_level():
+    tank = Tank("Tank", level=36.0, fluid_density=1.629869, outlet_diam=16, outlet_slope=0.25)
+    levels = itertools.cycle([36.0, 18.0])
+
+    def assign():
+        tank.level = next(levels)
+    return assign
+
+
+# FuelFarm functionality
+def _fresh_farm():
+    """Install a farm in the initial state for one benchmark."""
+    from Models.FuelFarm.factory import FuelFarm
+    FuelFarm.new().install()
+
+
+def _functionality_factory(name):
+    def factory():
+        import Models.FuelFarm.functionality as fff
+        _fresh_farm()
+        return getattr(fff, name)
+    return factory
+
+
+for _n in range(1, 11):
+    benchmark("functionality.gate{}_open".format(_n))(_functionality_factory("gate{}_open".format(_n)))
+    benchmark("functionality.gate{}_close".format(_n))(_functionality_factory("gate{}_close".format(_n)))
+for _n in range(1, 4):
+    benchmark("functionality.pump{}_on".format(_n))(_functionality_factory("pump{}_on".format(_n)))
+    benchmark("functionality.pump{}_off".format(_n))(_functionality_factory("pump{}_off".format(_n)))
+
+
+@benchmark("functionality.change_tank_level")
+def bench_change_tank_level():
+    import Models.FuelFarm.components as ffc
+    import Models.FuelFarm.functionality as fff
+    _fresh_farm()
+    levels = itertools.cycle([36.0, 18.0])
+    return lambda: fff.change_tank_level(ffc.tank1, next(levels))
+
+
+# Gate/pump cycle: the same lineups over and over
+CYCLE = ["gate1_open", "gate3_open", "gate5_open", "pump1_on", "pump1_off", "gate5_close", "gate3_close", "gate1_close"]
+
+
+@benchmark("functionality.lineup_cycle")
+def bench_lineup_cycle():
+    import Models.FuelFarm.functionality as fff
+    _fresh_farm()
+    actions = [getattr(fff, name) for name in CYCLE]
+
+    def cycle():
+        for action in actions:
+            action()
+    return cycle
+
+
+# HMI
+@benchmark("HMILayout.populate")
+def bench_populate():
+    """Call populate() on a headless stand-in that only provides the table it writes to.
+
+    The registry is built before timing, so only the table population is measured.
+    """
+    from Models.FuelFarm.hmi import headless
+    headless.install()
+    import Models.FuelFarm.hmi.hmilayout as hmilayout
+    _fresh_farm()
+    hmilayout.current_registry()
+    stub = types.SimpleNamespace(table=types.SimpleNamespace(data=[]))
+    return lambda: hmilayout.HMILayout.populate(stub)
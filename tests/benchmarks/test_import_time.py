@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+from benchmarks.import_time import ROOT, format_report, measure, parse
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     PipingSystems.valve
+import time:       300 |        420 |   PipingSystems.valve.valve
+import time:        50 |        470 | Models.FuelFarm.components
+"""
+
+
+class TestParse:
+    def test_records(self):
+        records = parse(SAMPLE)
+        assert [(r.name, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+            ("PipingSystems.valve", 120, 120, 2), ("PipingSystems.valve.valve", 300, 420, 1),
+            ("Models.FuelFarm.components", 50, 470, 0)]
+
+
+class TestMeasure:
+    def test_module(self):
+        report = measure("utility_formulas", repeat=1)
+        assert report.error is None
+        assert report.total_us > 0
+        assert "utility_formulas" in [record.name for record in report.records]
+        assert "encodings" not in [record.name for record in report.records]  # Interpreter startup excluded
+
+    def test_failed_import(self):
+        report = measure("no_such_module", repeat=1)
+        assert report.error == "ModuleNotFoundError: No module named 'no_such_module'"
+        assert "failed" in format_report([report])
+
+
+class TestLazyStartup:
+    def test_components_built_on_first_use(self):
+        code = ("import sys, Models.FuelFarm.functionality\n"
+                "ffc = sys.modules['Models.FuelFarm.components']\n"
+                "print('tank1' in vars(ffc))\n"
+                "print(ffc.gate3.name, 'tank1' in vars(ffc))\n"
+                "print('concurrent.futures' in sys.modules)\n")
+        output = subprocess.run([sys.executable, "-c", "import Simulation.monte_carlo\n" + code], cwd=ROOT,
+                                stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout
+        assert output.splitlines() == ["False", "Gate valve 3 True", "False"]
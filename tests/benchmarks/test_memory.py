@@ -0,0 +1,17 @@
+from benchmarks import memory, runner
+
+
+class TestMemoryBenchmark:
+    def test_run(self):
+        results = memory.run()
+        assert results["memory.total"] > 0
+        assert results["memory.Gate"] > 0
+
+    def test_main_exit_status(self, tmp_path, capsys):
+        path = str(tmp_path / "memory.json")
+        assert memory.main(["--save", path]) == 0
+        assert memory.main(["--compare", path]) == 0
+        baseline = runner.load_baseline(path)
+        runner.save_baseline({name: value / 2 for name, value in baseline.items()}, path)
+        assert memory.main(["--compare", path]) == 1
+        assert "REGRESSION" in capsys.readouterr().out
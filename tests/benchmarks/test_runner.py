@@ -0,0 +1,58 @@
+from benchmarks import runner
+from benchmarks.suite import BENCHMARKS
+
+
+class TestCompare:
+    def test_regression_flagged(self):
+        report = runner.compare({"a": 1.3e-6, "b": 1.0e-6}, {"a": 1.0e-6, "b": 1.0e-6}, threshold=0.25)
+        assert [(name, regressed) for name, _, _, _, regressed in report] == [("a", True), ("b", False)]
+
+    def test_per_benchmark_threshold(self):
+        report = runner.compare({"a": 1.3e-6}, {"a": 1.0e-6}, threshold=0.25, thresholds={"a": 0.5})
+        assert report[0][4] is False
+
+    def test_missing_and_skipped(self):
+        report = runner.compare({"a": None, "new": 1.0e-6}, {"a": 1.0e-6})
+        assert report == []
+
+
+class TestBaseline:
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "baseline.json")
+        runner.save_baseline({"a": 1.0e-6, "b": None}, path)
+        assert runner.load_baseline(path) == {"a": 1.0e-6, "b": None}
+
+
+class TestRun:
+    def test_suite_covers_hot_paths(self):
+        for name in ["utility_formulas.gravity_flow_rate", "Valve.press_drop", "Valve.get_press_out",
+                     "CentrifPump.adjust_speed", "Tank.level", "functionality.gate3_open", "functionality.pump2_on",
+                     "functionality.change_tank_level", "HMILayout.populate"]:
+            assert name in BENCHMARKS
+
+    def test_run(self):
+        results = runner.run(["utility_formulas.static_press", "Tank.level"], repeat=1, min_time=0.001)
+        assert all(seconds > 0 for seconds in results.values())
+
+    def test_cycle(self):
+        results = runner.run(["functionality.lineup_cycle"], repeat=1, min_time=0.001)
+        assert results["functionality.lineup_cycle"] > 0
+
+    def test_hmi_headless(self):
+        results = runner.run(["HMILayout.populate"], repeat=1, min_time=0.001)
+        assert results["HMILayout.populate"] > 0
+
+    def test_fresh_model(self):
+        import Models.FuelFarm.components as ffc
+        runner.run(["functionality.gate3_open"], repeat=1, min_time=0.001)
+        opened = ffc.gate3
+        BENCHMARKS["functionality.gate3_close"]()
+        assert ffc.gate3 is not opened
+        assert ffc.gate3.position == 0
+
+    def test_main_exit_status(self, tmp_path):
+        path = str(tmp_path / "baseline.json")
+        runner.save_baseline({"utility_formulas.static_press": 1e-12}, path)
+        status = runner.main(["--filter", "utility_formulas.static_press", "--compare", path, "--repeat", "1",
+                              "--min-time", "0.001"])
+        assert status == 1
@@ -0,0 +1,14 @@
+"""Every FuelFarm test starts from a freshly installed model, so the tests don't depend on each other and can be
+distributed one at a time, e.g. with pytest-xdist's --dist load. The walkthroughs in tests/piping build their
+components once per module and check them step by step, so a parallel run of the whole suite needs --dist loadscope.
+"""
+import pytest
+from Models.FuelFarm.factory import FuelFarm
+
+
+@pytest.fixture(autouse=True)
+def fuel_farm():
+    """Fresh FuelFarm installed for each test, before its setup_method runs."""
+    farm = FuelFarm.new()
+    farm.install()
+    return farm
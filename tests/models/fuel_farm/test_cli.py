@@ -0,0 +1,207 @@
+import io
+import tracemalloc
+
+import pytest
+import Models.FuelFarm.components as ffc
+from Models.FuelFarm.cli import (BinaryWriter, CSVWriter, columns, farm_layout, main, parse, read_binary, run,
+                                 validate)
+
+SCENARIO = """# Tank 1 through gate 5 to pump 1
+0    gate1_open
+0    gate3_open
+0    gate5_open
+1.5  pump1_on   # Between rows
+3    level tank1 20
+"""
+
+
+class CountingWriter:
+    def __init__(self):
+        self.rows = 0
+        self.last = None
+
+    def write(self, values):
+        self.rows += 1
+        self.last = values
+
+    def close(self):
+        pass
+
+
+class TestParse:
+    def test_commands(self):
+        commands = list(parse(SCENARIO.splitlines()))
+        assert [(command.time, command.action) for command in commands][-2:] == [(1.5, "pump1_on"), (3.0, "level")]
+        assert commands[-1].args == ["tank1", 20.0]
+        assert commands[-1].line == 6
+
+    @pytest.mark.parametrize("line, message", [
+        ("x gate1_open", "Line 1: time must be a number."),
+        ("1", "Line 1: missing command."),
+        ("1 gate1_shut", "Line 1: unknown command 'gate1_shut'."),
+        ("1 gate11_open", "Line 1: unknown command 'gate11_open'."),
+        ("1 level tank3 5", "Line 1: use level <tank1|tank2> <feet>."),
+    ])
+    def test_errors(self, line, message):
+        with pytest.raises(ValueError) as excinfo:
+            list(parse([line]))
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == message
+
+    def test_time_backwards(self):
+        with pytest.raises(ValueError) as excinfo:
+            list(parse(["5 gate1_open", "4 gate1_close"]))
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Line 2: time goes backwards."
+
+
+class TestFarmLayout:
+    def test_fields(self):
+        layout = farm_layout()
+        assert len(layout.names) == 2 * 3 + 10 * 5 + 3 * 4  # The fields of the HMI table
+        assert layout.names[:2] == ("tank1.level", "tank1.static_tank_press")
+        assert "relief1.position" not in layout.index
+
+
+class TestRun:
+    def test_csv(self):
+        stream = io.StringIO()
+        names = ["time"] + [name for name, _, _ in columns()]
+        assert run(parse(SCENARIO.splitlines()), CSVWriter(stream, names)) == 4
+        lines = stream.getvalue().splitlines()
+        assert lines[0].startswith("time,tank1.level,")
+        index = names.index("pump1.speed")
+        assert [line.split(",")[index] for line in lines[1:]] == ["0", "0", "1480", "1480"]
+        assert lines[-1].split(",")[1] == "20.0"
+        assert ffc.tank1.level > 19.9  # Stopped at the last row, not at the next tank event
+
+    def test_binary_round_trip(self):
+        stream = io.BytesIO()
+        names = ["time"] + [name for name, _, _ in columns()]
+        run(parse(SCENARIO.splitlines()), BinaryWriter(stream, names), step=0.5, duration=4)
+        stream.seek(0)
+        read_names, rows = read_binary(stream)
+        rows = list(rows)
+        assert read_names == names
+        assert [row[0] for row in rows] == [0.5 * index for index in range(9)]
+        assert rows[-1][names.index("gate1.position")] == 100.0
+
+    def test_levels_follow_pumps(self):
+        stream = io.StringIO()
+        names = ["time"] + [name for name, _, _ in columns()]
+        run(parse(SCENARIO.splitlines()), CSVWriter(stream, names), step=0.5, duration=5)
+        rows = [line.split(",") for line in stream.getvalue().splitlines()[1:]]
+        level, press = names.index("tank1.level"), names.index("gate1.press_in")
+        levels = [float(row[level]) for row in rows]
+        assert levels[:4] == [36.0] * 4  # Pump 1 starts at 1.5 s
+        assert levels[3] > levels[4] > levels[5]
+        assert levels[6] == 20.0  # Level command at 3 s
+        assert levels[6] > levels[7] > levels[-1]
+        assert levels[4] - levels[5] == pytest.approx(355.2 / ffc.GALLONS_PER_FOOT / 60 * 0.5)
+        assert float(rows[-1][press]) == ffc.tank1.static_tank_press
+        assert float(rows[-1][names.index("tank2.level")]) == 36.0  # Gate 2 never opened
+
+    def test_draw_moves_to_other_tank(self):
+        ffc.tank1.level = 0.001
+        scenario = ["0 gate1_open", "0 gate2_open", "0 gate3_open", "0 gate4_open", "0 gate5_open", "0 pump1_on"]
+        stream = io.StringIO()
+        names = ["time"] + [name for name, _, _ in columns()]
+        run(parse(scenario), CSVWriter(stream, names), step=10, duration=60)
+        last = stream.getvalue().splitlines()[-1].split(",")
+        assert float(last[names.index("tank1.level")]) == 0.0
+        drawn = 36.0 - float(last[names.index("tank2.level")])
+        pumped = 355.2  # One minute of pump 1
+        assert drawn == pytest.approx((pumped - 0.001 * ffc.GALLONS_PER_FOOT) / ffc.GALLONS_PER_FOOT)
+
+    def test_blocked_reported(self):
+        import Models.FuelFarm.interlocks as interlocks
+        engine = interlocks.build_engine()
+        engine.install()
+        messages = io.StringIO()
+        try:
+            run(parse(["0 gate6_close", "2 pump2_on"]), CountingWriter(), interlocks=engine, messages=messages)
+        finally:
+            engine.uninstall()
+        assert messages.getvalue() == "Line 2: Interlock: pump2 cannot run unless gate6 open.\n"
+        assert ffc.pump2.speed == 0
+
+    def test_metrics(self):
+        from Simulation.metrics import SimulationMetrics
+        recorder = SimulationMetrics()
+        rows = run(parse(SCENARIO.splitlines()), CountingWriter(), metrics=recorder)
+        assert recorder.ticks.value >= rows + 5  # Every row and command is a scheduler event
+        assert recorder.sim_time.value == 3.0
+        assert recorder.commands.count == 5
+
+    def test_negative_duration(self):
+        with pytest.raises(ValueError) as excinfo:
+            run(parse(SCENARIO.splitlines()), CountingWriter(), duration=-1)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Duration must not be negative."
+
+    def test_bounded_memory(self):
+        def commands():
+            for index in range(20000):
+                yield "{} {}".format(index, "pump1_on" if index % 2 else "pump1_off")
+        run(parse(["0 pump1_on"]), CountingWriter())  # Imports and caches filled on first use aren't per-row memory
+        writer = CountingWriter()
+        tracemalloc.start()
+        try:
+            run(parse(commands()), writer, step=0.5)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert writer.rows == 39999
+        assert peak < 256 * 1024
+
+    def test_main(self, tmp_path):
+        scenario = tmp_path / "scenario.txt"
+        scenario.write_text(SCENARIO)
+        output = tmp_path / "run.csv"
+        assert main([str(scenario), "--output", str(output), "--interlocks"]) == 0
+        assert len(output.read_text().splitlines()) == 5
+        assert ffc.pump1.speed == 1480  # Fresh farm installed for the run
+
+    def test_main_metrics(self, tmp_path):
+        from Simulation import metrics
+        scenario = tmp_path / "scenario.txt"
+        scenario.write_text(SCENARIO)
+        ticks = metrics.DEFAULT.ticks.value
+        assert main([str(scenario), "--output", str(tmp_path / "run.csv"), "--metrics", "0"]) == 0
+        assert metrics.DEFAULT.ticks.value > ticks
+
+    def test_main_error(self, tmp_path, capsys):
+        scenario = tmp_path / "scenario.txt"
+        scenario.write_text("0 gate1_open\n1 open_everything\n")
+        output = tmp_path / "run.csv"
+        assert main([str(scenario), "--output", str(output)]) == 1
+        assert "Line 2: unknown command" in capsys.readouterr().err
+        assert not output.exists()  # Checked before any output
+
+    def test_main_missing_scenario(self, tmp_path, capsys):
+        assert main([str(tmp_path / "missing.txt"), "--output", str(tmp_path / "run.csv")]) == 1
+        assert capsys.readouterr().err.startswith("error: [Errno 2] No such file or directory")
+
+    def test_validate_unseekable(self):
+        lines = validate(io.StringIO(SCENARIO))
+        assert len(list(parse(lines))) == 5
+        pipe = iter(SCENARIO.splitlines(keepends=True))
+        stream = type("Pipe", (), {"seekable": lambda self: False, "__iter__": lambda self: pipe})()
+        spool = validate(stream)
+        assert hasattr(spool, "fileno")  # Spooled to a temporary file, not held in a list
+        assert len(list(parse(spool))) == 5
+        spool.close()
+
+    @pytest.mark.parametrize("option, value, message", [
+        ("--step", "0", "argument --step: must be positive"),
+        ("--duration", "-1", "argument --duration: must not be negative"),
+        ("--step", "x", "argument --step: must be a number"),
+    ])
+    def test_main_bad_timing(self, tmp_path, capsys, option, value, message):
+        scenario = tmp_path / "scenario.txt"
+        scenario.write_text(SCENARIO)
+        output = tmp_path / "run.csv"
+        with pytest.raises(SystemExit):
+            main([str(scenario), "--output", str(output), option, value])
+        assert message in capsys.readouterr().err
+        assert not output.exists()
@@ -0,0 +1,156 @@
+import math
+
+import pytest
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+from Models.FuelFarm.config_table import FIELDS, STATE_KEYS, ConfigTable, build, solve_lineup
+from Models.FuelFarm.factory import FuelFarm
+
+MASK = 0b111111 | 0b011 << 10  # Gates 1 - 6, pumps 1 and 2; the full table takes several seconds per grid point
+
+
+@pytest.fixture(scope="module")
+def table_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("config_table") / "table.bin"
+    build(str(path), levels1=(0.0, 36.0), levels2=(36.0,), workers=1, mask=MASK)
+    return str(path)
+
+
+def farm_state():
+    return {name: dict(vars(getattr(ffc, name))) for name in ffc.COMPONENTS}
+
+
+def run_direct(names):
+    """State after running the actions on a fresh farm without the table."""
+    saved = FuelFarm({name: getattr(ffc, name) for name in ffc.COMPONENTS})
+    FuelFarm.new().install()
+    try:
+        for name in names:
+            getattr(fff, name)()
+        return farm_state()
+    finally:
+        saved.install()
+
+
+class TestBuild:
+    def test_bad_grid(self, tmp_path):
+        with pytest.raises(ValueError) as excinfo:
+            build(str(tmp_path / "table.bin"), levels1=(36.0, 0.0))
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Grid levels must be strictly ascending."
+
+    def test_masked(self, table_path):
+        with ConfigTable(table_path) as table:
+            assert all(math.isnan(value) for value in table.values(0b1000000, 0, [36.0, 36.0]))  # Gate 7
+            assert not any(math.isnan(value) for value in table.values(0b111111, 0b011, [36.0, 36.0]))
+
+    def test_not_a_table(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\0" * 128)
+        with pytest.raises(ValueError):
+            ConfigTable(str(path))
+
+
+class TestConfigTable:
+    def test_grid(self, table_path):
+        with ConfigTable(table_path) as table:
+            assert (table.levels1, table.levels2) == ([0.0, 36.0], [36.0])
+
+    def test_grid_point_matches_solver(self, table_path):
+        solution = solve_lineup(0b0000010101, 0b001, [0.0, 36.0])
+        expected = [float(solution[name][STATE_KEYS.get(field, field)]) for name, field in FIELDS]
+        with ConfigTable(table_path) as table:
+            assert table.values(0b0000010101, 0b001, [0.0, 36.0]) == expected
+
+    def test_interpolation(self, table_path):
+        with ConfigTable(table_path) as table:
+            low = table.values(0b101, 0b001, [0.0, 36.0])
+            high = table.values(0b101, 0b001, [36.0, 36.0])
+            middle = table.values(0b101, 0b001, [18.0, 20.0])  # Tank 2 clamps to its single level
+            assert middle == pytest.approx([(a + b) / 2 for a, b in zip(low, high)])
+
+    def test_functionality_matches_table(self, table_path):
+        fff.gate1_open()
+        fff.gate3_open()
+        fff.gate5_open()
+        fff.pump1_on()
+        with ConfigTable(table_path) as table:
+            assert table.check(ffc) == []
+
+    def test_apply(self, table_path):
+        with ConfigTable(table_path) as table:
+            table.apply(0b0000101010, 0b010)
+            assert ffc.gate2.position == 100
+            assert ffc.pump2.speed == 1480
+            assert table.check(ffc) == []
+
+    def test_order_sensitive_lineup(self, table_path):
+        saved = FuelFarm({name: getattr(ffc, name) for name in ffc.COMPONENTS})
+        FuelFarm.new().install()
+        try:
+            for action in (fff.gate2_open, fff.gate4_open, fff.gate3_open, fff.gate1_open, fff.gate6_open, fff.pump2_on):
+                action()
+            with ConfigTable(table_path) as table:
+                solution = table.solution(0b0000101111, 0b010, [36.0, 36.0])
+                assert solution["gate6"]["flow_in"] != ffc.gate6.flow_in  # Not the fixed-order result
+                assert table.check(ffc) == []
+                ffc.gate6.flow_in = 1e9
+                assert [difference[:2] for difference in table.check(ffc)] == [("gate6", "flow_in")]
+        finally:
+            saved.install()
+
+    def test_bounds(self, table_path):
+        with ConfigTable(table_path) as table:
+            fixed = table.values(0b0000101111, 0b010, [36.0, 36.0])
+            lowest, highest = table.bounds(0b0000101111, 0b010, [36.0, 36.0])
+            assert all(low <= value <= high for low, value, high in zip(lowest, fixed, highest))
+            assert any(low < high for low, high in zip(lowest, highest))
+            assert table.bounds(0, 0, [36.0, 36.0])[0] == table.values(0, 0, [36.0, 36.0])  # Only one way to get there
+
+
+class TestInstalled:
+    @pytest.fixture(autouse=True)
+    def table(self, table_path):
+        with ConfigTable(table_path) as table:
+            table.install()
+            yield table
+            table.uninstall()
+
+    def test_served(self, table):
+        names = ["gate2_open", "gate4_open", "gate6_open", "pump2_on"]
+        for name in names:
+            getattr(fff, name)()
+        assert table.table_info() == (4, 0)
+        uninstalled = dict(table._originals)
+        table.uninstall()
+        assert farm_state() == run_direct(names)
+        assert fff.gate2_open is uninstalled["gate2_open"]
+
+    def test_fixed_order_continues(self, table):
+        names = ["gate1_open", "gate3_open", "gate5_open", "pump1_on"]
+        for name in names:
+            getattr(fff, name)()
+        assert table.table_info() == (4, 0)
+        table.uninstall()
+        assert farm_state() == run_direct(names)
+
+    def test_order_sensitive(self, table):
+        names = ["gate2_open", "gate4_open", "gate3_open", "gate1_open", "gate6_open", "pump2_on"]
+        for name in names:
+            getattr(fff, name)()
+        table.uninstall()
+        assert farm_state() == run_direct(names)
+        assert table.fallbacks > 0
+
+    def test_closing_falls_back(self, table):
+        names = ["gate1_open", "gate3_open", "gate3_close", "gate5_open", "pump1_on"]
+        for name in names:
+            getattr(fff, name)()
+        table.uninstall()
+        assert farm_state() == run_direct(names)
+        assert table.table_info() == (4, 1)  # Closing gate 3 runs the action, which restores gate 1's fixed-order state
+
+    def test_off_grid(self, table):
+        fff.change_tank_level(ffc.tank2, 30.0)
+        fff.gate2_open()
+        assert table.table_info() == (0, 1)
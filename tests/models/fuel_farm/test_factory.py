@@ -0,0 +1,49 @@
+import pytest
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+from Models.FuelFarm.factory import FuelFarm, clone
+
+
+class TestFuelFarm:
+    def test_fixture_installed(self, fuel_farm):
+        assert ffc.tank1 is fuel_farm.tank1
+        assert ffc.gate1.position == 0
+
+    def test_independent(self):
+        first = FuelFarm.new()
+        second = FuelFarm.new()
+        first.gate1.open()
+        first.tank1.level = 10.0
+        assert second.gate1.position == 0
+        assert second.tank1.level == 36.0
+        assert FuelFarm.template()["tank1"].level == 36.0
+
+    def test_no_reconstruction(self, monkeypatch):
+        FuelFarm.template()
+
+        def fail():
+            raise AssertionError("construct() called")
+        monkeypatch.setattr(ffc, "construct", fail)
+        farm = FuelFarm.new()
+        assert farm.tank1.static_tank_press == FuelFarm.template()["tank1"].static_tank_press
+
+    def test_copy(self):
+        farm = FuelFarm.new()
+        farm.pump1.adjust_speed(1480)
+        copy = farm.copy()
+        farm.pump1.adjust_speed(0)
+        assert copy.pump1.speed == 1480
+        assert type(copy.pump1) is type(farm.pump1)
+
+    def test_install(self):
+        farm = FuelFarm.new()
+        farm.install()
+        fff.gate1_open()
+        assert farm.gate1.position == 100
+        assert farm.gate3.flow_in == farm.gate1.flow_out
+
+    def test_missing(self):
+        with pytest.raises(ValueError) as excinfo:
+            FuelFarm({"tank1": clone(ffc.tank1)})
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg.startswith("Missing components: gate1, gate10")
@@ -0,0 +1,84 @@
+import copy
+import pickle
+
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+from Models.FuelFarm.factory import FuelFarm
+from Models.FuelFarm.fork import fork
+from PipingSystems.valve.valve import Gate
+
+
+class TestFork:
+    def test_what_if(self):
+        fff.gate1_open()
+        what_if = fork()
+        what_if.run(fff.gate3_open)
+        assert what_if.gate3.position == 100
+        assert what_if.gate5.flow_in == what_if.gate1.flow_out
+        assert ffc.gate3.position == 0
+        assert ffc.gate1.position == 100
+        assert set(what_if.changes()) <= {"gate3", "gate5", "gate6", "gate1", "gate2", "gate4"}
+        assert what_if.changes()["gate3"]["_Valve__position"] == 100
+        assert "name" not in what_if.changes()["gate3"]
+
+    def test_live_model_unchanged(self):
+        live = {name: getattr(ffc, name) for name in ffc.COMPONENTS}
+        types = {name: type(component) for name, component in live.items()}
+        position = ffc.gate8.position
+        what_if = fork()
+        what_if.run(fff.gate8_open if position == 0 else fff.gate8_close)
+        for name, component in live.items():
+            assert getattr(ffc, name) is component
+            assert type(component) is types[name]
+            assert type(vars(component)) is dict
+        assert what_if.gate8 is not ffc.gate8
+        assert ffc.gate8.position == position != what_if.gate8.position
+
+    def test_no_write_hook(self):
+        fork().run(fff.gate1_open)
+        assert Gate.__setattr__ is object.__setattr__  # Writes elsewhere in the process cost what they did
+
+    def test_plain_components(self):
+        what_if = fork()
+        what_if.gate1.open()
+        assert type(what_if.gate1) is Gate
+        assert copy.copy(what_if.gate1).position == 100
+        assert pickle.loads(pickle.dumps(what_if.gate1)).position == 100
+
+    def test_live_changes_hidden_from_fork(self):
+        what_if = fork()
+        level = ffc.tank1.level
+        ffc.tank1.level = 5.0
+        assert what_if.tank1.level == level
+
+    def test_many_forks(self):
+        forks = [fork() for _ in range(30)]
+        for number, what_if in enumerate(forks):
+            what_if.pump1.adjust_speed(number)
+        assert [what_if.pump1.speed for what_if in forks] == list(range(30))
+        assert sum(len(what_if._parts) for what_if in forks) == 30  # Untouched components are never built
+
+    def test_later_writes(self):
+        first = fork()
+        level = ffc.tank1.level
+        ffc.tank1.level = level / 2
+        vars(ffc.gate8)["_Valve__position"] = 100
+        second = fork()
+        assert (first.tank1.level, second.tank1.level) == (level, level / 2)
+        assert (first.gate8.position, second.gate8.position) == (0, 100)
+
+    def test_fork_of_fork(self):
+        first = fork()
+        first.gate8.open()
+        second = first.fork()
+        second.gate8.close()
+        assert first.gate8.position == 100
+        assert second.gate8.position == 0
+        assert second._layers["tank1"] is first._layers["tank1"]  # Unused components share the snapshot
+
+    def test_clone_fork_parts(self):
+        what_if = fork()
+        farm = FuelFarm(what_if.parts()).copy()
+        what_if.gate2.open()
+        assert farm.gate2.position == 0
+        assert farm.gate2.name == "Gate valve 2"
@@ -41,8 +41,7 @@ class TestTank:
 
 
 class TestGate1:
-    @classmethod
-    def setup_class(cls):
+    def setup_method(self):
         fff.change_tank_level(ffc.tank1, 36)
         fff.change_tank_level(ffc.tank2, 36)
         fff.gate1_close()
@@ -64,8 +63,7 @@ class TestGate1:
 
 
 class TestGate2:
-    @classmethod
-    def setup_class(cls):
+    def setup_method(self):
         fff.gate2_close()
 
     def test_gate2_closed(self):
@@ -86,8 +84,7 @@ class TestGate2:
 
 
 class TestGate3:
-    @classmethod
-    def setup_class(cls):
+    def setup_method(self):
         fff.gate2_close()
         fff.gate4_close()
         fff.gate1_close()
@@ -203,8 +200,7 @@ class TestGate3:
 
 
 class TestGate4:
-    @classmethod
-    def setup_class(cls):
+    def setup_method(self):
         fff.gate1_close()
         fff.gate2_close()
         fff.gate3_close()
@@ -291,8 +287,7 @@ class TestGate4:
 
 
 class TestGate5:
-    @classmethod
-    def setup_class(cls):
+    def setup_method(self):
         fff.gate1_open()
         fff.gate2_close()
         fff.gate3_close()
@@ -405,8 +400,7 @@ class TestGate5:
 
 
 class TestPump1:
-    @classmethod
-    def setup_class(cls):
+    def setup_method(self):
         fff.gate1_close()
         fff.gate3_close()
         fff.gate5_close()
@@ -448,8 +442,7 @@ class TestPump1:
         assert ffc.pump1.flow == 355.2
         assert ffc.pump1.outlet_pressure == 60.0
 
-    @classmethod
-    def teardown(cls):
+    def teardown_method(self):
         fff.gate1_close()
         fff.gate3_close()
         fff.gate5_close()
@@ -459,8 +452,7 @@ class TestPump1:
 
 
 class TestGate3TankLevels:
-    @classmethod
-    def setup_class(cls):
+    def setup_method(self):
         ffc.tank2.level = 18.0
         fff.change_tank_level(ffc.tank2, ffc.tank2.level)
         fff.gate1_open()
@@ -495,7 +487,6 @@ class TestGate3TankLevels:
         assert ffc.gate6.flow_in == 19542.86939891452
         assert ffc.gate6.press_in == 13.109851301499999
 
-    @classmethod
-    def teardown_class(cls):
+    def teardown_method(self):
         ffc.tank2.level = 36.0
         fff.change_tank_level(ffc.tank2, ffc.tank2.level)
\ No newline at end of file
@@ -0,0 +1,151 @@
+import types
+
+import pytest
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+import Models.FuelFarm.interlocks as interlocks
+from Models.FuelFarm.factory import FuelFarm
+from Models.FuelFarm.hmi import headless
+
+headless.install()
+import Models.FuelFarm.hmi.hmilayout as hmilayout  # noqa: E402
+
+
+def layout():
+    """Stand-in for the HMILayout widget, with the table populate() fills."""
+    return types.SimpleNamespace(table=types.SimpleNamespace(data=[]))
+
+
+class Button:
+    """Toggle button stand-in that calls on_state when its state changes, as Kivy does."""
+    def __init__(self, hmi, group):
+        self.hmi = hmi
+        self.group = group
+        self._state = "normal"
+
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, state):
+        if state != self._state:
+            self._state = state
+            self.hmi.on_state(self)
+
+
+def hmi():
+    """HMILayout with stand-ins for the widgets its kv rule creates."""
+    view = hmilayout.HMILayout()
+    view.table = types.SimpleNamespace(data=[])
+    view.status = types.SimpleNamespace(text="")
+    view.ids = {group: Button(view, group) for group in hmilayout.command_table(hmilayout.current_registry())}
+    return view
+
+
+@pytest.fixture
+def engine():
+    hmilayout.interlock_engine = interlocks.build_engine()
+    hmilayout.interlock_engine.install()
+    yield hmilayout.interlock_engine
+    hmilayout.interlock_engine.uninstall()
+    hmilayout.interlock_engine = None
+
+
+class TestRegistry:
+    def test_follows_installed_model(self):
+        registry = hmilayout.current_registry()
+        assert registry["gate1"] is ffc.gate1
+        assert hmilayout.current_registry() is registry  # Not rebuilt while the model is unchanged
+        FuelFarm.new().install()
+        rebuilt = hmilayout.current_registry()
+        assert rebuilt is not registry
+        assert rebuilt["gate1"] is ffc.gate1
+
+    def test_commands_reach_installed_model(self):
+        view = hmi()
+        FuelFarm.new().install()
+        view.ids["gate1"].state = "down"
+        assert ffc.gate1.position == 100
+        view.ids["gate1"].state = "normal"
+        assert ffc.gate1.position == 0
+
+    def test_populate_reads_installed_model(self):
+        hmilayout.current_registry()
+        FuelFarm.new().install()
+        fff.change_tank_level(ffc.tank1, 12.5)
+        table = layout()
+        hmilayout.HMILayout.populate(table)
+        assert {"value": "12.5"} in table.table.data
+
+
+class TestInterlocks:
+    def setup_method(self):
+        FuelFarm.new().install()
+
+    def test_blocked_command(self, engine):
+        view = hmi()
+        view.ids["pump1"].state = "down"
+        assert view.status.text == "Interlock: pump1 cannot run unless gate5 open."
+        assert view.ids["pump1"].state == "normal"  # Shows the pump still stopped
+        assert ffc.pump1.speed == 0
+        assert engine.blocked["pump1_on"] == 1  # Resetting the button didn't command the pump again
+        view.ids["gate5"].state = "down"
+        assert view.status.text == ""
+
+    def test_trip_between_commands(self, engine):
+        view = hmi()
+        view.ids["gate5"].state = "down"
+        view.ids["pump1"].state = "down"
+        assert ffc.pump1.speed > 0
+        fff.gate5_close()  # Not through the HMI, so no command triggers a scan
+        assert [rule.action for rule in view.scan(hmilayout.SCAN_PERIOD)] == ["pump1_off"]
+        assert ffc.pump1.speed == 0
+        assert view.status.text == "Trip: trip pump1 on gate5 closed"
+        assert (view.ids["pump1"].state, view.ids["gate5"].state) == ("normal", "normal")
+        assert view.scan(hmilayout.SCAN_PERIOD) == []
+
+    def test_failed_command_trace_closed(self, tmp_path, monkeypatch):
+        tracer = hmilayout.tracing.Tracer(str(tmp_path / "trace.jsonl"))
+        monkeypatch.setattr(hmilayout.tracing, "DEFAULT", tracer)
+
+        def fail():
+            raise RuntimeError("Action failed")
+        monkeypatch.setattr(hmilayout.functionality, "gate8_open", fail)
+        view = hmi()
+        with pytest.raises(RuntimeError):
+            view.ids["gate8"].state = "down"
+        assert tracer._open == {} and list(tracer._waiting) == []
+        tracer.close()
+
+    def test_scans_recorded(self, engine):
+        view = hmi()
+        scans = hmilayout.metrics.DEFAULT.scans
+        count = scans.count
+        view.scan(hmilayout.SCAN_PERIOD)
+        view.ids["gate5"].state = "down"  # Scans after the command
+        assert scans.count == count + 2
+
+    def test_scan_scheduled(self):
+        from kivy.clock import Clock
+        if not headless.install():
+            pytest.skip("Kivy's own clock")
+        try:
+            view = hmilayout.HMIApp().build()
+            assert (view.scan, hmilayout.SCAN_PERIOD) in [(callback, period) for callback, period in Clock.scheduled]
+        finally:
+            hmilayout.interlock_engine.uninstall()
+            hmilayout.interlock_engine = None
+
+
+class TestMetrics:
+    def test_port_in_use(self, capsys):
+        first = hmilayout.start_metrics("0")
+        try:
+            assert hmilayout.start_metrics(str(first.port)) is None
+            assert "Metrics endpoint not started on port {}".format(first.port) in capsys.readouterr().err
+        finally:
+            first.stop()
+
+    def test_bad_port(self, capsys):
+        assert hmilayout.start_metrics("metrics") is None
@@ -0,0 +1,67 @@
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+import Models.FuelFarm.interlocks as ffi
+
+
+class TestPumpInterlocks:
+    def setup_method(self):
+        self.engine = ffi.build_engine()
+        self.engine.install()
+        fff.gate6_close()
+        fff.pump2_off()
+
+    def test_pump2_blocked(self):
+        assert fff.pump2_on() == "Interlock: pump2 cannot run unless gate6 open."
+        assert ffc.pump2.speed == 0
+
+    def test_pump2_permitted(self):
+        fff.gate6_open()
+        fff.pump2_on()
+        assert ffc.pump2.speed == 1480
+        assert self.engine.scan() == []
+
+    def test_pump2_trip(self):
+        fff.gate6_open()
+        fff.pump2_on()
+        assert ffc.pump2.speed == 1480
+        fff.gate6_close()
+        fired = self.engine.scan()
+        assert [rule.description for rule in fired] == ["trip pump2 on gate6 closed"]
+        assert ffc.pump2.speed == 0
+
+    def teardown_method(self):
+        self.engine.uninstall()
+        fff.pump2_off()
+
+
+class TestReliefInterlocks:
+    def setup_method(self):
+        self.engine = ffi.build_engine()
+        self.engine.install()
+        fff.gate5_open()
+        fff.pump1_on()
+        ffc.relief1.open()
+
+    def test_trip(self):
+        fired = self.engine.scan()
+        assert [rule.description for rule in fired] == ["trip pump1 on relief1 open"]
+        assert ffc.pump1.speed == 0
+
+    def test_restart_while_relief_open(self):
+        self.engine.scan()
+        assert fff.pump1_on() == "Interlock: pump1 cannot run while relief1 open."
+        assert ffc.pump1.speed == 0
+        ffc.pump1.adjust_speed(1480)  # Started outside the permissives, e.g. locally at the pump
+        fired = self.engine.scan()
+        assert [rule.description for rule in fired] == ["trip pump1 on relief1 open"]
+        assert ffc.pump1.speed == 0
+
+    def test_restart_after_relief_closes(self):
+        self.engine.scan()
+        ffc.relief1.close()
+        assert fff.pump1_on() is None
+        assert ffc.pump1.speed == 1480
+        assert self.engine.scan() == []
+
+    def teardown_method(self):
+        self.engine.uninstall()
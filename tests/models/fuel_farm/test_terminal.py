@@ -0,0 +1,87 @@
+from Models.FuelFarm.hmi.terminal import Dashboard, TableSource, farm_source
+from PipingSystems.pump.pump import PositiveDisplacement
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Gate
+
+
+class FakeScreen:
+    def __init__(self, height=30, width=120):
+        self.size = (height, width)
+        self.writes = []
+
+    def getmaxyx(self):
+        return self.size
+
+    def addstr(self, line, column, text):
+        self.writes.append((line, column, text))
+
+    def refresh(self):
+        pass
+
+
+def make_source(valve_count=1000):
+    tank = Tank("Tank 1", level=36.0, fluid_density=1.629869, outlet_diam=16, outlet_slope=0.25)
+    valves = [Gate("Gate valve {}".format(n)) for n in range(1, valve_count + 1)]
+    pump = PositiveDisplacement("Pump 1", displacement=0.24)
+    return TableSource([tank], valves, [pump], inlets={pump: valves[0]}), valves
+
+
+class TestTableSource:
+    def test_farm_layout(self):
+        rows = farm_source().rows()
+        assert len(rows) == 20  # Same 120 cells as HMILayout.populate()
+        assert rows[0] == ("Tank", "Level", "Pressure Out", "Flow Out", "", "")
+        assert rows[1][0] == "Tank 1"
+        assert rows[3] == ("",) * 6
+        assert rows[4][0] == "Valve"
+        assert rows[5][0] == "Gate valve 1"
+        assert rows[15] == ("",) * 6
+        assert rows[16][0] == "Pump"
+        assert rows[19][0] == "Pump 3"
+
+    def test_window(self):
+        source, _ = make_source()
+        assert len(source) == 1007
+        assert source.rows(1002, 1010) == [source.row(n) for n in range(1002, 1007)]
+        assert source.row(1004) == ("",) * 6
+
+    def test_pump_inlet_closed(self):
+        source, valves = make_source(1)
+        pump = source.sections[2][2][0]
+        pump.outlet_pressure = 50
+        pump.adjust_speed(1480)
+        assert source.row(7)[3:5] == ("0.00", "0.00")
+        valves[0].flow_out = 100.0
+        assert source.row(7)[3:5] == ("50.00", "355.20")
+
+
+class TestDashboard:
+    def test_redraws_changed_cells(self):
+        source, valves = make_source()
+        dashboard = Dashboard(source)
+        screen = FakeScreen()
+        assert dashboard.draw(screen) == 29 * 6
+        assert dashboard.draw(screen) == 0
+        valves[2].open()
+        valves[2].flow_out = 12.5
+        assert dashboard.draw(screen) == 2
+        assert screen.writes[-2][2].strip() == "12.50"
+
+    def test_scroll(self):
+        source, _ = make_source()
+        dashboard = Dashboard(source)
+        screen = FakeScreen(height=11)
+        dashboard.draw(screen)
+        dashboard.scroll(10000, 10)
+        assert dashboard.top == 997
+        dashboard.draw(screen)
+        assert screen.writes[-2][2].strip() == ""  # Pump row's empty last column
+        assert "998-1007 of 1007" in screen.writes[-1][2]
+
+    def test_short_table_clears_old_lines(self):
+        source, _ = make_source(3)
+        dashboard = Dashboard(source)
+        dashboard.shown = {line: ("x",) * 6 for line in range(20)}
+        changed = dashboard.changes(20)
+        assert sorted(dashboard.shown) == list(range(len(source)))
+        assert (19, 0, " " * 95) in changed
@@ -1,4 +1,5 @@
-from PipingSystems.valve.valve import Globe
+import pytest
+from PipingSystems.valve.valve import Globe, FLOW_CHARACTERISTICS, characteristic_flows, characteristic_table
 
 
 class TestGlobe():
@@ -16,7 +17,89 @@ class TestGlobe():
         g.open()
         assert g.read_position() == "Globe1 is 100% open."
 
+    def test_open_pressure(self):
+        g = Globe(name="Globe1", flow_coeff=21, sys_flow_in=50, press_in=20, characteristic="equal_percentage")
+        g.turn_handle(50)
+        assert g.press_out != 20
+        g.turn_handle(100)
+        assert (g.flow_out, g.press_out) == (50.0, 20)
+
     def test_close(self):
         g = Globe(name="Globe1", flow_coeff=21)
         g.close()
         assert g.read_position() == "Globe1 is 0% open."
+
+
+class TestCharacteristic():
+    def test_linear(self):
+        g = Globe(name="Globe1", flow_coeff=21, sys_flow_in=50)
+        g.turn_handle(40)
+        assert g.flow_out == 20.0
+
+    def test_equal_percentage(self):
+        g = Globe(name="Globe1", flow_coeff=21, sys_flow_in=50, characteristic="equal_percentage")
+        g.turn_handle(50)
+        assert g.flow_out == pytest.approx(50 * 50 ** -0.5)
+        assert g.flow_out < 25.0
+
+    def test_quick_opening(self):
+        g = Globe(name="Globe1", flow_coeff=21, sys_flow_in=50, characteristic="quick_opening")
+        g.turn_handle(25)
+        assert g.flow_out == 25.0
+
+    def test_custom(self):
+        table = characteristic_table([(0, 0.0), (50, 0.8), (100, 1.0)])
+        assert table[25] == 0.4
+        assert table[75] == pytest.approx(0.9)
+        g = Globe(name="Globe1", flow_coeff=21, sys_flow_in=50, characteristic=table)
+        g.turn_handle(25)
+        assert g.flow_out == 20.0
+
+    def test_custom_open(self):
+        table = characteristic_table([(0, 0.0), (50, 0.8), (100, 0.9)])
+        g = Globe(name="Globe1", flow_coeff=21, sys_flow_in=50, characteristic=table)
+        g.open()
+        assert g.flow_out == 45.0
+        g.turn_handle(0)
+        g.turn_handle(100)
+        assert g.flow_out == 45.0
+
+    def test_custom_copied(self):
+        table = list(FLOW_CHARACTERISTICS["linear"])
+        g = Globe(name="Globe1", flow_coeff=21, sys_flow_in=50, characteristic=table)
+        table[40] = 1.0
+        assert g.characteristic == FLOW_CHARACTERISTICS["linear"]
+        g.turn_handle(40)
+        assert g.flow_out == 20.0
+
+    def test_custom_bad_points(self):
+        with pytest.raises(ValueError) as excinfo:
+            characteristic_table([(10, 0.0), (100, 1.0)])
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Points must include 0 and 100 percent open."
+
+    def test_custom_duplicate_points(self):
+        with pytest.raises(ValueError) as excinfo:
+            characteristic_table([(0, 0.0), (50, 0.5), (50, 0.8), (100, 1.0)])
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Point positions must be strictly increasing."
+
+    def test_unknown(self):
+        with pytest.raises(ValueError) as excinfo:
+            Globe(name="Globe1", characteristic="parabolic")
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Unknown flow characteristic: parabolic"
+
+    def test_invalid_position(self):
+        g = Globe(name="Globe1", flow_coeff=21, sys_flow_in=50)
+        assert g.turn_handle(150) == "Warning: Invalid valve position."
+        assert g.position == 0
+
+    def test_batch(self):
+        table = FLOW_CHARACTERISTICS["equal_percentage"]
+        valves = [Globe(name="Globe{}".format(n), flow_coeff=21, sys_flow_in=50, characteristic="equal_percentage")
+                  for n in range(1, 100)]
+        for position, valve in enumerate(valves, 1):
+            valve.turn_handle(position)
+        flows = characteristic_flows([50.0] * 99, range(1, 100), table)
+        assert flows == [valve.flow_out for valve in valves]
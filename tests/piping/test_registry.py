@@ -0,0 +1,86 @@
+import pytest
+import Models.FuelFarm.components as ffc
+from PipingSystems.pump.pump import Pump, PositiveDisplacement
+from PipingSystems.registry import ComponentRegistry
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Gate, Globe, Valve
+
+
+def make_registry():
+    registry = ComponentRegistry()
+    registry.register(Tank("Tank 1"), tags=("storage",))
+    registry.register(Gate("Gate 1"), tags=("inlet",))
+    registry.register(Gate("Gate 2"), tags=("inlet", "spare"))
+    registry.register(Globe("Throttle 1"))
+    registry.register(PositiveDisplacement("Pump 1", displacement=0.24), tags=("spare",))
+    return registry
+
+
+class TestRegister:
+    def test_lookup(self):
+        registry = make_registry()
+        assert len(registry) == 5
+        assert "Gate 2" in registry
+        assert registry["Gate 2"].name == "Gate 2"
+        assert registry.get("Gate 3") is None
+        assert [component.name for component in registry][:2] == ["Tank 1", "Gate 1"]
+
+    def test_types(self):
+        registry = make_registry()
+        assert [valve.name for valve in registry.of_type(Valve)] == ["Gate 1", "Gate 2", "Throttle 1"]
+        assert [gate.name for gate in registry.of_type(Gate)] == ["Gate 1", "Gate 2"]
+        assert [pump.name for pump in registry.of_type(Pump)] == ["Pump 1"]
+        assert list(registry.of_type(str)) == []
+
+    def test_duplicate_name(self):
+        registry = make_registry()
+        with pytest.raises(ValueError) as excinfo:
+            registry.register(Gate("Gate 1"))
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Gate 1 is already registered."
+
+    def test_not_a_component(self):
+        with pytest.raises(TypeError) as excinfo:
+            ComponentRegistry().register("Gate 1")
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Only tanks, valves, and pumps can be registered."
+
+    def test_unregister(self):
+        registry = make_registry()
+        gate = registry.unregister("Gate 2")
+        assert gate.name == "Gate 2"
+        assert "Gate 2" not in registry
+        assert [valve.name for valve in registry.of_type(Gate)] == ["Gate 1"]
+        assert [item.name for item in registry.tagged("spare")] == ["Pump 1"]
+
+
+class TestTags:
+    def test_tagged(self):
+        registry = make_registry()
+        assert [item.name for item in registry.tagged("inlet")] == ["Gate 1", "Gate 2"]
+        registry.tag("Throttle 1", "inlet")
+        registry.untag("Gate 1", "inlet", "missing")
+        assert [item.name for item in registry.tagged("inlet")] == ["Gate 2", "Throttle 1"]
+        assert registry.tags("Gate 2") == {"inlet", "spare"}
+
+    def test_query(self):
+        registry = make_registry()
+        assert [item.name for item in registry.query(Valve, ("spare",))] == ["Gate 2"]
+        assert [item.name for item in registry.query(tags=("inlet", "spare"))] == ["Gate 2"]
+        assert registry.query(Tank, ("inlet",)) == []
+        assert len(registry.query()) == 5
+
+    def test_large_model(self):
+        registry = ComponentRegistry(Gate("Gate {}".format(number)) for number in range(100000))
+        registry.register(PositiveDisplacement("Pump 1", displacement=0.24), tags=("duty",))
+        assert len(registry.of_type(Valve)) == 100000
+        assert [pump.name for pump in registry.query(Pump, ("duty",))] == ["Pump 1"]
+
+
+class TestFarmRegistry:
+    def test_fuel_farm(self):
+        registry = ffc.registry()
+        assert registry["gate7"] is ffc.gate7
+        assert len(registry.of_type(Valve)) == 16
+        assert [gate.name for gate in registry.tagged("gate")][-1] == "Gate valve 10"
+        assert registry.tags("relief2") == {"relief"}
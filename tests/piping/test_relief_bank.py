@@ -0,0 +1,135 @@
+import random
+
+import pytest
+from PipingSystems.valve.relief_bank import ReliefBank
+from PipingSystems.valve.valve import Relief
+
+
+def make_valves(count, seed=1):
+    rng = random.Random(seed)
+    valves = []
+    for n in range(count):
+        open_set = rng.choice([50, 55, 60, 65])
+        valves.append(Relief("Relief {}".format(n), open_press=open_set, close_press=open_set - rng.choice([0, 3, 5]),
+                             position=rng.choice([0, 0, 100, 50])))
+    return valves
+
+
+class TestReliefBank:
+    def test_header_open_close(self):
+        bank = ReliefBank([Relief("Relief1", open_press=25, close_press=23)])
+        assert bank.evaluate(25) == ([0], [])
+        assert bank.valves[0].read_position() == "Relief1 is open."
+        assert bank.evaluate(24) == ([], [])
+        assert bank.evaluate(23) == ([], [0])
+        assert bank.valves[0].read_position() == "Relief1 is closed."
+
+    def test_only_changes_reported(self):
+        bank = ReliefBank([Relief("Relief1", open_press=25, close_press=23), Relief("Relief2", open_press=40,
+                                                                                   close_press=35)])
+        assert bank.evaluate(30) == ([0], [])
+        assert bank.evaluate(30) == ([], [])
+
+    def test_header_matches_valve_operation(self):
+        reference = make_valves(200)
+        bank = ReliefBank(make_valves(200))
+        rng = random.Random(2)
+        for _ in range(300):
+            press = rng.choice(range(40, 70))
+            before = [valve.position for valve in reference]
+            for valve in reference:
+                valve.valve_operation(press)
+            change = bank.evaluate(press)
+            after = [valve.position for valve in reference]
+            assert bank.positions() == after
+            assert [valve.position for valve in bank.valves] == after
+            assert change.opened == [i for i in range(200) if after[i] == 100 and before[i] != 100]
+            assert change.closed == [i for i in range(200) if after[i] == 0 and before[i] != 0]
+
+    def test_each_matches_valve_operation(self):
+        reference = make_valves(200)
+        bank = ReliefBank(make_valves(200))
+        rng = random.Random(3)
+        for _ in range(100):
+            pressures = [rng.uniform(40, 70) for _ in range(200)]
+            for valve, press in zip(reference, pressures):
+                valve.valve_operation(press)
+            bank.evaluate(pressures)
+            assert bank.positions() == [valve.position for valve in reference]
+
+    def test_mixed_paths(self):
+        reference = make_valves(50)
+        bank = ReliefBank(make_valves(50))
+        rng = random.Random(4)
+        for n in range(100):
+            press = rng.uniform(40, 70)
+            pressures = [press] * 50 if n % 2 else press
+            for valve in reference:
+                valve.valve_operation(press)
+            bank.evaluate(pressures)
+            assert bank.positions() == [valve.position for valve in reference]
+
+    @pytest.mark.parametrize("header", [True, False])
+    def test_sync_matches_valve_operation(self, header):
+        reference = make_valves(100)
+        bank = ReliefBank(make_valves(100))
+        rng = random.Random(5)
+        for _ in range(100):
+            press = rng.choice(range(40, 70))
+            flow = rng.uniform(0, 500)
+            for valve in reference + bank.valves:
+                valve.press_in = press
+                valve.flow_in = flow
+            for valve in reference:
+                valve.valve_operation(press)
+            bank.evaluate(press if header else [press] * 100)
+            bank.sync(press if header else [press] * 100)
+            assert [(valve.position, valve.flow_out, valve.press_out) for valve in bank.valves] == \
+                [(valve.position, valve.flow_out, valve.press_out) for valve in reference]
+
+    def test_partial_index(self):
+        valves = [Relief("Relief1", open_press=25, close_press=23, position=50),
+                  Relief("Relief2", open_press=40, close_press=35, position=50),
+                  Relief("Relief3", open_press=60, close_press=55)]
+        bank = ReliefBank(valves)
+        assert [i for _, i in bank._partial_by_close] == [0, 1]
+        assert bank.evaluate(30) == ([0], [1])
+        assert bank._partial_by_close == []
+        assert bank.evaluate(30) == ([], [])
+
+    def test_large_bank_no_partials(self):
+        bank = ReliefBank([Relief("Relief {}".format(n), open_press=50 + n % 20, close_press=45 + n % 20)
+                           for n in range(10000)])
+        assert bank._partial_by_close == []
+        assert bank.evaluate(40) == ([], [])
+
+    def test_refresh_setpoints(self):
+        valve = Relief("Relief1", open_press=25, close_press=23)
+        bank = ReliefBank([valve])
+        valve.set_open_pressure(75)
+        valve.set_close_press(73)
+        bank.refresh()
+        assert bank.evaluate(50) == ([], [])
+
+    def test_no_apply(self):
+        bank = ReliefBank([Relief("Relief1", open_press=25, close_press=23)])
+        bank.evaluate(30, apply=False)
+        assert bank.positions() == [100]
+        assert bank.valves[0].position == 0
+
+    @pytest.mark.parametrize("header", [True, False])
+    def test_applies_changes_only(self, header, monkeypatch):
+        bank = ReliefBank(make_valves(20))
+        bank.evaluate(100 if header else [100] * 20)
+        calls = []
+        for valve in bank.valves:
+            monkeypatch.setattr(valve, "open", lambda valve=valve: calls.append(valve))
+        bank.evaluate(100 if header else [100] * 20)
+        assert calls == []
+
+    def test_length_mismatch(self):
+        bank = ReliefBank(make_valves(3))
+        with pytest.raises(ValueError) as excinfo:
+            bank.evaluate([1.0, 2.0])
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "One pressure per valve is required."
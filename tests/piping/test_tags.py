@@ -0,0 +1,120 @@
+import time
+
+import pytest
+import Models.FuelFarm.components as ffc
+from Models.FuelFarm.factory import FuelFarm
+from PipingSystems.tags import CACHE_SIZE, TagDatabase, _compiled
+from PipingSystems.valve.valve import Gate
+
+
+def farm_tags(farms=2):
+    tags = TagDatabase()
+    registry = ffc.registry()
+    for farm in range(1, farms + 1):
+        tags.add_registry(registry, "Site{}/Farm".format(farm))
+    return tags
+
+
+class TestTagDatabase:
+    def test_standard_tags(self):
+        tags = farm_tags(1)
+        assert len(tags) == 2 * 3 + 16 * 5 + 3 * 4
+        assert tags.read("Site1/Farm/Tank1/Level") == ffc.tank1.level
+        assert tags.read("Site1/Farm/Pump2/Power") == ffc.pump2.power
+        assert "Site1/Farm/Gate10/Position" in tags
+        assert "Site1/Farm/Gate10" not in tags  # Interior node, not a tag
+
+    def test_write(self):
+        tags = TagDatabase()
+        gate = Gate("Gate 1")
+        tags.add("Farm1/Gate1/Position", gate, "position")
+        tags.write("Farm1/Gate1/Position", 100)
+        assert gate.position == 100
+        with pytest.raises(TypeError):
+            tags.write("Farm1/Gate1/Position", "open")
+
+    def test_read_only(self):
+        tags = farm_tags(1)
+        level = ffc.tank1.level
+        with pytest.raises(ValueError) as excinfo:
+            tags.write("Site1/Farm/Tank1/Pressure", 5.0)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Site1/Farm/Tank1/Pressure is read-only."
+        assert ffc.tank1.level == level
+
+    def test_bad_paths(self):
+        tags = TagDatabase()
+        gate = Gate("Gate 1")
+        tags.add("Farm1/Gate1/Position", gate, "position")
+        with pytest.raises(ValueError) as excinfo:
+            tags.add("Farm1/Gate1/Position", gate, "position")
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Farm1/Gate1/Position is already a tag."
+        with pytest.raises(ValueError):
+            tags.add("Farm1/Gate*/Position", gate, "position")
+        with pytest.raises(ValueError):
+            tags.add("Farm1//Position", gate, "position")
+        with pytest.raises(KeyError):
+            tags.read("Farm1/Gate2/Position")
+
+    def test_remove(self):
+        tags = farm_tags(1)
+        tags.remove("Site1/Farm/Pump1/Power")
+        assert "Site1/Farm/Pump1/Power" not in tags
+        assert len(tags.resolve("Site1/Farm/Pump1/*")) == 3
+        for name in ("Speed", "PressureOut", "Flow"):
+            tags.remove("Site1/Farm/Pump1/" + name)
+        assert tags.resolve("Site1/Farm/Pump1/*") == []
+        assert "Pump1" not in tags._root.children["Site1"].children["Farm"].children
+
+
+class TestWildcards:
+    def test_segment_wildcards(self):
+        tags = farm_tags()
+        paths = [point.path for point in tags.resolve("Site*/Farm/Pump*/Power")]
+        assert paths == ["Site{}/Farm/Pump{}/Power".format(site, pump) for site in (1, 2) for pump in (1, 2, 3)]
+        assert len(tags.resolve("Site1/Farm/Gate?/Position")) == 9
+        assert len(tags.resolve("Site1/Farm/Gate[12]*/FlowOut")) == 3
+
+    def test_any_depth(self):
+        tags = farm_tags()
+        assert len(tags.resolve("**/Level")) == 4
+        assert len(tags.resolve("Site2/**")) == len(tags) // 2
+
+    def test_cache_invalidated(self):
+        tags = farm_tags(1)
+        assert len(tags.resolve("*/*/Tank*/Level")) == 2
+        tags.add_registry(ffc.registry(), "Site2/Farm")
+        assert len(tags.resolve("*/*/Tank*/Level")) == 4
+
+    def test_caches_bounded(self):
+        tags = farm_tags(1)
+        first = tags.resolve("Site1/Farm/Pump1/*")
+        for number in range(CACHE_SIZE * 2):
+            tags.resolve("Site1/Farm/Gate{}*/Position".format(number))
+            tags.resolve("Site1/Farm/Pump1/*")  # Recently used, so kept
+        assert len(tags._resolved) == CACHE_SIZE
+        assert tags.resolve("Site1/Farm/Pump1/*") is first
+        assert _compiled.cache_info().currsize <= CACHE_SIZE
+
+
+class TestSubscription:
+    def test_read_and_changes(self):
+        FuelFarm.new().install()
+        tags = farm_tags(1)
+        subscription = tags.subscribe("Site1/Farm/Gate*/Position")
+        assert len(subscription.changes()) == 10
+        assert subscription.changes() == {}
+        ffc.gate3.position = 100
+        assert subscription.changes() == {"Site1/Farm/Gate3/Position": 100}
+        ffc.gate3.position = 0
+
+    def test_bulk_read(self):
+        tags = TagDatabase()
+        for number in range(5000):
+            tags.add("Site/Gate{}/Position".format(number), Gate("Gate {}".format(number)), "position")
+        subscription = tags.subscribe("Site/Gate*/Position")
+        start = time.perf_counter()
+        values = subscription.read()
+        assert len(values) == 5000
+        assert (time.perf_counter() - start) / len(values) < 20e-6
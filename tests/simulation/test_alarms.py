@@ -0,0 +1,131 @@
+import pytest
+from PipingSystems.pump.pump import PositiveDisplacement
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Globe
+from Simulation.alarms import AlarmEngine, HIGH, LOW, NORMAL
+
+
+def make_engine(**kwargs):
+    tank = Tank("Tank 1", level=20.0, fluid_density=1.629869)
+    engine = AlarmEngine(**kwargs)
+    engine.add("tank1.level", tank, "level", high=34.0, low=2.0, deadband=1.0)
+    return engine, tank
+
+
+class TestLimits:
+    def test_high(self):
+        engine, tank = make_engine()
+        assert engine.scan(0.0).raised == []
+        tank.level = 35.0
+        result = engine.scan(1.0)
+        assert [event.tag for event in result.raised] == ["tank1.level"]
+        assert engine.state("tank1.level") == HIGH
+
+    def test_low(self):
+        engine, tank = make_engine()
+        tank.level = 1.0
+        result = engine.scan(0.0)
+        assert result.raised[0].state == LOW
+
+    def test_deadband(self):
+        engine, tank = make_engine()
+        tank.level = 35.0
+        engine.scan(0.0)
+        tank.level = 33.5  # Inside the limit but within the deadband
+        assert engine.scan(1.0).cleared == []
+        tank.level = 32.5
+        result = engine.scan(2.0)
+        assert result.cleared[0].state == HIGH
+        assert engine.state("tank1.level") == NORMAL
+
+    def test_bad_limits(self):
+        engine = AlarmEngine()
+        with pytest.raises(ValueError) as excinfo:
+            engine.add("x", Tank(), "level", high=1.0, low=2.0)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Low limit must not exceed high limit."
+
+
+class TestDelays:
+    def test_on_delay(self):
+        tank = Tank("Tank 1", level=35.0)
+        engine = AlarmEngine()
+        engine.add("tank1.level", tank, "level", high=34.0, on_delay=5.0)
+        assert engine.scan(0.0).raised == []
+        assert engine.scan(4.0).raised == []
+        assert len(engine.scan(5.0).raised) == 1
+
+    def test_on_delay_reset(self):
+        tank = Tank("Tank 1", level=35.0)
+        engine = AlarmEngine()
+        engine.add("tank1.level", tank, "level", high=34.0, on_delay=5.0)
+        engine.scan(0.0)
+        tank.level = 30.0
+        engine.scan(2.0)
+        tank.level = 35.0
+        assert engine.scan(6.0).raised == []
+        assert len(engine.scan(11.0).raised) == 1
+
+    def test_off_delay(self):
+        pump = PositiveDisplacement("Pump 1", press_out=50, displacement=0.24)
+        pump.adjust_speed(1480)
+        engine = AlarmEngine()
+        engine.add("pump1.power", pump, "power", high=1.0, off_delay=3.0)
+        engine.scan(0.0)
+        pump.adjust_speed(0)
+        assert engine.scan(1.0).cleared == []
+        assert len(engine.scan(4.0).cleared) == 1
+
+
+class TestShelving:
+    def test_shelved_not_annunciated(self):
+        engine, tank = make_engine()
+        engine.shelve("tank1.level")
+        tank.level = 35.0
+        assert engine.scan(0.0).raised == []
+        assert engine.active() == [("tank1.level", HIGH, 0.0, False, True)]
+
+    def test_shelving_expires(self):
+        engine, tank = make_engine()
+        engine.shelve("tank1.level", until=10.0)
+        tank.level = 35.0
+        engine.scan(0.0)
+        tank.level = 20.0
+        engine.scan(5.0)
+        tank.level = 35.0
+        assert len(engine.scan(10.0).raised) == 1
+
+    def test_acknowledge(self):
+        engine, tank = make_engine()
+        tank.level = 35.0
+        engine.scan(0.0)
+        engine.acknowledge("tank1.level")
+        assert engine.active() == [("tank1.level", HIGH, 0.0, True, False)]
+
+
+class TestFlood:
+    def test_flood_suppression(self):
+        engine = AlarmEngine(flood_threshold=3, flood_window=60.0, flood_priority=1)
+        valves = [Globe("Flow Control {}".format(n), flow_coeff=165) for n in range(5)]
+        for n, valve in enumerate(valves):
+            engine.add("throttle{}.position".format(n), valve, "position", high=90, priority=1 if n == 4 else 2)
+        for valve in valves:
+            valve.open()
+        result = engine.scan(0.0)
+        assert len(result.raised) == 4
+        assert [event.tag for event in result.suppressed] == ["throttle3.position"]
+        assert result.raised[-1].tag == "throttle4.position"
+
+    def test_flood_window_expires(self):
+        engine = AlarmEngine(flood_threshold=1, flood_window=10.0)
+        tanks = [Tank(level=20.0) for _ in range(2)]
+        engine.add("a", tanks[0], "level", high=30.0)
+        engine.add("b", tanks[1], "level", high=30.0)
+        tanks[0].level = 35.0
+        assert len(engine.scan(0.0).raised) == 1
+        tanks[1].level = 35.0
+        assert len(engine.scan(5.0).suppressed) == 1
+        tank = Tank(level=20.0)
+        engine.add("c", tank, "static_tank_press", high=10.0)
+        tank.level = 35.0
+        assert len(engine.scan(20.0).raised) == 1
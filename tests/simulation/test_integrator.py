@@ -0,0 +1,101 @@
+import math
+
+import pytest
+import utility_formulas
+from PipingSystems.pump.pump import PositiveDisplacement
+from PipingSystems.storage_tank.tank import Tank
+from Simulation.integrator import Event, TankInventory, solve
+
+
+def make_tank(level):
+    return Tank("Tank", level=level, fluid_density=1.629869, outlet_diam=16, outlet_slope=0.25)
+
+
+class TestSolve:
+    def test_exponential_decay(self):
+        sol = solve(lambda t, y: [-y[0]], 0.0, 5.0, [1.0], rtol=1e-9, atol=1e-12)
+        assert sol.t[-1] == 5.0
+        assert sol.y[-1][0] == pytest.approx(math.exp(-5), rel=1e-7)
+
+    def test_adaptive_steps(self):
+        sol = solve(lambda t, y: [0.001], 0.0, 1e6, [0.0])
+        assert sol.steps < 20
+        assert sol.y[-1][0] == pytest.approx(1000.0)
+
+    def test_event_located(self):
+        crossing = Event(lambda t, y: y[0] - 2.5, terminal=True)
+        sol = solve(lambda t, y: [1.0], 0.0, 10.0, [0.0], events=[crossing])
+        assert sol.terminated is crossing
+        assert sol.t[-1] == pytest.approx(2.5, abs=1e-12)
+
+    def test_event_direction(self):
+        falling = Event(lambda t, y: y[0], direction=-1)
+        sol = solve(lambda t, y: [math.cos(t)], 0.0, 10.0, [0.0], events=[falling], rtol=1e-10, atol=1e-12)
+        assert [round(t, 6) for _, t, _ in sol.events] == [round(math.pi, 6), round(3 * math.pi, 6)]
+
+    def test_bad_span(self):
+        with pytest.raises(ValueError) as excinfo:
+            solve(lambda t, y: [0.0], 1.0, 1.0, [0.0])
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "End time must be after start time."
+
+
+class TestTankInventory:
+    def test_fixed_slope_drain(self):
+        tank = make_tank(36.0)
+        inventory = TankInventory([tank], 27778, 36.0)
+        handled = inventory.run(30 * 86400)
+        expected = 36.0 * 27778 * 60 / utility_formulas.gravity_flow_rate(16, 0.25)
+        assert handled == [(pytest.approx(expected, rel=1e-9), "empty", 0)]
+        assert tank.level == 0.0
+        assert tank.flow_out == 0.0
+
+    def test_gravity_drain_head_dependent(self):
+        tank = make_tank(36.0)
+        inventory = TankInventory([tank], 27778, 36.0, pipe_lengths=[144.0])
+        handled = inventory.run(7 * 86400)
+        k = utility_formulas.gravity_flow_rate(16, 1 / 144.0) / (27778 * 60)  # dh/dt = -k * sqrt(h)
+        assert handled[0][0] == pytest.approx(2 * math.sqrt(36.0) / k, rel=1e-5)  # sqrt(h) is stiff near empty
+        assert inventory.log[0].steps < 200
+
+    def test_pump_transfer_fills(self):
+        tank1 = make_tank(36.0)
+        tank2 = make_tank(30.0)
+        pump = PositiveDisplacement("Pump 2", press_out=50, displacement=0.24)
+        pump.adjust_speed(1480)
+        inventory = TankInventory([tank1, tank2], 27778, 36.0, gravity_drain=[False, False])
+        inventory.add_transfer(pump, 0, 1)
+        handled = inventory.run(86400)
+        fill_time = 6.0 * 27778 * 60 / pump.flow
+        assert handled == [(pytest.approx(fill_time), "full", 1)]
+        assert tank2.level == 36.0
+        assert tank1.level == pytest.approx(30.0)
+
+    def test_relief_setpoint_crossing(self):
+        tank = make_tank(36.0)
+        crossings = []
+        inventory = TankInventory([tank], 27778, 36.0)
+        inventory.watch_pressure(0, 10.0, lambda inv, i: crossings.append(inv.tanks[i].static_tank_press))
+        handled = inventory.run(30 * 86400)
+        assert [kind for _, kind, _ in handled] == ["pressure", "empty"]
+        assert crossings == [pytest.approx(10.0)]
+
+    def test_transfer_into_full_tank(self):
+        tank1 = make_tank(20.0)
+        tank2 = make_tank(36.0)
+        pump = PositiveDisplacement("Pump 2", press_out=50, displacement=0.24)
+        pump.adjust_speed(1480)
+        inventory = TankInventory([tank1, tank2], 27778, 36.0, gravity_drain=[False, False])
+        inventory.add_transfer(pump, 0, 1)
+        assert inventory.run(3600) == []
+        assert (tank1.level, tank2.level) == (20.0, 36.0)  # No volume lost to the clamp
+
+    def test_transfer_out_of_empty_tank(self):
+        tank1 = make_tank(0.0)
+        tank2 = make_tank(10.0)
+        pump = PositiveDisplacement("Pump 2", press_out=50, displacement=0.24)
+        pump.adjust_speed(1480)
+        inventory = TankInventory([tank1, tank2], 27778, 36.0, gravity_drain=[False, False])
+        inventory.add_transfer(pump, 0, 1)
+        inventory.run(3600)
+        assert (tank1.level, tank2.level) == (0.0, 10.0)
@@ -0,0 +1,99 @@
+import types
+
+import pytest
+from PipingSystems.pump.pump import PositiveDisplacement
+from PipingSystems.valve.valve import Gate, Relief
+from Simulation.interlocks import Condition, InterlockEngine, Permissive, Trip
+
+
+def make_plant():
+    components = types.SimpleNamespace(gate=Gate("Gate"), relief=Relief("Relief", open_press=60, close_press=55),
+                                       pump=PositiveDisplacement("Pump", press_out=50, displacement=0.24))
+    actions = types.SimpleNamespace(pump_on=lambda: components.pump.adjust_speed(1480),
+                                    pump_off=lambda: components.pump.adjust_speed(0))
+    return components, actions
+
+
+class TestCondition:
+    def test_parse(self):
+        assert Condition.parse("gate6.position == 100") == Condition("gate6", "position", "==", 100.0)
+
+    def test_parse_invalid(self):
+        with pytest.raises(ValueError) as excinfo:
+            Condition.parse("gate6.position is open")
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Invalid condition: gate6.position is open"
+
+
+class TestPermissive:
+    def test_blocked(self):
+        components, actions = make_plant()
+        engine = InterlockEngine(components, actions, [Permissive("pump_on", "gate.position == 100")])
+        engine.install()
+        assert actions.pump_on() == "Interlock: pump_on requires gate.position == 100."
+        assert components.pump.speed == 0
+        assert engine.blocked["pump_on"] == 1
+
+    def test_permitted(self):
+        components, actions = make_plant()
+        engine = InterlockEngine(components, actions, [Permissive("pump_on", "gate.position == 100")])
+        engine.install()
+        components.gate.open()
+        assert engine.permitted("pump_on")
+        actions.pump_on()
+        assert components.pump.speed == 1480
+
+    def test_uninstall(self):
+        components, actions = make_plant()
+        engine = InterlockEngine(components, actions, [Permissive("pump_on", "gate.position == 100")])
+        engine.install()
+        engine.uninstall()
+        actions.pump_on()
+        assert components.pump.speed == 1480
+
+    def test_unknown_action(self):
+        components, actions = make_plant()
+        with pytest.raises(AttributeError):
+            InterlockEngine(components, actions, [Permissive("pump_start", "gate.position == 100")])
+
+
+class TestTrip:
+    def test_trip_on_relief_open(self):
+        components, actions = make_plant()
+        engine = InterlockEngine(components, actions, [Trip("relief.position == 100", "pump_off")])
+        actions.pump_on()
+        assert engine.scan() == []
+        components.relief.valve_operation(65)
+        fired = engine.scan()
+        assert [rule.description for rule in fired] == ["pump_off on relief.position == 100"]
+        assert components.pump.speed == 0
+
+    def test_trip_fires_once(self):
+        components, actions = make_plant()
+        engine = InterlockEngine(components, actions, [Trip("relief.position == 100", "pump_off")])
+        components.relief.valve_operation(65)
+        assert len(engine.scan()) == 1
+        assert engine.scan() == []
+        components.relief.valve_operation(50)
+        engine.scan()
+        components.relief.valve_operation(65)
+        assert len(engine.scan()) == 1
+
+    def test_rearmed_by_own_action(self):
+        components, actions = make_plant()
+        engine = InterlockEngine(components, actions, [Trip(["relief.position == 100", "pump.speed > 0"], "pump_off")])
+        components.relief.valve_operation(65)
+        actions.pump_on()
+        assert len(engine.scan()) == 1
+        actions.pump_on()  # Restarted before another scan saw it stopped
+        assert len(engine.scan()) == 1
+        assert components.pump.speed == 0
+
+    def test_shared_conditions_compiled_once(self):
+        components, actions = make_plant()
+        rules = [Trip(["gate.position == 0", "pump.speed > 0"], "pump_off"),
+                 Permissive("pump_on", "gate.position == 100"),
+                 Trip("gate.position == 0", "pump_off")]
+        engine = InterlockEngine(components, actions, rules)
+        assert len(engine._reads) == 2
+        assert len(engine._plan) == 3
@@ -0,0 +1,49 @@
+import sys
+
+from Models.FuelFarm.factory import FuelFarm
+from PipingSystems.pump.pump import Pump
+from PipingSystems.registry import ComponentRegistry
+from PipingSystems.valve.valve import Gate, Valve
+from Simulation.memory_report import components_of, format_report, measure
+
+
+class TestMeasure:
+    def test_fuel_farm(self):
+        report = measure(FuelFarm.new())
+        assert report.count == 21
+        assert report.types["Gate"].count == 10
+        assert report.kind(Valve)[0] == 16
+        assert report.kind(Pump)[0] == 3
+        assert "_Pump__wattage" in report.types["PositiveDisplacement"].fields
+        assert report.total == sum(usage.total for usage in report.types.values())
+
+    def test_instance_accounting(self):
+        gate = Gate("Gate 1")
+        usage = measure([gate]).types["Gate"]
+        assert usage.instance_bytes == sys.getsizeof(gate)
+        assert usage.dict_bytes == sys.getsizeof(vars(gate))
+        assert usage.fields["name"] == sys.getsizeof(gate.name)
+
+    def test_shared_values_counted_once(self):
+        name = "Gate valve"
+        report = measure([Gate(name), Gate(name)])
+        assert report.types["Gate"].fields["name"] == sys.getsizeof(name)
+
+    def test_model_sources(self):
+        farm = FuelFarm.new()
+        registry = ComponentRegistry(farm.parts().values())
+        assert components_of(registry) == list(farm.parts().values())
+        assert components_of([farm.gate1, "not a component"]) == [farm.gate1]
+
+
+class TestProjection:
+    def test_linear_projection(self):
+        report = measure([Gate("Gate {}".format(number)) for number in range(100)])
+        assert report.project(1000) == report.total * 10
+        assert report.project_type("Gate", 10) == report.total / 10
+
+    def test_format(self):
+        text = format_report(measure(FuelFarm.new()), target=100000)
+        assert text.splitlines()[0].startswith("Type")
+        assert "All Valve" in text
+        assert "Projected for 100000 components" in text
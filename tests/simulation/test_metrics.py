@@ -0,0 +1,82 @@
+import urllib.error
+import urllib.request
+
+import pytest
+from Simulation.metrics import MetricsServer, Registry, SimulationMetrics
+from Simulation.scheduler import EventScheduler
+
+
+class TestRegistry:
+    def test_counter_and_gauge(self):
+        registry = Registry()
+        counter = registry.counter("ticks_total", "Ticks")
+        gauge = registry.gauge("depth")
+        counter.inc()
+        counter.inc(2)
+        gauge.set(4.5)
+        assert registry.render() == "# HELP ticks_total Ticks\n# TYPE ticks_total counter\nticks_total 3\n" \
+                                    "# TYPE depth gauge\ndepth 4.5\n"
+
+    def test_histogram_cumulative(self):
+        registry = Registry()
+        hist = registry.histogram("latency_seconds", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            hist.observe(value)
+        lines = registry.render().splitlines()
+        assert lines[1:] == ['latency_seconds_bucket{le="0.1"} 2', 'latency_seconds_bucket{le="1.0"} 3',
+                             'latency_seconds_bucket{le="+Inf"} 4', "latency_seconds_sum 2.65",
+                             "latency_seconds_count 4"]
+
+    def test_gauge_function(self):
+        registry = Registry()
+        registry.gauge("answer", function=lambda: 42)
+        assert registry.render().endswith("answer 42\n")
+
+    def test_duplicate(self):
+        registry = Registry()
+        registry.counter("ticks_total")
+        with pytest.raises(ValueError) as excinfo:
+            registry.gauge("ticks_total")
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Metric ticks_total already registered."
+
+
+class TestSimulationMetrics:
+    def test_scheduler_ticks(self):
+        sim = SimulationMetrics()
+        sched = EventScheduler(metrics=sim)
+        for time in (1.0, 2.0, 3.0):
+            sched.schedule(time, print)
+        sched.run(until=2.0)
+        assert sim.ticks.value == 2
+        assert sim.queue_depth.value == 1
+        assert sim.sim_time.value == 2.0
+
+    def test_overruns(self):
+        sim = SimulationMetrics(scan_budget=0.01)
+        sim.scan(0.005)
+        sim.scan(0.02)
+        assert sim.scans.count == 2
+        assert sim.overruns.value == 1
+
+    def test_memory(self):
+        sim = SimulationMetrics()
+        assert sim.memory.samples()[0][1] >= 0
+
+
+class TestMetricsServer:
+    def test_scrape(self):
+        sim = SimulationMetrics()
+        sim.command(0.002)
+        server = MetricsServer(sim.registry, port=0)
+        port = server.start()
+        try:
+            url = "http://127.0.0.1:{}/metrics".format(port)
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+                assert response.headers["Content-Type"].startswith("text/plain")
+            assert "virtualplc_command_latency_seconds_count 1" in body
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen("http://127.0.0.1:{}/other".format(port), timeout=5)
+        finally:
+            server.stop()
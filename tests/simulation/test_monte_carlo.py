@@ -0,0 +1,82 @@
+import random
+
+import pytest
+import utility_formulas
+from PipingSystems.pump.pump import PositiveDisplacement
+from PipingSystems.storage_tank.tank import Tank
+from Simulation.monte_carlo import MonteCarlo, Fixed, Normal, Triangular, Uniform, percentile
+
+
+def make_engine():
+    tank = Tank("Tank 1", level=36.0, fluid_density=1.629869, outlet_diam=16, outlet_slope=0.25)
+    pump = PositiveDisplacement("Pump 1", press_out=50, displacement=0.24)
+    pump.adjust_speed(1480)
+    return MonteCarlo(tank, 16, pump)
+
+
+class TestDistributions:
+    def test_fixed(self):
+        assert Fixed(140).sample(random.Random(1), 3) == [140, 140, 140]
+
+    def test_uniform_bounds(self):
+        values = Uniform(0.2, 0.3).sample(random.Random(1), 1000)
+        assert min(values) >= 0.2
+        assert max(values) <= 0.3
+
+    def test_normal_clipped(self):
+        values = Normal(0, 10, low=-1, high=1).sample(random.Random(1), 1000)
+        assert min(values) == -1
+        assert max(values) == 1
+
+    def test_triangular_bad_mode(self):
+        with pytest.raises(ValueError) as excinfo:
+            Triangular(1, 5, 3)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Bounds must satisfy low <= mode <= high."
+
+
+class TestPercentile:
+    def test_interpolated(self):
+        assert percentile([0.0, 10.0], 50) == 5.0
+        assert percentile([1.0, 2.0, 3.0], 100) == 3.0
+
+
+class TestMonteCarlo:
+    def test_fixed_parameters_match_model(self):
+        engine = make_engine()
+        bands = engine.run(10, seed=1)
+        tank_flow = utility_formulas.gravity_flow_rate(16, 0.25)
+        assert bands["tank_flow_out"][50] == pytest.approx(tank_flow)
+        assert bands["pump_power"][50] == pytest.approx(engine.pump.power)
+        valve_drop = (tank_flow / (15 * 16 ** 2)) ** 2
+        assert bands["valve_press_out"][50] == pytest.approx(engine.tank.static_tank_press - valve_drop)
+
+    def test_bands_ordered(self):
+        engine = make_engine()
+        engine.set_distribution("pipe_coeff", Normal(140, 10, low=1))
+        engine.set_distribution("valve_coeff", Triangular(12, 15, 18))
+        engine.set_distribution("displacement", Uniform(0.22, 0.26))
+        bands = engine.run(2000, seed=3)
+        for band in bands.values():
+            assert band[5] < band[50] < band[95]
+
+    def test_reproducible(self):
+        engine = make_engine()
+        engine.set_distribution("pipe_coeff", Normal(140, 10, low=1))
+        assert engine.run(500, seed=7) == engine.run(500, seed=7)
+
+    def test_process_pool(self):
+        engine = make_engine()
+        engine.set_distribution("displacement", Uniform(0.22, 0.26))
+        bands = engine.run(1000, seed=5, workers=2)
+        assert 0.22 * 1480 * engine.pump.power / engine.pump.flow <= bands["pump_power"][50]
+
+    def test_empty_tank(self):
+        engine = make_engine()
+        engine.tank.level = 0
+        bands = engine.run(10, seed=1)
+        assert bands["tank_flow_out"][95] == 0.0
+
+    def test_unknown_parameter(self):
+        with pytest.raises(KeyError):
+            make_engine().set_distribution("speed", Fixed(1))
@@ -0,0 +1,83 @@
+import types
+
+from PipingSystems.pump.pump import Pump, PositiveDisplacement
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Gate, Valve
+from Simulation.profiling import Profiler
+
+
+def make_actions():
+    actions = types.ModuleType("actions")
+    gate = Gate("Gate")
+
+    def gate_open():
+        gate.open()
+    gate_open.__module__ = "actions"
+    actions.gate_open = gate_open
+    return actions
+
+
+class TestProfiler:
+    def test_disabled_is_untouched(self):
+        original_open = Valve.__dict__["open"]
+        original_level = Tank.__dict__["level"]
+        profiler = Profiler(actions=make_actions())
+        profiler.enable()
+        assert Valve.__dict__["open"] is not original_open
+        profiler.disable()
+        assert Valve.__dict__["open"] is original_open
+        assert Tank.__dict__["level"] is original_level
+
+    def test_counts(self):
+        actions = make_actions()
+        with Profiler(actions=actions) as profiler:
+            for _ in range(3):
+                actions.gate_open()
+            tank = Tank("Tank", level=10.0)
+            tank.level = 5.0
+            pump = PositiveDisplacement("Pump", press_out=50, displacement=0.24)
+            pump.adjust_speed(1480)
+        assert profiler.operations["functionality.gate_open"].calls == 3
+        assert profiler.operations["Valve.open"].calls == 3
+        assert profiler.operations["Tank.level"].calls == 1
+        assert profiler.operations["Tank.gravity_flow"].calls == 1
+        assert profiler.operations["Pump.pump_power"].calls == 2  # __init__ and adjust_speed
+        assert profiler.component_types["Gate"] == 3
+        assert profiler.component_types["PositiveDisplacement"] == 3
+        assert tank.level == 5.0
+
+    def test_report_sorted(self):
+        actions = make_actions()
+        with Profiler(actions=actions) as profiler:
+            actions.gate_open()
+        rows = profiler.stats()
+        assert [row[2] for row in rows] == sorted((row[2] for row in rows), reverse=True)
+        report = profiler.report()
+        assert report.splitlines()[0].startswith("Operation")
+        assert "functionality.gate_open" in report
+
+    def test_percentiles(self):
+        profiler = Profiler(samples=4)
+        stats = profiler._stats("op")
+        for elapsed in [10, 20, 30, 40, 50]:
+            stats.record(elapsed)
+        assert stats.calls == 5
+        assert stats.total_ns == 150
+        assert stats.percentile(50) == 40  # Oldest sample overwritten
+        assert stats.percentile(99) == 50
+
+    def test_replaced_after_enable_left_alone(self):
+        actions = make_actions()
+        profiler = Profiler(actions=actions, targets=[])
+        profiler.enable()
+        guard = lambda: "blocked"
+        actions.gate_open = guard
+        profiler.disable()
+        assert actions.gate_open is guard
+
+    def test_reset(self):
+        actions = make_actions()
+        with Profiler(actions=actions, targets=[(Pump, "pump_power")]) as profiler:
+            actions.gate_open()
+        profiler.reset()
+        assert profiler.stats() == []
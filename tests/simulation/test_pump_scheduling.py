@@ -0,0 +1,96 @@
+import itertools
+import math
+
+import pytest
+from PipingSystems.pump.pump import PositiveDisplacement
+from Simulation.pump_scheduling import CACHE_SIZE, PumpScheduler
+
+
+def make_pumps(heads=(20.0, 35.0, 10.0)):
+    return [PositiveDisplacement("Pump {}".format(n), pump_head_in=head, press_out=50, displacement=0.24)
+            for n, head in enumerate(heads, 1)]
+
+
+class TestDispatch:
+    def test_cheapest_pump_first(self):
+        pumps = make_pumps()
+        scheduler = PumpScheduler(pumps)
+        speeds, power = scheduler.dispatch(300)
+        assert speeds == (0.0, pytest.approx(1250.0), 0.0)  # Highest inlet head, least differential pressure
+        assert power == pytest.approx(300 * scheduler.cost_per_gpm[1])
+
+    def test_matches_pump_power(self):
+        pumps = make_pumps()
+        scheduler = PumpScheduler(pumps)
+        speeds, power = scheduler.dispatch(800)
+        scheduler.apply(speeds)
+        assert sum(pump.flow for pump in pumps) == pytest.approx(800)
+        assert sum(pump.power for pump in pumps) == pytest.approx(power)
+
+    def test_minimum_speed(self):
+        scheduler = PumpScheduler(make_pumps(), min_speed=600)
+        with pytest.raises(ValueError) as excinfo:
+            scheduler.dispatch(100)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "No pump combination can deliver 100 gpm."
+        speeds, _ = scheduler.dispatch(300)
+        assert sorted(speeds) == [0.0, 0.0, pytest.approx(300 / 0.24)]
+
+    def test_capacity(self):
+        scheduler = PumpScheduler(make_pumps())
+        with pytest.raises(ValueError) as excinfo:
+            scheduler.dispatch(2000)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Demand of 2000 gpm is outside the pump capacity."
+
+    def test_pump_power_untouched(self):
+        pumps = make_pumps()
+        PumpScheduler(pumps)
+        assert [pump.power for pump in pumps] == [0.0, 0.0, 0.0]
+
+
+class TestSchedule:
+    def brute_force(self, scheduler, demands, running=0):
+        best = math.inf
+        for masks in itertools.product(range(8), repeat=len(demands)):
+            cost = 0.0
+            previous = running
+            for mask, demand in zip(masks, demands):
+                cost += scheduler.costs(demand)[mask] + scheduler.start_cost * bin(mask & ~previous).count("1")
+                previous = mask
+            best = min(best, cost)
+        return best
+
+    def test_matches_brute_force(self):
+        scheduler = PumpScheduler(make_pumps(), min_speed=500, start_cost=15.0)
+        demands = [200, 500, 150, 700, 0]
+        plan = scheduler.schedule(demands)
+        assert plan.energy == pytest.approx(self.brute_force(scheduler, demands))
+        assert [sum(speed * 0.24 for speed in speeds) for speeds in plan.speeds] == pytest.approx(demands)
+        assert sum(plan.power) + plan.starts * 15.0 == pytest.approx(plan.energy)
+
+    def test_start_cost_keeps_pump_running(self):
+        scheduler = PumpScheduler(make_pumps(), min_speed=500, start_cost=1000.0)
+        plan = scheduler.schedule([300, 150, 300])
+        assert plan.starts == 1
+
+    def test_already_running(self):
+        scheduler = PumpScheduler(make_pumps(), start_cost=10.0)
+        plan = scheduler.schedule([300], running=[1])
+        assert plan.starts == 0
+        assert plan.energy == pytest.approx(300 * scheduler.cost_per_gpm[1])
+
+    def test_long_profile(self):
+        scheduler = PumpScheduler(make_pumps((20.0, 35.0, 10.0, 25.0, 30.0, 15.0)), min_speed=600, start_cost=5.0)
+        demands = [0, 300, 900, 1500, 600, 150] * 500
+        plan = scheduler.schedule(demands)
+        assert len(plan.speeds) == 3000
+        assert len(scheduler._costs) == 6
+
+    def test_cost_cache_bounded(self):
+        scheduler = PumpScheduler(make_pumps())
+        demands = [demand / 10 for demand in range(CACHE_SIZE + 100)]
+        scheduler.schedule(demands)
+        assert len(scheduler._costs) == CACHE_SIZE
+        assert demands[0] not in scheduler._costs
+        assert scheduler.costs(demands[0]) == PumpScheduler(make_pumps()).costs(demands[0])
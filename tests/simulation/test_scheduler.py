@@ -0,0 +1,212 @@
+import pytest
+from PipingSystems.pump.pump import PositiveDisplacement
+from PipingSystems.storage_tank.tank import Tank
+from PipingSystems.valve.valve import Relief
+from Simulation.scheduler import EventScheduler, PumpProcess, ReliefProcess, TankLevelProcess
+
+
+class TestEventScheduler:
+    def test_order(self):
+        sched = EventScheduler()
+        log = []
+        sched.schedule(5.0, log.append, "b")
+        sched.schedule(1.0, log.append, "a")
+        sched.schedule(5.0, log.append, "c", priority=-1)
+        sched.run()
+        assert log == ["a", "c", "b"]
+        assert sched.now == 5.0
+
+    def test_cancel(self):
+        sched = EventScheduler()
+        log = []
+        event = sched.schedule(1.0, log.append, "a")
+        sched.cancel(event)
+        assert sched.run() == 0
+        assert log == []
+
+    def test_run_until(self):
+        sched = EventScheduler()
+        log = []
+        sched.schedule(10.0, log.append, "late")
+        assert sched.run(until=5.0) == 0
+        assert sched.now == 5.0
+        sched.schedule_in(1.0, log.append, "soon")
+        sched.run(until=20.0)
+        assert log == ["soon", "late"]
+        assert sched.now == 20.0
+
+    def test_past(self):
+        sched = EventScheduler(start=10.0)
+        with pytest.raises(ValueError) as excinfo:
+            sched.schedule(5.0, print)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Cannot schedule an event in the past."
+
+    def test_pump_schedule(self):
+        sched = EventScheduler()
+        pump = PositiveDisplacement("Pump 1", press_out=50, displacement=0.24)
+        sched.schedule(3600.0, pump.adjust_speed, 1480)
+        sched.schedule(7200.0, pump.adjust_speed, 0)
+        sched.run(until=3600.0)
+        assert pump.flow == 355.2
+        sched.run()
+        assert pump.flow == 0.0
+
+
+class TestTankLevelProcess:
+    def make(self, level=30.0, **kwargs):
+        sched = EventScheduler()
+        tank = Tank("Tank 1", level=level, fluid_density=1.629869, outlet_diam=16, outlet_slope=0.25)
+        return sched, tank, TankLevelProcess(sched, tank, 27778, 36.0, **kwargs)
+
+    def test_drain_to_empty(self):
+        emptied = []
+        sched, tank, process = self.make(on_empty=lambda p: emptied.append(sched.now))
+        process.set_flow(-27778 * 60)  # One foot per second
+        sched.run()
+        assert emptied == [30.0]
+        assert tank.level == 0.0
+        assert tank.flow_out == 0.0
+
+    def test_fill_to_full(self):
+        filled = []
+        sched, tank, process = self.make(on_full=lambda p: filled.append(sched.now))
+        process.set_flow(27778 * 60)
+        sched.run()
+        assert filled == [6.0]
+        assert tank.level == 36.0
+
+    def test_set_level(self):
+        emptied = []
+        sched, tank, process = self.make(on_empty=lambda p: emptied.append(sched.now))
+        process.set_flow(-27778 * 60)
+        sched.run(until=10.0)
+        process.set_level(5.0)  # Refilled by the operator
+        assert tank.level == 5.0
+        sched.run()
+        assert emptied == [15.0]
+
+    def test_sync(self):
+        sched, tank, process = self.make()
+        process.set_flow(-27778 * 60)
+        sched.run(until=10.0)
+        assert tank.level == 30.0  # Not written between events
+        process.sync()
+        assert tank.level == 20.0
+
+    def test_relief_on_pressure(self):
+        sched, tank, process = self.make(level=10.0)
+        relief = Relief("Relief 1", open_press=10.0, close_press=9.0)
+        crossings = []
+
+        def operate(proc, level):
+            crossings.append(sched.now)
+            relief.valve_operation(proc.tank.static_tank_press)
+
+        process.watch_pressure(relief.setpoint_open, operate)
+        process.set_flow(27778 * 60)
+        sched.run(until=20.0)
+        assert relief.position == 100
+        assert tank.static_tank_press == pytest.approx(10.0)
+        assert crossings == [pytest.approx(tank.level - 10.0)]
+
+    def test_week_of_sparse_operations(self):
+        sched, tank, process = self.make(level=36.0)
+        for day in range(7):
+            sched.schedule(day * 86400 + 6 * 3600, process.set_flow, -355.2)
+            sched.schedule(day * 86400 + 10 * 3600, process.set_flow, 0.0)
+        sched.run(until=7 * 86400)
+        process.sync()
+        assert sched.processed == 14
+        assert tank.level == pytest.approx(36.0 - 7 * 4 * 60 * 355.2 / 27778)
+
+
+class TestPumpProcess:
+    def make(self, level1=30.0, level2=10.0):
+        sched = EventScheduler()
+        tanks = [TankLevelProcess(sched, Tank("Tank {}".format(n), level=level, fluid_density=1.629869, outlet_diam=16,
+                                                 outlet_slope=0.25), 27778, 36.0)
+                 for n, level in ((1, level1), (2, level2))]
+        pump = PositiveDisplacement("Pump 1", press_out=50, displacement=0.24)
+        return sched, tanks, PumpProcess(sched, pump, 1480, source=tanks[0], destination=tanks[1])
+
+    def test_timed_run(self):
+        sched, (tank1, tank2), process = self.make()
+        process.schedule_run(3600.0, 7200.0)
+        sched.run(until=5000.0)
+        assert process.running
+        assert process.pump.flow == 355.2
+        sched.run(until=86400.0)
+        tank1.sync()
+        tank2.sync()
+        assert not process.running
+        moved = 355.2 * 120 / 27778
+        assert (tank1.tank.level, tank2.tank.level) == (pytest.approx(30.0 - moved), pytest.approx(10.0 + moved))
+        assert sched.processed == 2
+
+    def test_trip_on_full(self):
+        tripped = []
+        sched, (tank1, tank2), process = self.make(level2=35.0)
+        process.on_trip = lambda pump, tank: tripped.append(tank)
+        process.start()
+        sched.run()
+        assert not process.running
+        assert tripped == [tank2]
+        assert process.trips == [(pytest.approx(27778 * 60 / 355.2), tank2)]
+        assert tank2.tank.level == 36.0
+        assert tank1.net_flow == 0.0
+
+    def test_trip_on_empty(self):
+        sched, (tank1, tank2), process = self.make(level1=1.0)
+        process.start()
+        sched.run()
+        assert not process.running
+        assert process.trips[0][1] is tank1
+        assert tank1.tank.level == 0.0
+        assert process.start() is False  # Nothing left to pump
+
+    def test_keeps_tank_callback(self):
+        emptied = []
+        sched = EventScheduler()
+        tank = TankLevelProcess(sched, Tank("Tank 1", level=1.0, fluid_density=1.629869, outlet_diam=16,
+                                            outlet_slope=0.25), 27778, 36.0, on_empty=emptied.append)
+        process = PumpProcess(sched, PositiveDisplacement("Pump 1", press_out=50, displacement=0.24), 1480,
+                              source=tank)
+        process.start()
+        sched.run()
+        assert emptied == [tank]
+        assert not process.running
+
+
+class TestReliefProcess:
+    def test_cycles_between_setpoints(self):
+        sched = EventScheduler()
+        tank = TankLevelProcess(sched, Tank("Tank 1", level=10.0, fluid_density=1.629869, outlet_diam=16,
+                                            outlet_slope=0.25), 27778, 36.0)
+        relief = Relief("Relief 1", open_press=10.0, close_press=9.0)
+        process = ReliefProcess(tank, relief, relief_flow=2000.0)
+        assert relief.position == 0
+        tank.set_flow(1000.0)
+        sched.run(until=86400.0)
+        positions = [position for _, position in process.changes]
+        assert positions[:4] == [100, 0, 100, 0]
+        times = [time for time, _ in process.changes]
+        open_level = 10.0 * 144 / (1.629869 * 32.174)
+        close_level = 9.0 * 144 / (1.629869 * 32.174)
+        band = (open_level - close_level) * 27778 * 60
+        assert times[1] - times[0] == pytest.approx(band / 1000.0)  # Draining at 2000 - 1000 gpm
+        assert times[2] - times[1] == pytest.approx(band / 1000.0)  # Filling at 1000 gpm
+        tank.sync()
+        assert close_level - 1e-9 <= tank.tank.level <= open_level + 1e-9
+
+    def test_opens_at_start(self):
+        sched = EventScheduler()
+        tank = TankLevelProcess(sched, Tank("Tank 1", level=36.0, fluid_density=1.629869, outlet_diam=16,
+                                            outlet_slope=0.25), 27778, 36.0)
+        relief = Relief("Relief 1", open_press=10.0, close_press=9.0)
+        process = ReliefProcess(tank, relief, relief_flow=500.0)
+        assert relief.position == 100
+        assert tank.net_flow == -500.0
+        sched.run()
+        assert relief.position == 0
+        assert process.changes == [(pytest.approx(sched.now), 0)]
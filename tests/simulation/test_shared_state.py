@@ -0,0 +1,83 @@
+import multiprocessing
+
+import pytest
+from Models.FuelFarm.factory import FuelFarm
+from Simulation.shared_state import FleetLayout, SharedFleet, farm_components
+
+
+def hammer(name, farm, count, width):
+    fleet = SharedFleet.attach(name)
+    for number in range(1, count + 1):
+        fleet.write(farm, [float(number)] * width)
+    fleet.close()
+
+
+@pytest.fixture
+def fleet():
+    shared = SharedFleet.create(FleetLayout(4, tanks=1, valves=2, pumps=1))
+    yield shared
+    shared.close()
+    shared.unlink()
+
+
+class TestLayout:
+    def test_sizes(self):
+        layout = FleetLayout(10)
+        assert layout.values == 3 * 2 + 5 * 16 + 4 * 3
+        assert layout.size == 64 + 8 * 99 * 10
+        assert layout.record(1) == 8 + 99
+
+    def test_bad_farm(self):
+        with pytest.raises(IndexError) as excinfo:
+            FleetLayout(2).record(2)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Farm 2 is outside the fleet."
+
+
+class TestSharedFleet:
+    def test_attach_reads_header(self, fleet):
+        other = SharedFleet.attach(fleet.name)
+        assert (other.layout.farms, other.layout.tanks, other.layout.valves, other.layout.pumps) == (4, 1, 2, 1)
+        fleet.write(2, range(17))
+        assert other.read_values(2) == (2, [float(n) for n in range(17)])
+        other.close()
+
+    def test_components(self):
+        farm = FuelFarm.new()
+        farm.pump1.adjust_speed(1480)
+        layout = FleetLayout(2)
+        shared = SharedFleet.create(layout)
+        try:
+            shared.write_components(1, *farm_components(farm))
+            state = shared.read(1)
+            assert state.sequence == 1
+            assert state.tanks[0] == (36.0, farm.tank1.static_tank_press, farm.tank1.flow_out)
+            assert state.pumps[0][:1] == (1480.0,)
+            assert state.pumps[0][3] == pytest.approx(355.2)
+            assert len(state.valves) == 16
+        finally:
+            shared.close()
+            shared.unlink()
+
+    def test_wrong_length(self, fleet):
+        with pytest.raises(ValueError) as excinfo:
+            fleet.write(0, [1.0])
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Farm record needs 17 values."
+
+    def test_busy_record(self, fleet):
+        fleet.words[fleet.layout.record(0)] = 1  # Writer died mid-update
+        with pytest.raises(TimeoutError):
+            fleet.read_values(0, timeout=0.01)
+
+    def test_no_torn_reads(self, fleet):
+        width = fleet.layout.values
+        writer = multiprocessing.get_context("spawn").Process(target=hammer, args=(fleet.name, 3, 20000, width))
+        writer.start()
+        seen = set()
+        while writer.is_alive() or not seen:
+            sequence, values = fleet.read_values(3, timeout=5.0)
+            assert len(set(values)) == 1
+            seen.add(values[0])
+        writer.join()
+        assert fleet.read_values(3)[1][0] == 20000.0
@@ -0,0 +1,101 @@
+import functools
+import tracemalloc
+
+import pytest
+import Models.FuelFarm.components as ffc
+import Models.FuelFarm.functionality as fff
+from Models.FuelFarm.cli import apply_command, farm_layout, parse
+from Models.FuelFarm.factory import FuelFarm
+from Simulation.streaming import Frame, Layout, crossings, decimate, pipe, select, simulate, windows
+
+
+@pytest.fixture(autouse=True)
+def fresh_farm():
+    saved = FuelFarm({name: getattr(ffc, name) for name in ffc.COMPONENTS})
+    FuelFarm.new().install()
+    yield
+    saved.install()
+
+
+def ramp(values):
+    """Frames with a single field "x" taking the given values at times 0, 1, 2, ..."""
+    layout = Layout([("x", None, "x")])
+    return (Frame(float(time), (value,), layout) for time, value in enumerate(values))
+
+
+class TestSource:
+    def test_frames_are_values(self):
+        frames = simulate(farm_layout(), steps=2)
+        first = next(frames)
+        ffc.gate1.open()
+        second = next(frames)
+        assert (first["gate1.position"], second["gate1.position"]) == (0, 100)
+        assert first.layout is second.layout
+        assert first.as_dict()["tank2.level"] == 36.0
+
+    def test_commands_and_advance(self):
+        commands = parse(["0 gate1_open", "0 gate3_open", "0 gate5_open", "2.5 pump1_on"])
+        levels = []
+        frames = list(simulate(farm_layout(), step=1.0, steps=4, commands=commands,
+                               apply=apply_command, advance=levels.append))
+        assert [frame["pump1.speed"] for frame in frames] == [0, 0, 0, 1480]
+        assert levels == [0.0, 1.0, 2.0, 3.0]
+
+    def test_bad_step(self):
+        with pytest.raises(ValueError) as excinfo:
+            simulate(farm_layout(), step=0)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Step must be positive."
+
+    def test_commands_need_apply(self):
+        with pytest.raises(ValueError) as excinfo:
+            simulate(farm_layout(), commands=parse(["0 gate1_open"]))
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Commands need an apply function."
+
+
+class TestStages:
+    def test_decimate(self):
+        assert [frame.time for frame in decimate(ramp(range(10)), 4)] == [0.0, 4.0, 8.0]
+
+    def test_select(self):
+        frames = list(select(simulate(farm_layout(), steps=2), "pump*.power"))
+        assert frames[0].names == ("pump1.power", "pump2.power", "pump3.power")
+        assert frames[0]["pump2.power"] == ffc.pump2.power
+        assert list(select(simulate(farm_layout(), steps=1), "tank1.level"))[0].values == (36.0,)
+        with pytest.raises(ValueError):
+            next(select(simulate(farm_layout(), steps=1), "valve*"))
+
+    def test_crossings(self):
+        found = list(crossings(ramp([0, 5, 11, 9, 12, 3]), "x", 10))
+        assert [(crossing.time, crossing.rising) for crossing in found] == [(2.0, True), (3.0, False), (4.0, True),
+                                                                             (5.0, False)]
+        assert len(list(crossings(ramp([0, 11, 9]), "x", 10, direction=-1))) == 1
+
+    def test_windows(self):
+        result = list(windows(ramp([1, 2, 3, 4, 5]), "x", 2))
+        assert result[0] == (0.0, 1.0, 2, 1.5, 1, 2)
+        assert result[-1] == (4.0, 4.0, 1, 5.0, 5, 5)
+        with pytest.raises(ValueError) as excinfo:
+            windows(ramp([1, 2]), "x", 0)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Window size must be positive."
+
+    def test_pipeline(self):
+        def drain(time):
+            fff.change_tank_level(ffc.tank1, 36.0 - time / 100)
+        stream = pipe(simulate(farm_layout(), steps=3000, advance=drain),
+                      functools.partial(decimate, every=10),
+                      functools.partial(crossings, name="tank1.level", threshold=20.0))
+        assert [crossing.time for crossing in stream] == [1610.0]
+
+    def test_constant_memory(self):
+        stream = pipe(simulate(farm_layout(), steps=50000), functools.partial(select, pattern="gate*.flow_out"),
+                      functools.partial(windows, name="gate1.flow_out", size=1000))
+        tracemalloc.start()
+        try:
+            assert sum(1 for _ in stream) == 50
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert peak < 256 * 1024
@@ -0,0 +1,123 @@
+import itertools
+
+import pytest
+
+from Simulation.tracing import END_TO_END, Span, Tracer, format_summary, load, main, summarize
+
+
+def fake_clock(step_ns=1000000):
+    ticks = itertools.count(0, step_ns)
+    return lambda: next(ticks)
+
+
+def command(tracer, group="gate3"):
+    trace = tracer.begin(group=group, state="down")
+    with tracer.span(trace, "update"):
+        pass
+    with tracer.span(trace, "propagate"):
+        pass
+    tracer.end(trace)
+    return trace
+
+
+class TestTracer:
+    def test_disabled(self):
+        tracer = Tracer()
+        assert command(tracer) is None
+        with tracer.render():
+            pass
+        tracer.flush()
+        assert tracer._buffer == []
+
+    def test_trace_spans(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        tracer = Tracer(str(path), clock=fake_clock())
+        trace = command(tracer)
+        with tracer.render():
+            pass
+        tracer.close()
+        spans = load(str(path))
+        assert [span.name for span in spans] == ["update", "propagate", "command", "render"]
+        assert {span.trace for span in spans} == {trace}
+        assert spans[2].attributes == {"group": "gate3", "state": "down"}
+        assert (spans[2].start, spans[2].end) == (0, 5000000)
+        assert (spans[3].start, spans[3].end) == (6000000, 7000000)
+
+    def test_render_completes_waiting(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        tracer = Tracer(str(path), clock=fake_clock())
+        first = command(tracer)
+        second = command(tracer, "pump1")
+        with tracer.render():
+            pass
+        with tracer.render():  # Nothing waiting
+            pass
+        tracer.close()
+        renders = [span.trace for span in load(str(path)) if span.name == "render"]
+        assert renders == [first, second]
+
+    def test_command_raises(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        tracer = Tracer(str(path), clock=fake_clock())
+        with pytest.raises(RuntimeError):
+            with tracer.command(group="gate3", state="down") as trace:
+                raise RuntimeError("Action failed")
+        assert tracer._open == {}
+        assert list(tracer._waiting) == []
+        with tracer.command(group="gate3", state="normal") as second:
+            pass
+        with tracer.render():
+            pass
+        tracer.close()
+        spans = load(str(path))
+        assert [(span.trace, span.name) for span in spans] == [(trace, "command"), (second, "command"),
+                                                                (second, "render")]
+        assert spans[0].attributes == {"group": "gate3", "state": "down", "error": "RuntimeError"}
+
+    def test_waiting_capped(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        tracer = Tracer(str(path), clock=fake_clock(), max_waiting=2)
+        traces = [command(tracer) for _ in range(5)]
+        assert list(tracer._waiting) == traces[3:]
+        with tracer.render():
+            pass
+        tracer.close()
+        spans = load(str(path))
+        assert [span.trace for span in spans if span.name == "render"] == traces[3:]
+        assert [span.trace for span in spans if span.name == "command"] == traces
+        assert summarize(spans)[END_TO_END].count == 2
+
+    def test_buffered(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        tracer = Tracer(str(path), buffer_size=4, clock=fake_clock())
+        command(tracer)
+        assert path.read_text() == ""
+        command(tracer)
+        assert len(path.read_text().splitlines()) == 4
+        tracer.close()
+        assert len(load(str(path))) == 6
+
+
+class TestSummary:
+    def test_end_to_end(self):
+        spans = [Span(1, "command", 0, 2000000, {}), Span(1, "render", 3000000, 5000000, {}),
+                 Span(2, "command", 0, 150000000, {}), Span(2, "render", 150000000, 160000000, {}),
+                 Span(3, "command", 0, 1000000, {})]  # Never rendered
+        summary = summarize(spans, slo_ms=100)
+        assert summary["command"].count == 3
+        stats = summary[END_TO_END]
+        assert (stats.count, stats.p50, stats.maximum, stats.over_slo) == (2, 5.0, 160.0, 1)
+        assert sum(stats.histogram) == 2
+        report = format_summary(summary, 100)
+        assert "1 of 2 traces over the 100 ms objective" in report
+
+    def test_main_slo(self, tmp_path, capsys):
+        path = tmp_path / "trace.jsonl"
+        tracer = Tracer(str(path), clock=fake_clock())
+        command(tracer)
+        with tracer.render():
+            pass
+        tracer.close()
+        assert main([str(path), "--slo", "100"]) == 0
+        assert main([str(path), "--slo", "5"]) == 1
+        assert "end_to_end" in capsys.readouterr().out
@@ -0,0 +1,74 @@
+import pytest
+from Simulation.transient import Pipe, PumpTrip, Reservoir, ValveClosure, WaterHammer
+
+
+class TestPipe:
+    def test_courant_step(self):
+        pipe = Pipe(4000.0, 16, wave_speed=4000.0, reaches=100)
+        assert pipe.dx == 40.0
+        assert pipe.dt == 0.01
+
+    def test_reaches(self):
+        with pytest.raises(ValueError) as excinfo:
+            Pipe(1000.0, 16, reaches=1)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Pipe needs at least 2 reaches."
+
+
+class TestWaterHammer:
+    def test_steady_state_holds(self):
+        pipe = Pipe(1000.0, 16, reaches=50)
+        solver = WaterHammer(pipe, Reservoir(400.0), Reservoir(400.0 - 50 * pipe.resistance * (1000 / 448.831) ** 2),
+                             flow=1000)
+        start = list(solver.heads)
+        solver.run(1.0)
+        assert solver.heads == pytest.approx(start)
+        assert solver.flows[-1] * 448.831 == pytest.approx(1000)
+
+    def test_instant_closure_joukowsky(self):
+        pipe = Pipe(4000.0, 16, friction=0.0, reaches=40)
+        solver = WaterHammer(pipe, Reservoir(200.0), ValveClosure(closure_time=0.0), flow=19500)
+        result = solver.run(3.0)
+        rise = pipe.joukowsky(19500)
+        round_trip = int(round(2 * pipe.length / pipe.wave_speed / pipe.dt))  # Steps for the wave to return
+        assert result.heads[-1][1] == pytest.approx(200.0 + rise)
+        assert result.heads[-1][round_trip] == pytest.approx(200.0 + rise)
+        assert result.heads[-1][round_trip + 1] == pytest.approx(200.0 - rise)
+        assert result.flows[-1][-1] == 0.0
+        assert max(solver.head_max) == pytest.approx(200.0 + rise)
+
+    def test_slow_closure_reduces_surge(self):
+        pipe = Pipe(4000.0, 16, friction=0.0, reaches=40)
+        solver = WaterHammer(pipe, Reservoir(200.0), ValveClosure(closure_time=10.0), flow=19500)
+        solver.run(12.0)
+        assert max(solver.head_max) - 200.0 < 0.5 * pipe.joukowsky(19500)
+        assert solver.flows[-1] == 0.0
+
+    def test_pump_trip_downsurge(self):
+        pipe = Pipe(4000.0, 16, friction=0.0, reaches=40)
+        solver = WaterHammer(pipe, PumpTrip(head=300.0, rundown=0.0), Reservoir(300.0), flow=5000)
+        result = solver.run(0.5, probes=(0,))
+        assert result.heads[0][1] == pytest.approx(300.0 - pipe.joukowsky(5000))
+        assert min(result.flows[0]) == 0.0
+
+    def test_pressure_envelope(self):
+        pipe = Pipe(4000.0, 16, friction=0.0, reaches=40)
+        solver = WaterHammer(pipe, Reservoir(200.0), ValveClosure(closure_time=0.0), flow=19500)
+        solver.run(0.5)
+        high, low = solver.pressure_envelope()
+        assert len(high) == 41
+        assert high[-1] > high[0]
+        assert low[0] == pytest.approx(high[0])
+
+    def test_no_head_drop(self):
+        pipe = Pipe(1000.0, 16, reaches=10)
+        with pytest.raises(ValueError) as excinfo:
+            WaterHammer(pipe, Reservoir(100.0), ValveClosure(1.0, tail_head=100.0), flow=1000)
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Valve must have a positive steady head drop."
+
+    def test_bad_characteristic(self):
+        with pytest.raises(ValueError) as excinfo:
+            ValveClosure(1.0, characteristic="butterfly")
+        exception_msg = excinfo.value.args[0]
+        assert exception_msg == "Unknown flow characteristic: butterfly"